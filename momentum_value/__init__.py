@@ -0,0 +1,34 @@
+"""
+Momentum vs Value Factor Analysis - reusable building blocks.
+
+The starter script and notebooks import from these modules so the heavy
+lifting (returns, loading, ranking, statistics) lives in one place.
+
+Modules:
+- returns: sort-once, vectorized per-stock return engine
+- config: AnalysisConfig shared by loaders, pipeline and sweeps
+- price_cache: year-partitioned, memory-mapped cache of the price CSV
+- price_stream: chunked price ingestion with date/ticker filters per chunk
+- tickers: shared ticker normalization and interned ticker -> id table
+- fundamentals: deduplicated, typed fundamentals store keyed by ticker id
+- panel: PricePanel, the dense dates x tickers close matrix
+- backtest: monthly/quarterly rolling momentum and value quantile backtest
+- resampling: bootstrap CIs and permutation p-values for quantile spreads
+- pipeline, stages: Stories 1.1-1.9 as cached, config-driven stages
+- sweep: parameter grids over lookback, quantile count and P/E cap
+- dividends: dividend-adjusted total returns over a PricePanel
+- incremental: persisted daily state for O(tickers) factor and membership updates
+- factors: registry of factors, winsorized z-scores, ranks and composite scores
+- benchmark: synthetic data generator and per-stage time/peak-memory harness
+- profiling: opt-in per-stage wall/CPU time, rows, memory and cProfile capture
+- report: headless report model, lazy Agg figures and Markdown/HTML output
+- cli: `python -m momentum_value run|explore|sweep` with lazily imported subcommands
+- schema: declarative column schemas resolved from the header, typed column-pruned reads
+- ranking: N-tile codes along the last axis of 1-D/2-D/3-D arrays with deterministic ties
+- grid: independent and conditional double-sort grids with per-cell bincount statistics
+- risk: rolling volatility, beta, Sharpe/Sortino from running sums; drawdowns; quantile portfolio risk
+- memory: lean mode (float32, categorical tickers), early release and per-stage footprint
+- inference: batched Welch tests, effect sizes, CIs, BH/Holm adjustment and Newey-West errors
+- loader: concurrent glob/directory/zip multi-file reads into one allocated frame or PricePanel
+- point_in_time: dated fundamentals snapshots in CSR arrays with vectorized as-of queries
+"""
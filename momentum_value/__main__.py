@@ -0,0 +1,6 @@
+import sys
+
+from momentum_value.cli import main
+
+
+sys.exit(main())
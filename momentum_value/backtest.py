@@ -0,0 +1,160 @@
+"""
+Multi-year rolling backtest for momentum and value quantile portfolios.
+
+Prices are reduced once to a (months x stocks) matrix of month-end closes.
+Trailing momentum and forward holding-period returns for every rebalance
+date are then whole-matrix operations, quantiles are assigned for all dates
+at once by ranking each row, and portfolio means come from one bincount
+over (date, bucket) ids, so no DataFrame is re-filtered per date.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.dividends import TotalReturns
+from momentum_value.inference import newey_west
+from momentum_value.panel import PricePanel
+from momentum_value.point_in_time import PointInTimeStore
+from momentum_value.ranking import quantile_codes
+
+
+# Months held between rebalances
+REBALANCE_MONTHS = {'M': 1, 'Q': 3}
+
+
+def month_end_prices(df, price_col='Close'):
+    """Last available close of each calendar month per stock (months x stocks)."""
+    # last() takes the last row in input order, so order by date first
+    df = df.sort_values(['Stock', 'Date'], kind='stable')
+    month = df['Date'].dt.to_period('M').rename('Month')
+    wide = df.groupby([month, 'Stock'], observed=True, sort=False)[price_col].last().unstack()
+    return wide.sort_index()
+
+
+def _bucket_means(codes, returns, n):
+    """Equal-weight mean return per (row, bucket); NaN for empty buckets."""
+    ok = (codes >= 0) & np.isfinite(returns)
+    rows = np.broadcast_to(np.arange(codes.shape[0])[:, None], codes.shape)
+    cell = (rows * n + codes)[ok]
+    size = codes.shape[0] * n
+    sums = np.bincount(cell, weights=returns[ok], minlength=size)
+    counts = np.bincount(cell, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = sums / counts
+    return means.reshape(codes.shape[0], n), counts.reshape(codes.shape[0], n)
+
+
+@dataclass
+class BacktestResult:
+    """Per-rebalance quantile returns (rows: formation dates, columns: Q1..Qn)."""
+
+    momentum: pd.DataFrame
+    value: pd.DataFrame
+    momentum_counts: pd.DataFrame
+    value_counts: pd.DataFrame
+    periods_per_year: int
+
+    @property
+    def spreads(self):
+        """Momentum Qn-Q1 and value Q1-Qn long-short returns per period."""
+        return pd.DataFrame({
+            'momentum': self.momentum.iloc[:, -1] - self.momentum.iloc[:, 0],
+            'value': self.value.iloc[:, 0] - self.value.iloc[:, -1],
+        })
+
+    def summary(self):
+        """
+        Annualized mean, volatility, Sharpe-like ratio and t-stat per series,
+        plus a Newey-West t-stat that allows for autocorrelated returns.
+        """
+        table = pd.concat({
+            'momentum': self.momentum, 'value': self.value, 'spread': self.spreads,
+        }, axis=1)
+        mean = table.mean()
+        std = table.std()
+        n = table.count()
+        return pd.DataFrame({
+            'mean_ann': mean * self.periods_per_year,
+            'vol_ann': std * np.sqrt(self.periods_per_year),
+            'sharpe': mean / std * np.sqrt(self.periods_per_year),
+            't_stat': mean / (std / np.sqrt(n)),
+            'nw_t_stat': newey_west(table)['t_stat'].to_numpy(),
+            'periods': n,
+        })
+
+
+def formation_matrices(prices, pe=None, start='2015-01', end='2024-12', rebalance='M', lookback=12, skip=1):
+    """
+    (formation months, momentum, P/E, forward returns) for every rebalance
+    date; the three matrices are (dates x stocks). See run_backtest for the
+    accepted ``prices`` and ``pe`` inputs; non-positive P/E is NaN.
+    """
+    if isinstance(prices, (PricePanel, TotalReturns)):
+        month_end = prices.month_end()
+        prices = pd.DataFrame(month_end.values, index=month_end.dates.to_period('M'),
+                              columns=month_end.tickers, copy=False)
+    elif 'Date' in getattr(prices, 'columns', ()):
+        prices = month_end_prices(prices)
+    if len(prices.index):
+        # One row per calendar month, so 'lookback' rows back is that many months
+        prices = prices.reindex(pd.period_range(prices.index.min(), prices.index.max(), freq='M'))
+    months = prices.index
+    closes = prices.to_numpy(dtype=np.float64)
+    hold = REBALANCE_MONTHS[rebalance]
+
+    # Formation dates: enough history behind them, a full holding period ahead
+    first = max(lookback, skip)
+    rows = np.arange(first, len(months) - hold)
+    in_range = (months[rows] >= pd.Period(start, 'M')) & (months[rows] <= pd.Period(end, 'M'))
+    rows = rows[in_range][::hold]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        momentum = closes[rows - skip] / closes[rows - lookback] - 1
+        forward = closes[rows + hold] / closes[rows] - 1
+
+    if pe is None:
+        value = np.full((len(rows), prices.shape[1]), np.nan)
+    elif isinstance(pe, PointInTimeStore):
+        # P/E as known at each formation month end, never a later snapshot
+        ids = pe.symbols.encode(pd.Series(prices.columns, dtype=object), add=False)
+        value = pe.as_of('trailingPE', months[rows].to_timestamp(how='end'), ids)
+    elif isinstance(pe, pd.DataFrame):
+        value = pe.reindex(index=months, columns=prices.columns).to_numpy(dtype=np.float64)[rows]
+    else:
+        value = np.broadcast_to(pe.reindex(prices.columns).to_numpy(dtype=np.float64), (len(rows), prices.shape[1]))
+    value = np.where(value > 0, value, np.nan)
+    return months[rows], momentum, value, forward
+
+
+def run_backtest(prices, pe=None, start='2015-01', end='2024-12', rebalance='M',
+                 lookback=12, skip=1, n_quantiles=5):
+    """
+    Rebalance every month ('M') or quarter ('Q') between ``start`` and
+    ``end``, form quantiles on trailing momentum (``lookback`` months,
+    skipping the last ``skip``) and on P/E, and record the forward return
+    of each equal-weight portfolio until the next rebalance.
+
+    ``prices`` is a PricePanel (or its TotalReturns view), a long
+    (Date, Stock, Close) frame or a month-end matrix from month_end_prices.
+    ``pe`` is optional: a Series per stock (static snapshot), a
+    (months x stocks) frame or a PointInTimeStore (as of each formation
+    date, so free of look-ahead). Only positive P/E is ranked.
+    """
+    index, momentum, value, forward = formation_matrices(prices, pe, start, end, rebalance, lookback, skip)
+    hold = REBALANCE_MONTHS[rebalance]
+    labels = [f'Q{i + 1}' for i in range(n_quantiles)]
+
+    # Both factors, every formation date: one (2 x dates x stocks) ranking
+    mom_codes, val_codes = quantile_codes(np.stack([momentum, value]), n_quantiles)
+    mom_means, mom_counts = _bucket_means(mom_codes, forward, n_quantiles)
+    val_means, val_counts = _bucket_means(val_codes, forward, n_quantiles)
+
+    return BacktestResult(
+        momentum=pd.DataFrame(mom_means, index=index, columns=labels),
+        value=pd.DataFrame(val_means, index=index, columns=labels),
+        momentum_counts=pd.DataFrame(mom_counts, index=index, columns=labels),
+        value_counts=pd.DataFrame(val_counts, index=index, columns=labels),
+        periods_per_year=12 // hold,
+    )
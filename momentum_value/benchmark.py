@@ -0,0 +1,319 @@
+"""
+Benchmark harness for the hot paths of the analysis.
+
+A synthetic generator writes price and fundamentals files with the real
+schemas (Stock_Data.csv with its unnamed index column; FUNDAMENTALratios.csv
+with .NS/.BO listings and the repeated revenuePerShare column) at any size;
+prices are generated and written one year at a time in float32.
+Each stage is timed (best of ``repeat`` runs) and then re-run once under
+tracemalloc for its peak traced memory. Results are written as JSON so runs
+can be compared across commits.
+
+Usage:
+    python -m momentum_value.benchmark --tickers 1000 5000 --years 1 5 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.backtest import run_backtest
+from momentum_value.fundamentals import load_fundamentals
+from momentum_value.panel import PricePanel
+from momentum_value.price_cache import load_prices
+from momentum_value.ranking import quantile_series
+from momentum_value.returns import ReturnEngine
+from momentum_value.tickers import normalize_ticker, normalize_tickers
+
+
+FUNDAMENTAL_COLUMNS = [
+    'symbol', 'revenuePerShare', 'trailingPE', 'earningsQuarterlyGrowth', 'previousClose', 'open',
+    'dayLow', 'dayHigh', 'volume', 'trailingEps', 'pegRatio', 'ebitda', 'totalDebt', 'totalRevenue',
+    'debtToEquity', 'revenuePerShare', 'earningsGrowth', 'revenueGrowth',
+]
+
+
+# ----------------------------------------------------------------------
+# Synthetic data
+# ----------------------------------------------------------------------
+def synthetic_tickers(n_tickers):
+    """Distinct upper-case symbols: TKR0, TKR1, ..."""
+    return np.array([f'TKR{i}' for i in range(n_tickers)], dtype=object)
+
+
+def iter_synthetic_prices(n_tickers=1000, n_years=2, end_year=2024, seed=42):
+    """
+    synthetic_prices one calendar year at a time. Each ticker's walk carries
+    over from one year to the next, and the dense (days x tickers) arrays
+    are float32 and one year long, so memory does not grow with ``n_years``.
+    """
+    rng = np.random.default_rng(seed)
+    names = synthetic_tickers(n_tickers)
+    drift = rng.normal(0.0003, 0.0004, n_tickers).astype(np.float32)
+    vol = rng.uniform(0.01, 0.03, n_tickers).astype(np.float32)
+    level = np.log(rng.uniform(20, 2000, n_tickers)).astype(np.float32)
+    for year in range(end_year - n_years + 1, end_year + 1):
+        dates = pd.bdate_range(f'{year}-01-01', f'{year}-12-31')
+        shape = (len(dates), n_tickers)
+        log_close = rng.standard_normal(shape, dtype=np.float32)
+        log_close *= vol
+        log_close += drift
+        np.cumsum(log_close, axis=0, out=log_close)
+        log_close += level
+        level = log_close[-1].copy()
+        present = rng.random(shape, dtype=np.float32) > 0.02
+
+        day_idx, tkr_idx = np.nonzero(present)
+        close = np.exp(log_close[day_idx, tkr_idx])
+        del log_close, present
+        spread = np.abs(rng.standard_normal(len(close), dtype=np.float32)) * np.float32(0.01)
+        high, low = close * (1 + spread), close * (1 - spread)
+        # The open is a draw around the close, kept inside the day's range
+        open_ = np.clip(close * (1 + rng.standard_normal(len(close), dtype=np.float32) * np.float32(0.005)), low, high)
+        yield pd.DataFrame({
+            'Date': np.asarray(dates.strftime('%Y-%m-%d'), dtype=object)[day_idx],
+            'Open': open_,
+            'High': high,
+            'Low': low,
+            'Close': close,
+            'Volume': rng.integers(1_000, 5_000_000, len(close)),
+            'Stock': names[tkr_idx],
+        })
+
+
+def synthetic_prices(n_tickers=1000, n_years=2, end_year=2024, seed=42):
+    """
+    Long (Date, Open, High, Low, Close, Volume, Stock) frame: business days
+    over ``n_years`` calendar years ending with ``end_year``, geometric
+    random-walk closes (float32) and a few missing days per ticker.
+    """
+    return pd.concat(iter_synthetic_prices(n_tickers, n_years, end_year, seed), ignore_index=True)
+
+
+def synthetic_fundamentals(n_tickers=1000, seed=42, dual_listed=0.5):
+    """
+    Fundamentals rows in the FUNDAMENTALratios.csv layout: every ticker on
+    .NS, a ``dual_listed`` share also on .BO, ~5% negative P/E and some
+    missing values, as in the real file.
+    """
+    rng = np.random.default_rng(seed + 1)
+    tickers = synthetic_tickers(n_tickers)
+    dual = tickers[rng.random(n_tickers) < dual_listed]
+    symbols = np.concatenate([tickers + '.NS', dual + '.BO'])
+    n = len(symbols)
+
+    price = rng.uniform(20, 2000, n)
+    pe = rng.lognormal(3.2, 0.6, n) * np.where(rng.random(n) < 0.05, -1, 1)
+    values = {
+        'revenuePerShare': rng.lognormal(4, 1, n),
+        'trailingPE': pe,
+        'earningsQuarterlyGrowth': rng.normal(0.1, 0.4, n),
+        'previousClose': price,
+        'open': price * (1 + rng.normal(0, 0.01, n)),
+        'dayLow': price * (1 - np.abs(rng.normal(0, 0.01, n))),
+        'dayHigh': price * (1 + np.abs(rng.normal(0, 0.01, n))),
+        # NSE listings trade more, so they win primary-listing resolution
+        'volume': np.where(np.char.endswith(symbols.astype(str), '.NS'), 10.0, 1.0) * rng.integers(1_000, 1_000_000, n),
+        'trailingEps': price / pe,
+        'pegRatio': rng.lognormal(0.5, 0.7, n),
+        'ebitda': rng.lognormal(22, 1.5, n),
+        'totalDebt': rng.lognormal(22, 2, n),
+        'totalRevenue': rng.lognormal(24, 1.5, n),
+        'debtToEquity': rng.lognormal(3.5, 1, n),
+        'earningsGrowth': rng.normal(0.1, 0.4, n),
+        'revenueGrowth': rng.normal(0.1, 0.2, n),
+    }
+    for col in values.values():
+        col[rng.random(n) < 0.1] = np.nan
+    rows = [symbols] + [values[c] for c in FUNDAMENTAL_COLUMNS[1:]]
+    return pd.DataFrame(dict(enumerate(rows))).set_axis(FUNDAMENTAL_COLUMNS, axis=1)
+
+
+def write_dataset(directory, n_tickers=1000, n_years=2, end_year=2024, seed=42):
+    """Write both files in the repo's Datasets/ layout; returns their paths."""
+    price_dir = os.path.join(directory, 'Datasets', 'stock_price_dataset')
+    os.makedirs(price_dir, exist_ok=True)
+    price_path = os.path.join(price_dir, 'Stock_Data.csv')
+    fundamentals_path = os.path.join(directory, 'Datasets', 'FUNDAMENTALratios.csv')
+    # Written a year at a time, with the running row number as the unnamed index
+    offset = 0
+    for i, chunk in enumerate(iter_synthetic_prices(n_tickers, n_years, end_year, seed)):
+        chunk.index += offset
+        chunk.to_csv(price_path, mode='w' if i == 0 else 'a', header=i == 0)
+        offset += len(chunk)
+    synthetic_fundamentals(n_tickers, seed).to_csv(fundamentals_path, index=False)
+    return price_path, fundamentals_path
+
+
+# ----------------------------------------------------------------------
+# Stages
+# ----------------------------------------------------------------------
+def _stage_read_csv(ctx):
+    ctx['raw'] = pd.read_csv(ctx['price_path'])
+    return len(ctx['raw'])
+
+
+def _stage_price_cache(ctx):
+    ctx['prices'] = load_prices(ctx['price_path'], cache_dir=ctx['cache_dir'])
+    return len(ctx['prices'])
+
+
+def _stage_fundamentals(ctx):
+    ctx['fundamentals'] = load_fundamentals(ctx['fundamentals_path'], cache_dir=ctx['cache_dir']).frame
+    return len(ctx['fundamentals'])
+
+
+def _stage_normalize_tickers(ctx):
+    normalize_ticker.cache_clear()
+    ctx['prices']['Stock'] = normalize_tickers(ctx['prices']['Stock'])
+    return len(ctx['prices'])
+
+
+def _stage_merge(ctx):
+    # Story 1.2: restrict both datasets to the common tickers
+    prices, fundamentals = ctx['prices'], ctx['fundamentals']
+    common = set(prices['Stock'].dropna().unique()) & set(fundamentals.index)
+    ctx['universe'] = prices[prices['Stock'].isin(common)]
+    return len(ctx['universe'])
+
+
+def _stage_momentum(ctx):
+    # Story 1.3: calculate_momentum for the last two years, joined with P/E
+    engine = ReturnEngine(ctx['universe'])
+    year = ctx['end_year']
+    analysis = pd.DataFrame({
+        'momentum': engine.annual_returns(year - 1),
+        'return': engine.annual_returns(year),
+    })
+    analysis['pe_ratio'] = ctx['fundamentals']['trailingPE'].reindex(analysis.index)
+    ctx['analysis'] = analysis[analysis['pe_ratio'] > 0].dropna()
+    return len(analysis)
+
+
+def _stage_quintile_stats(ctx):
+    # Story 1.6: quintile codes and groupby mean/std/count
+    analysis = ctx['analysis']
+    for col in ('momentum', 'pe_ratio'):
+        buckets = quantile_series(analysis[col], 5)
+        analysis.groupby(buckets)['return'].agg(['mean', 'std', 'count'])
+    return len(analysis)
+
+
+def _stage_panel(ctx):
+    ctx['panel'] = PricePanel.from_long(ctx['universe'])
+    return ctx['panel'].values.size
+
+
+def _stage_backtest(ctx):
+    result = run_backtest(ctx['panel'], ctx['fundamentals']['trailingPE'])
+    return len(result.momentum)
+
+
+STAGES = {
+    'read_csv': _stage_read_csv,
+    'price_cache': _stage_price_cache,
+    'fundamentals': _stage_fundamentals,
+    'normalize_tickers': _stage_normalize_tickers,
+    'merge': _stage_merge,
+    'momentum': _stage_momentum,
+    'quintile_stats': _stage_quintile_stats,
+    'panel': _stage_panel,
+    'backtest': _stage_backtest,
+}
+
+
+def _measure(func, ctx, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = func(ctx)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(ctx)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, rows
+
+
+def run_case(n_tickers, n_years, repeat=3, stages=None, end_year=2024, seed=42, verbose=True):
+    """
+    Generate one dataset and benchmark every stage on it.
+
+    Stages run in order and share state, so a later stage (e.g. merge) works
+    on the output of the earlier ones; unselected stages before the last
+    selected one run once, untimed. The price cache stage's first run
+    builds the cache, so with ``repeat`` > 1 the best time is a warm load.
+    """
+    stages = stages or list(STAGES)
+    order = [name for name in STAGES if list(STAGES).index(name) <= max(map(list(STAGES).index, stages))]
+    records = []
+    with tempfile.TemporaryDirectory() as directory:
+        price_path, fundamentals_path = write_dataset(directory, n_tickers, n_years, end_year, seed)
+        ctx = {
+            'price_path': price_path,
+            'fundamentals_path': fundamentals_path,
+            'cache_dir': os.path.join(directory, '.cache'),
+            'end_year': end_year,
+        }
+        for name in order:
+            if name not in stages:
+                STAGES[name](ctx)
+                continue
+            seconds, peak, rows = _measure(STAGES[name], ctx, repeat)
+            records.append({
+                'stage': name,
+                'tickers': n_tickers,
+                'years': n_years,
+                'rows': int(rows),
+                'seconds': seconds,
+                'peak_mb': peak / 2**20,
+            })
+            if verbose:
+                print(f"{n_tickers:>6} tickers {n_years:>2}y  {name:<18} {seconds:8.3f}s  {peak / 2**20:9.1f} MB")
+    return records
+
+
+def environment():
+    """Versions and hardware that benchmark results depend on."""
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def run(tickers=(1000,), years=(2,), repeat=3, stages=None, output=None, verbose=True):
+    """Benchmark every (tickers, years) case; optionally write JSON results."""
+    records = []
+    for n_tickers in tickers:
+        for n_years in years:
+            records.extend(run_case(n_tickers, n_years, repeat, stages, verbose=verbose))
+    result = {'environment': environment(), 'repeat': repeat, 'results': records}
+    if output:
+        with open(output, 'w') as f:
+            json.dump(result, f, indent=2)
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the momentum vs value hot paths.')
+    parser.add_argument('--tickers', type=int, nargs='+', default=[1000])
+    parser.add_argument('--years', type=int, nargs='+', default=[2])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES))
+    parser.add_argument('--output', help='write results as JSON to this path')
+    args = parser.parse_args(argv)
+    run(args.tickers, args.years, args.repeat, args.stages, args.output)
+
+
+if __name__ == '__main__':
+    main()
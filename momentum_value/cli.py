@@ -0,0 +1,192 @@
+"""
+Command line interface: ``python -m momentum_value run|explore|sweep``.
+
+Only argparse and the stdlib are imported up front; each subcommand imports
+what it needs when it runs. ``explore`` checks the fundamentals file with
+the csv module (no DataFrame is built), reading only the columns it reports
+on.
+
+Examples:
+- python -m momentum_value explore
+- python -m momentum_value run --output reports/final_results.html --no-figures
+- python -m momentum_value sweep --lookbacks calendar 6 12 --quantiles 5 10 --pe-max 100 none
+"""
+
+import argparse
+import csv
+import sys
+
+
+PRICE_LIKE_COLUMNS = ['previousClose', 'open', 'dayLow', 'dayHigh', 'volume']
+FUNDAMENTAL_COLUMNS = ['trailingPE', 'earningsQuarterlyGrowth', 'revenueGrowth', 'debtToEquity',
+                       'pegRatio', 'revenuePerShare']
+DEFAULT_FUNDAMENTALS = 'Datasets/FUNDAMENTALratios.csv'
+
+
+def _float_or_none(value):
+    return None if value.lower() == 'none' else float(value)
+
+
+def _lookback(value):
+    return value if value == 'calendar' else int(value)
+
+
+# ----------------------------------------------------------------------
+# explore
+# ----------------------------------------------------------------------
+def _number(text):
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def explore(path=DEFAULT_FUNDAMENTALS, columns=None):
+    """
+    Schema and completeness of the fundamentals file: which expected
+    columns exist, their non-null/numeric counts, positive P/E and listings
+    per company. Only the symbol and checked columns are read.
+    """
+    from momentum_value.tickers import normalize_ticker
+
+    columns = columns or PRICE_LIKE_COLUMNS + FUNDAMENTAL_COLUMNS
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        # First occurrence wins for repeated names (revenuePerShare appears twice)
+        position = {}
+        for pos, name in enumerate(header):
+            position.setdefault(name, pos)
+        present = [c for c in columns if c in position]
+        symbol_pos = position.get('symbol')
+
+        rows = 0
+        non_null = dict.fromkeys(present, 0)
+        numeric = dict.fromkeys(present, 0)
+        positive_pe = 0
+        listings = {}
+        for row in reader:
+            rows += 1
+            for name in present:
+                value = row[position[name]].strip()
+                if value:
+                    non_null[name] += 1
+                    number = _number(value)
+                    if number is not None:
+                        numeric[name] += 1
+                        if name == 'trailingPE' and number > 0:
+                            positive_pe += 1
+            if symbol_pos is not None:
+                company = normalize_ticker(row[symbol_pos])
+                listings[company] = listings.get(company, 0) + 1
+
+    print("=" * 60)
+    print(f"FUNDAMENTALS SCHEMA CHECK: {path}")
+    print("=" * 60)
+    print(f"Rows: {rows}  Columns: {len(header)}")
+    repeated = sorted({name for name in header if header.count(name) > 1})
+    if repeated:
+        print(f"Repeated columns (first occurrence used): {repeated}")
+    print()
+    print(f"{'column':<26} {'present':>8} {'non-null':>9} {'numeric':>8}")
+    for name in columns:
+        if name in position:
+            print(f"{name:<26} {'✅':>7} {non_null[name]:>9} {numeric[name]:>8}")
+        else:
+            print(f"{name:<26} {'❌':>7} {'-':>9} {'-':>8}")
+    print()
+    if symbol_pos is None:
+        print("❌ No 'symbol' column")
+    else:
+        multi = sum(1 for n in listings.values() if n > 1)
+        print(f"Companies (tickers normalized): {len(listings)}")
+        print(f"Companies listed more than once: {multi}")
+    if 'trailingPE' in position:
+        print(f"Positive P/E ratios: {positive_pe}/{rows}")
+    return {'rows': rows, 'columns': header, 'non_null': non_null, 'numeric': numeric,
+            'companies': len(listings), 'positive_pe': positive_pe}
+
+
+# ----------------------------------------------------------------------
+# run / sweep
+# ----------------------------------------------------------------------
+def _config(args):
+    from momentum_value.config import AnalysisConfig
+
+    return AnalysisConfig(
+        price_path=args.prices,
+        fundamentals_path=args.fundamentals,
+        fundamentals_history_path=args.fundamentals_history,
+        momentum_year=args.momentum_year,
+        return_year=args.return_year,
+        n_quantiles=args.n_quantiles,
+        pe_max=args.pe_cap,
+        total_return=args.total_return,
+    )
+
+
+def run(args):
+    from momentum_value.report import run_report
+
+    run_report(_config(args), args.output, figures=not args.no_figures, workers=args.workers,
+               use_cache=not args.no_cache)
+
+
+def sweep(args):
+    from momentum_value.sweep import sweep as run_sweep
+
+    table = run_sweep(_config(args), lookbacks=args.lookbacks, n_quantiles=args.quantiles or [args.n_quantiles],
+                      pe_max=args.pe_max, workers=args.workers)
+    if args.output:
+        table.to_csv(args.output, index=False)
+        print(f"Sweep results written to {args.output}")
+    else:
+        print(table.to_string(index=False))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m momentum_value',
+                                     description='Momentum vs value factor analysis.')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ex = commands.add_parser('explore', help='schema/completeness check of the fundamentals file')
+    ex.add_argument('--fundamentals', default=DEFAULT_FUNDAMENTALS)
+    ex.add_argument('--columns', nargs='+', help='columns to check (default: price-like and key ratios)')
+    ex.set_defaults(func=lambda args: explore(args.fundamentals, args.columns))
+
+    shared = argparse.ArgumentParser(add_help=False)
+    shared.add_argument('--prices', default='Datasets/stock_price_dataset/Stock_Data.csv',
+                        help='price CSV, or a glob, directory or zip of per-ticker/per-year files')
+    shared.add_argument('--fundamentals', default=DEFAULT_FUNDAMENTALS)
+    shared.add_argument('--fundamentals-history', help='dated fundamentals snapshots; P/E as of the formation date')
+    shared.add_argument('--momentum-year', type=int, default=2023)
+    shared.add_argument('--return-year', type=int, default=2024)
+    shared.add_argument('--n-quantiles', type=int, default=5)
+    shared.add_argument('--pe-cap', type=_float_or_none, default=None, help='P/E upper bound (run)')
+    shared.add_argument('--total-return', action='store_true', help='reinvest dividends')
+    shared.add_argument('--workers', type=int, default=None)
+
+    rn = commands.add_parser('run', parents=[shared], help='full analysis and report')
+    rn.add_argument('--output', default='reports/final_results.md', help='.md or .html')
+    rn.add_argument('--no-figures', action='store_true', help='skip figure rendering (no matplotlib)')
+    rn.add_argument('--no-cache', action='store_true', help='recompute every stage')
+    rn.set_defaults(func=run)
+
+    sw = commands.add_parser('sweep', parents=[shared], help='parameter grid of spreads and t-tests')
+    sw.add_argument('--lookbacks', nargs='+', type=_lookback, default=['calendar'],
+                    help="'calendar' or months, e.g. calendar 6 12")
+    sw.add_argument('--quantiles', nargs='+', type=int, help='quantile counts (default: --n-quantiles)')
+    sw.add_argument('--pe-max', nargs='+', type=_float_or_none, default=[100.0], help="caps; 'none' for no cap")
+    sw.add_argument('--output', help='write the table as CSV')
+    sw.set_defaults(func=sweep)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    args.func(args)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
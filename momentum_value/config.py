@@ -0,0 +1,59 @@
+"""
+Analysis configuration shared by the loaders, the pipeline and the sweeps.
+
+One AnalysisConfig describes the whole study: which files, which years,
+which universe of tickers and how portfolios are formed. Loaders derive
+their row filters from it so the data that is read always matches the
+analysis that is run.
+"""
+
+from dataclasses import dataclass, replace
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class AnalysisConfig:
+    """Parameters of one momentum vs value study (defaults match the starter)."""
+
+    price_path: str = 'Datasets/stock_price_dataset/Stock_Data.csv'
+    fundamentals_path: str = 'Datasets/FUNDAMENTALratios.csv'
+    dividends_path: str = 'Datasets/stock_price_dataset/Dividends.csv'
+    fundamentals_history_path: str = None
+    momentum_year: int = 2023
+    return_year: int = 2024
+    n_quantiles: int = 5
+    pe_min: float = 0.0
+    pe_max: float = None
+    min_trading_days: int = 1
+    total_return: bool = False
+    extra_factors: tuple = ()
+    lean: bool = False
+    price_chunksize: int = None
+    tickers: tuple = None
+
+    @property
+    def years(self):
+        """Calendar years the analysis touches (formation through holding)."""
+        first, last = sorted((self.momentum_year, self.return_year))
+        return list(range(first, last + 1))
+
+    @property
+    def formation_date(self):
+        """When portfolios are formed: the end of the momentum year."""
+        return pd.Timestamp(f'{self.momentum_year}-12-31')
+
+    @property
+    def start_date(self):
+        return pd.Timestamp(f'{min(self.years)}-01-01')
+
+    @property
+    def end_date(self):
+        return pd.Timestamp(f'{max(self.years)}-12-31 23:59:59')
+
+    def with_tickers(self, tickers):
+        """Copy of this config restricted to a ticker universe."""
+        return replace(self, tickers=tuple(sorted(tickers)))
+
+    def replace(self, **changes):
+        return replace(self, **changes)
@@ -0,0 +1,125 @@
+"""
+Dividend-adjusted (total) returns on top of a PricePanel.
+
+Dividends.csv lists cash dividends by date. Each one is joined as-of onto
+the panel (the first trading day on or after its date with a close for
+that ticker) and reinvested at that close, which multiplies the holding by
+``1 + dividend / close``. The log growth of those events is summed per
+ticker into one sorted event table, so the adjustment factor of any
+(date, ticker) is a binary search away. Adjusted closes are only formed for
+the rows a caller asks for; the raw panel is never copied.
+"""
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.loader import is_multi, load_frame
+from momentum_value.schema import DIVIDENDS, read_table
+from momentum_value.tickers import normalize_tickers
+
+
+def load_dividends(path='Datasets/stock_price_dataset/Dividends.csv'):
+    """
+    Dividends as (Date, Dividends, Stock) with normalized tickers; globs,
+    directories and zip archives of per-ticker files are read concurrently.
+    """
+    df = load_frame(path, DIVIDENDS, label='Stock') if is_multi(path) else read_table(path, DIVIDENDS)
+    df['Stock'] = normalize_tickers(df['Stock'])
+    return df.dropna()
+
+
+class TotalReturns:
+    """
+    Total-return view of a PricePanel.
+
+    Offers the same period_return / lookback_return / month_end calls as
+    the panel, so momentum, sweep and backtest code can take either.
+
+    Examples:
+    - tr = TotalReturns(panel, load_dividends())
+    - tr.period_return('2024-01-01', '2024-12-31')   # with dividends reinvested
+    - run_backtest(tr, pe)
+    """
+
+    def __init__(self, panel, dividends):
+        self.panel = panel
+        n_dates, n_tickers = panel.shape
+        self._span = n_dates + 1
+
+        cols = panel.columns_of(dividends['Stock'])
+        dates = pd.DatetimeIndex(dividends['Date']).to_numpy(dtype='datetime64[ns]')
+        rows = np.searchsorted(panel.dates.values, dates, side='left')
+        amounts = dividends['Dividends'].to_numpy(dtype=np.float64)
+
+        keep = (cols >= 0) & (rows < n_dates)
+        cols, rows, amounts = cols[keep], rows[keep], amounts[keep]
+
+        # As-of join: roll each event forward to the ticker's next close
+        closes = panel.values[rows, cols].astype(np.float64)
+        pending = ~np.isfinite(closes) & (rows < n_dates - 1)
+        while pending.any():
+            rows[pending] += 1
+            closes[pending] = panel.values[rows[pending], cols[pending]]
+            pending = ~np.isfinite(closes) & (rows < n_dates - 1)
+        ok = np.isfinite(closes) & (closes > 0)
+
+        keys = cols[ok].astype(np.int64) * self._span + rows[ok]
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+        # Leading 0: entry k is the growth of the first k events, so every
+        # searchsorted position indexes it, even with no events at all
+        self._log_growth = np.concatenate([[0.0], np.cumsum(np.log1p(amounts[ok] / closes[ok])[order])])
+        self._start = np.searchsorted(self._keys, np.arange(n_tickers, dtype=np.int64) * self._span, side='left')
+        self._base = self._log_growth[self._start]
+
+    def __len__(self):
+        """Number of dividend events matched to the panel."""
+        return len(self._keys)
+
+    def factor(self, rows, cols=None):
+        """
+        Cumulative reinvestment factor at panel ``rows`` (1 before the first
+        dividend). ``cols`` defaults to every ticker and broadcasts with rows.
+        """
+        if cols is None:
+            cols = np.arange(self.panel.shape[1])
+        rows, cols = np.broadcast_arrays(np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64))
+        # Events of this ticker up to and including ``rows``; none gives 0 growth
+        idx = np.searchsorted(self._keys, cols * self._span + rows, side='right')
+        return np.exp(self._log_growth[idx] - self._base[cols])
+
+    def adjusted(self, rows):
+        """Dividend-adjusted closes for the requested panel rows only."""
+        rows = np.asarray(rows, dtype=np.int64)
+        return self.panel.values[rows] * self.factor(rows[..., None])
+
+    def _ratio(self, first, last):
+        cols = np.arange(self.panel.shape[1])
+        ok = (first >= 0) & (last >= 0)
+        first, last = np.where(ok, first, 0), np.where(ok, last, 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ret = (self.panel.values[last, cols] * self.factor(last, cols)) / \
+                  (self.panel.values[first, cols] * self.factor(first, cols)) - 1
+        return pd.Series(np.where(ok, ret, np.nan), index=self.panel.tickers)
+
+    def period_return(self, start, end, min_days=1):
+        """Total return from the first to the last valid close in [start, end]."""
+        return self._ratio(*self.panel.valid_bounds(start, end, min_days))
+
+    def lookback_return(self, as_of, months, skip=0):
+        """Trailing total return, windowed as PricePanel.lookback_return."""
+        as_of = pd.Timestamp(as_of)
+        end_row = self.panel.row_of(as_of - pd.DateOffset(months=skip))
+        start_row = self.panel.row_of(as_of - pd.DateOffset(months=months))
+        if start_row < 0 or end_row < 0:
+            return pd.Series(np.nan, index=self.panel.tickers)
+        _, first = self.panel.valid_bounds(None, self.panel.dates[start_row])
+        _, last = self.panel.valid_bounds(None, self.panel.dates[end_row])
+        return self._ratio(first, last)
+
+    def month_end(self):
+        """Panel of dividend-adjusted month-end closes."""
+        month_end = self.panel.month_end()
+        rows = np.searchsorted(self.panel.dates.values, month_end.dates.values, side='left')
+        values = month_end.values * self.factor(rows[:, None])
+        return month_end._derive(values.astype(month_end.values.dtype), month_end.dates)
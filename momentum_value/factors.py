@@ -0,0 +1,240 @@
+"""
+Factor library: raw factors, winsorized z-scores, ranks and composites.
+
+Factors are registered by name, like pipeline stages. Each one is a
+vectorized expression over the fundamentals table or the price panel that
+returns one value per ticker; compute_factors stacks them into a single
+(tickers x factors) matrix and winsorizes, z-scores and ranks every column
+in one NumPy pass. Composite scores are a weight matrix applied to the
+signed z-scores, so adding a factor or a composite is one registration,
+not another per-column loop.
+
+Output columns for a factor ``f``: ``f`` (raw), ``f_z`` (winsorized
+z-score, sign flipped so higher is always better) and ``f_rank``
+(percentile of ``f_z``). Composites add ``<name>_score``.
+"""
+
+import warnings
+from dataclasses import dataclass
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.risk import RiskModel, equal_weight_market, max_drawdown
+
+
+@dataclass(frozen=True)
+class Factor:
+    """A named per-ticker measure: func(data) -> array aligned to data.tickers."""
+
+    name: str
+    func: object
+    higher_is_better: bool = True
+    needs_prices: bool = False
+
+
+FACTORS = {}
+COMPOSITES = {}
+
+
+def factor(name, higher_is_better=True, needs_prices=False):
+    """Register a function as a factor."""
+    def register(func):
+        FACTORS[name] = Factor(name, func, higher_is_better, needs_prices)
+        return func
+    return register
+
+
+def composite(name, members, weights=None):
+    """Register a composite score as a weighted mean of member z-scores."""
+    weights = weights or [1.0] * len(members)
+    COMPOSITES[name] = dict(zip(members, weights))
+
+
+class FactorData:
+    """
+    Inputs of the factor functions, aligned to one ticker axis.
+
+    ``fundamentals`` is a frame indexed by ticker; ``panel`` an optional
+    PricePanel, windowed to calendar ``year`` for price-based factors.
+    """
+
+    def __init__(self, tickers, fundamentals=None, panel=None, year=None):
+        self.tickers = pd.Index(tickers)
+        self.fundamentals = fundamentals.reindex(self.tickers) if fundamentals is not None else None
+        self.panel = panel.year(year) if panel is not None and year is not None else panel
+
+    def field(self, name):
+        """One fundamentals column as float64 (all NaN if it is absent)."""
+        if self.fundamentals is None or name not in self.fundamentals:
+            return np.full(len(self.tickers), np.nan)
+        return self.fundamentals[name].to_numpy(dtype=np.float64)
+
+    @cached_property
+    def closes(self):
+        """(days x tickers) closes over the panel window, NaN for tickers without prices."""
+        if self.panel is None:
+            raise ValueError("price factors require a PricePanel")
+        return self.panel.aligned(self.tickers)
+
+    @cached_property
+    def daily_returns(self):
+        """(days - 1) x tickers simple returns over the panel window."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.closes[1:] / self.closes[:-1] - 1
+
+
+def _ratio(num, den):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(den != 0, num / den, np.nan)
+
+
+# ----------------------------------------------------------------------
+# Built-in factors
+# ----------------------------------------------------------------------
+@factor('pe', higher_is_better=False)
+def _pe(data):
+    pe = data.field('trailingPE')
+    return np.where(pe > 0, pe, np.nan)
+
+
+@factor('peg', higher_is_better=False)
+def _peg(data):
+    peg = data.field('pegRatio')
+    return np.where(peg > 0, peg, np.nan)
+
+
+@factor('debt_to_equity', higher_is_better=False)
+def _debt_to_equity(data):
+    return data.field('debtToEquity')
+
+
+@factor('debt_to_ebitda', higher_is_better=False)
+def _debt_to_ebitda(data):
+    ebitda = data.field('ebitda')
+    return np.where(ebitda > 0, _ratio(data.field('totalDebt'), ebitda), np.nan)
+
+
+@factor('ebitda_margin')
+def _ebitda_margin(data):
+    return _ratio(data.field('ebitda'), data.field('totalRevenue'))
+
+
+@factor('earnings_growth')
+def _earnings_growth(data):
+    return data.field('earningsQuarterlyGrowth')
+
+
+@factor('revenue_growth')
+def _revenue_growth(data):
+    return data.field('revenueGrowth')
+
+
+@factor('daily_range', higher_is_better=False)
+def _daily_range(data):
+    # The growth notebook's daily_volatility: (high - low) / previous close
+    return _ratio(data.field('dayHigh') - data.field('dayLow'), data.field('previousClose'))
+
+
+@factor('volatility', higher_is_better=False, needs_prices=True)
+def _volatility(data):
+    counts = np.isfinite(data.daily_returns).sum(axis=0)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        vol = np.nanstd(data.daily_returns, axis=0, ddof=1) * np.sqrt(252)
+    return np.where(counts >= 2, vol, np.nan)
+
+
+@factor('beta', higher_is_better=False, needs_prices=True)
+def _beta(data):
+    returns = data.daily_returns
+    return RiskModel(returns, equal_weight_market(returns)).beta().to_numpy()
+
+
+@factor('max_drawdown', needs_prices=True)
+def _max_drawdown(data):
+    # Negative fractions, so higher (a shallower drawdown) is better
+    return max_drawdown(data.daily_returns)
+
+
+@factor('momentum', needs_prices=True)
+def _momentum(data):
+    closes = data.closes
+    seen = np.isfinite(closes)
+    first = np.argmax(seen, axis=0)
+    last = len(closes) - 1 - np.argmax(seen[::-1], axis=0)
+    cols = np.arange(closes.shape[1])
+    return np.where(seen.any(axis=0), _ratio(closes[last, cols], closes[first, cols]) - 1, np.nan)
+
+
+composite('value', ('pe', 'peg'))
+composite('quality', ('debt_to_equity', 'debt_to_ebitda', 'ebitda_margin'))
+composite('growth', ('earnings_growth', 'revenue_growth'))
+composite('low_vol', ('volatility', 'daily_range'))
+
+
+# ----------------------------------------------------------------------
+# Column-wise transforms
+# ----------------------------------------------------------------------
+def winsorize(x, limits=(0.01, 0.99)):
+    """Clip every column of ``x`` to its own lower/upper quantiles."""
+    x = np.where(np.isfinite(x), x, np.nan)
+    if not np.isfinite(x).any():
+        return x
+    with warnings.catch_warnings(), np.errstate(invalid='ignore'):
+        # All-NaN columns (a field missing from the data) stay NaN
+        warnings.simplefilter('ignore', RuntimeWarning)
+        lo, hi = np.nanquantile(x, limits, axis=0)
+    return np.clip(x, lo, hi)
+
+
+def zscore(x):
+    """Column-wise (x - mean) / std, ignoring NaN."""
+    counts = np.isfinite(x).sum(axis=0)
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        # All-NaN columns warn in nanmean/nanstd; they come out NaN below
+        warnings.simplefilter('ignore', RuntimeWarning)
+        mean = np.nanmean(x, axis=0)
+        std = np.nanstd(x, axis=0, ddof=1)
+        z = (x - mean) / std
+    return np.where((counts >= 2) & (std > 0), z, np.nan)
+
+
+def compute_factors(fundamentals=None, panel=None, year=None, names=None, composites=None,
+                    tickers=None, limits=(0.01, 0.99)):
+    """
+    Factor table indexed by ticker.
+
+    ``fundamentals`` is a FundamentalsStore or a frame indexed by ticker.
+    ``names`` selects factors (default: every registered factor whose
+    inputs are available); ``composites`` selects composite scores
+    (default: every composite with at least one computed member).
+    """
+    if hasattr(fundamentals, 'frame'):
+        fundamentals = fundamentals.frame
+    if tickers is None:
+        tickers = fundamentals.index if fundamentals is not None else panel.tickers
+    data = FactorData(tickers, fundamentals, panel, year)
+
+    if names is None:
+        names = [n for n, f in FACTORS.items() if panel is not None or not f.needs_prices]
+    specs = [FACTORS[n] for n in names]
+    raw = np.column_stack([np.asarray(f.func(data), dtype=np.float64) for f in specs]) if specs \
+        else np.empty((len(data.tickers), 0))
+    signs = np.array([1.0 if f.higher_is_better else -1.0 for f in specs])
+    z = zscore(winsorize(raw, limits)) * signs
+
+    table = pd.DataFrame(raw, index=data.tickers, columns=names)
+    scores = pd.DataFrame(z, index=data.tickers, columns=[f'{n}_z' for n in names])
+    ranks = scores.rank(pct=True).rename(columns=lambda c: c[:-2] + '_rank')
+
+    if composites is None:
+        composites = [c for c, members in COMPOSITES.items() if set(members) & set(names)]
+    weights = np.array([[COMPOSITES[c].get(n, 0.0) for c in composites] for n in names]).reshape(len(names), -1)
+    # Weighted mean over the members each ticker actually has
+    has = np.isfinite(z)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        combined = (np.where(has, z, 0.0) @ weights) / (has @ weights)
+    combined = pd.DataFrame(combined, index=data.tickers, columns=[f'{c}_score' for c in composites])
+    return pd.concat([table, scores, ranks, combined], axis=1)
@@ -0,0 +1,125 @@
+"""
+Deduplicated, typed fundamentals table keyed by ticker.
+
+FUNDAMENTALratios.csv lists most companies twice (RELIANCE.NS and
+RELIANCE.BO) and repeats the ``revenuePerShare`` column. The loader parses
+the file once with explicit dtypes, never reads the repeated column, keeps
+the primary listing of each company (the one with the higher volume) and
+caches the cleaned table next to the price cache, so consumers share one
+cleaning step and look rows up by ticker or SymbolTable id.
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.loader import is_multi, load_frame
+from momentum_value.price_cache import (
+    CACHE_VERSION, cache_path, is_fresh, read_manifest, source_fingerprint, write_manifest,
+)
+from momentum_value.schema import FUNDAMENTALS, read_table
+from momentum_value.tickers import SYMBOLS, normalize_tickers
+
+
+SYMBOL_COLUMN = 'symbol'
+
+
+def parse_fundamentals(path):
+    """
+    Parse the raw file in one pass through the fundamentals schema: symbol
+    as string, the known ratio columns float64, the repeated column read
+    once (first occurrence) and anything else never parsed. Zip archives
+    (e.g. funda_dataset.zip) and globs are read member by member.
+    """
+    if is_multi(path):
+        return load_frame(path, FUNDAMENTALS)
+    return read_table(path, FUNDAMENTALS)
+
+
+def primary_listings(raw):
+    """
+    One row per normalized ticker: the listing with the highest volume
+    (NSE usually beats BSE), with the exchange kept in ``listing``. Rows
+    without a symbol are dropped.
+    """
+    df = raw[raw[SYMBOL_COLUMN].notna()].copy()
+    df['listing'] = df[SYMBOL_COLUMN].str.extract(r'\.([A-Z]+)$', expand=False)
+    df['ticker'] = normalize_tickers(df[SYMBOL_COLUMN]).astype(df[SYMBOL_COLUMN].dtype)
+    df = df.sort_values(['ticker', 'volume'], ascending=[True, False], na_position='last', kind='stable')
+    df = df.drop_duplicates(subset='ticker', keep='first')
+    return df.set_index('ticker')
+
+
+class FundamentalsStore:
+    """
+    Cleaned fundamentals, one row per ticker.
+
+    Examples:
+    - store.get('RELIANCE')                      # one row as a Series
+    - store.column('trailingPE', panel.ids)      # vector gather by ticker id
+    """
+
+    def __init__(self, frame, symbols=SYMBOLS):
+        self.frame = frame
+        self.symbols = symbols
+        self.ids = symbols.encode(pd.Series(frame.index, dtype=object), clean=True)
+        self._refresh_positions()
+
+    def _refresh_positions(self):
+        # Dense id -> row position table: lookups are one array index
+        self._rows = np.full(max(len(self.symbols), 1), -1, dtype=np.int64)
+        self._rows[self.ids] = np.arange(len(self.ids))
+
+    def __len__(self):
+        return len(self.frame)
+
+    def rows_of(self, ids):
+        """Row positions for ticker ids (-1 where a ticker has no row)."""
+        if len(self._rows) < len(self.symbols):
+            self._refresh_positions()
+        ids = np.asarray(ids, dtype=np.int64)
+        ok = (ids >= 0) & (ids < len(self._rows))
+        return np.where(ok, self._rows[np.where(ok, ids, 0)], -1)
+
+    def get(self, ticker):
+        """Fundamentals of one ticker, or None."""
+        row = self.rows_of([self.symbols.id_of(ticker)])[0]
+        return self.frame.iloc[row] if row >= 0 else None
+
+    def column(self, name, ids=None):
+        """
+        One field as a float array. With ``ids`` (e.g. PricePanel.ids) the
+        result is aligned to them, NaN for tickers without fundamentals.
+        """
+        values = self.frame[name].to_numpy(dtype=np.float64)
+        if ids is None:
+            return values
+        rows = self.rows_of(ids)
+        return np.where(rows >= 0, values[np.maximum(rows, 0)], np.nan)
+
+    def series(self, name, tickers):
+        """One field as a Series indexed by ``tickers``."""
+        ids = self.symbols.encode(pd.Series(list(tickers), dtype=object), add=False)
+        return pd.Series(self.column(name, ids), index=tickers, name=name)
+
+
+def load_fundamentals(path='Datasets/FUNDAMENTALratios.csv', cache_dir=None, symbols=SYMBOLS):
+    """
+    Cleaned FundamentalsStore, rebuilt only when the source file changes
+    (globs and directories are parsed every time).
+    """
+    if not os.path.isfile(path):
+        return FundamentalsStore(primary_listings(parse_fundamentals(path)), symbols)
+    directory = cache_path(path, cache_dir, kind='fundamentals')
+    table_path = os.path.join(directory, 'table.pkl')
+    manifest = read_manifest(directory)
+
+    if is_fresh(manifest, path) and os.path.exists(table_path):
+        frame = pd.read_pickle(table_path)
+    else:
+        frame = primary_listings(parse_fundamentals(path))
+        os.makedirs(directory, exist_ok=True)
+        frame.to_pickle(table_path)
+        write_manifest(directory, {'version': CACHE_VERSION, 'source': source_fingerprint(path)})
+    return FundamentalsStore(frame, symbols)
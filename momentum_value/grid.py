@@ -0,0 +1,194 @@
+"""
+Double-sorted portfolio grids, e.g. 5x5 momentum x value.
+
+An independent sort buckets each factor on its own; a conditional sort
+buckets the second factor within each bucket of the first. Either way every
+stock gets one integer cell id per date, (date * n_first + i) * n_second + j,
+and count, mean and variance of returns for every cell of every date come
+from bincounts over those ids, with no groupby per cell.
+
+Examples:
+- grid = double_sort(df['momentum'], df['pe_ratio'], df['return'], method='conditional')
+- grid.table('mean')                      # n_first x n_second DataFrame, last date
+- backtest_double_sort(panel, pe).summary()
+"""
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.backtest import REBALANCE_MONTHS, formation_matrices
+from momentum_value.ranking import codes_from_ranks, quantile_codes
+
+
+METHODS = ('independent', 'conditional')
+STATS = ('count', 'mean', 'std', 'sharpe', 't_stat')
+
+
+def conditional_codes(first_codes, second, n_first, n_second, tiebreak=None):
+    """
+    Second-factor codes ranked within each (row, first-factor bucket);
+    -1 where the first code is -1 or the second value is missing.
+    """
+    shape = second.shape
+    n_rows = int(np.prod(shape[:-1]))
+    rows = np.repeat(np.arange(n_rows), shape[-1])
+    valid = (first_codes >= 0).ravel() & np.isfinite(second).ravel()
+    group = np.where(valid, rows * n_first + first_codes.ravel(), -1)
+
+    keys = (np.where(valid, second.ravel(), np.inf), group)
+    if tiebreak is not None:
+        keys = (np.broadcast_to(tiebreak, shape).ravel(),) + keys
+    order = np.lexsort(keys)
+    # Rank within a group = offset from the start of its run in sorted order
+    sorted_group = group[order]
+    ranks = np.empty(group.shape, dtype=np.int64)
+    ranks[order] = np.arange(len(order)) - np.searchsorted(sorted_group, sorted_group, side='left')
+    counts = np.bincount(group[valid], minlength=n_rows * n_first)
+    codes = codes_from_ranks(ranks, counts[np.maximum(group, 0)], n_second)
+    return np.where(valid, codes, -1).reshape(shape)
+
+
+def grid_codes(first, second, n_first=5, n_second=5, method='independent', tiebreak=None):
+    """
+    (first codes, second codes) along the last axis. Only names with both
+    factors are sorted, so both sorts see the same universe.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown double-sort method: {method!r}")
+    first = np.asarray(first, dtype=np.float64)
+    second = np.asarray(second, dtype=np.float64)
+    both = np.isfinite(first) & np.isfinite(second)
+    first, second = np.where(both, first, np.nan), np.where(both, second, np.nan)
+    first_codes = quantile_codes(first, n_first, tiebreak)
+    if method == 'independent':
+        return first_codes, quantile_codes(second, n_second, tiebreak)
+    return first_codes, conditional_codes(first_codes, second, n_first, n_second, tiebreak)
+
+
+def cell_stats(first_codes, second_codes, returns, n_first, n_second):
+    """
+    Count, mean and sample std of ``returns`` per (date, i, j) cell, each
+    shaped (dates, n_first, n_second); inputs are (dates x stocks).
+    """
+    n_dates = first_codes.shape[0]
+    rows = np.arange(n_dates)[:, None]
+    ok = (first_codes >= 0) & (second_codes >= 0) & np.isfinite(returns)
+    cells = ((rows * n_first + first_codes) * n_second + second_codes)[ok]
+    values = returns[ok]
+    size = n_dates * n_first * n_second
+
+    count = np.bincount(cells, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(cells, weights=values, minlength=size) / count
+        # Two-pass variance: squared deviations from each cell's own mean
+        dev = values - mean[cells]
+        std = np.sqrt(np.bincount(cells, weights=dev * dev, minlength=size) / (count - 1))
+    shape = (n_dates, n_first, n_second)
+    return count.reshape(shape), mean.reshape(shape), std.reshape(shape)
+
+
+@dataclass
+class GridResult:
+    """Per-date cell statistics, arrays shaped (dates, n_first, n_second)."""
+
+    method: str
+    names: tuple
+    index: pd.Index
+    count: np.ndarray
+    mean: np.ndarray
+    std: np.ndarray
+    periods_per_year: int = 1
+
+    @property
+    def sharpe(self):
+        """Cross-sectional mean / std of each cell (not annualized)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.mean / self.std
+
+    @property
+    def t_stat(self):
+        """t-statistic of each cell's mean return against zero."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.mean / (self.std / np.sqrt(self.count))
+
+    def _labels(self):
+        n_first, n_second = self.mean.shape[1:]
+        return ([f'{self.names[0]} Q{i + 1}' for i in range(n_first)],
+                [f'{self.names[1]} Q{j + 1}' for j in range(n_second)])
+
+    def table(self, stat='mean', date=-1):
+        """One statistic as an n_first x n_second frame for one date (by position)."""
+        rows, cols = self._labels()
+        return pd.DataFrame(getattr(self, stat)[date], index=rows, columns=cols)
+
+    def frame(self):
+        """Tidy table: one row per (date, first quantile, second quantile)."""
+        n_dates, n_first, n_second = self.mean.shape
+        date, i, j = np.meshgrid(np.arange(n_dates), np.arange(n_first), np.arange(n_second), indexing='ij')
+        out = pd.DataFrame({
+            'date': self.index[date.ravel()],
+            f'{self.names[0]}_q': i.ravel() + 1,
+            f'{self.names[1]}_q': j.ravel() + 1,
+        })
+        for stat in STATS:
+            out[stat] = getattr(self, stat).ravel()
+        return out
+
+    def summary(self):
+        """
+        Time-series statistics of each cell's equal-weight return across
+        dates: annualized mean, volatility and Sharpe, t-stat and periods.
+        """
+        rows, cols = self._labels()
+        periods = np.isfinite(self.mean).sum(axis=0)
+        with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+            warnings.simplefilter('ignore', RuntimeWarning)
+            mean = np.nanmean(self.mean, axis=0)
+            std = np.nanstd(self.mean, axis=0, ddof=1)
+            table = {
+                'mean_ann': mean * self.periods_per_year,
+                'vol_ann': std * np.sqrt(self.periods_per_year),
+                'sharpe': mean / std * np.sqrt(self.periods_per_year),
+                't_stat': mean / (std / np.sqrt(periods)),
+                'periods': periods,
+            }
+        index = pd.MultiIndex.from_product([rows, cols])
+        return pd.DataFrame({k: v.ravel() for k, v in table.items()}, index=index)
+
+
+def _values(x):
+    return x.to_numpy(dtype=np.float64, na_value=np.nan) if isinstance(x, pd.Series) else np.asarray(x, dtype=np.float64)
+
+
+def double_sort(first, second, returns, n_first=5, n_second=5, method='independent',
+                names=None, index=None, periods_per_year=1, tiebreak=None):
+    """
+    Double-sort grid of ``returns`` on two factors.
+
+    Inputs are aligned Series or arrays: one cross-section (1-D) or
+    (dates x stocks). ``names`` default to the Series names.
+    """
+    if names is None:
+        names = (getattr(first, 'name', None) or 'first', getattr(second, 'name', None) or 'second')
+    first, second, returns = _values(first), _values(second), _values(returns)
+    if first.ndim == 1:
+        first, second, returns = first[None, :], second[None, :], returns[None, :]
+    first_codes, second_codes = grid_codes(first, second, n_first, n_second, method, tiebreak)
+    count, mean, std = cell_stats(first_codes, second_codes, returns, n_first, n_second)
+    index = pd.RangeIndex(len(first)) if index is None else index
+    return GridResult(method, tuple(names), index, count, mean, std, periods_per_year)
+
+
+def backtest_double_sort(prices, pe, start='2015-01', end='2024-12', rebalance='M',
+                         lookback=12, skip=1, n_quantiles=5, method='independent'):
+    """
+    Momentum x value grid at every rebalance date of run_backtest, on the
+    forward holding-period returns.
+    """
+    index, momentum, value, forward = formation_matrices(prices, pe, start, end, rebalance, lookback, skip)
+    return double_sort(momentum, value, forward, n_quantiles, n_quantiles, method,
+                       names=('momentum', 'value'), index=index,
+                       periods_per_year=12 // REBALANCE_MONTHS[rebalance])
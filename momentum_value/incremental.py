@@ -0,0 +1,278 @@
+"""
+Incremental daily updates of factors and quantile membership.
+
+The daily job does not reload the price history. DailyState keeps one slot
+per ticker id (last close, window-start price, cumulative dividend factor,
+unpaid dividends, P/E and current quantile codes) and ``step`` folds in one
+new day of closes with array updates over the tickers. State is saved as
+.npy files plus a manifest under ``.cache/incremental``, and every step
+appends one row to a CSV results log.
+
+Usage:
+    state = DailyState.from_history(panel, store.column('trailingPE', panel.ids), load_dividends())
+    state.save()
+    ...
+    row = run_daily(todays_rows)   # load, step, save, append to the log
+"""
+
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.config import AnalysisConfig
+from momentum_value.price_cache import CACHE_DIR, read_manifest, write_manifest
+from momentum_value.ranking import quantile_codes
+from momentum_value.tickers import SymbolTable
+
+
+STATE_VERSION = 1
+ARRAYS = ('last_close', 'factor', 'pending', 'start', 'months', 'pe', 'momentum_q', 'value_q')
+LOG_COLUMNS = ['date', 'n_rows', 'n_ranked', 'momentum_spread', 'value_spread',
+               'momentum_turnover', 'value_turnover']
+
+
+def state_dir(cache_dir=None):
+    return os.path.join(cache_dir or CACHE_DIR, 'incremental')
+
+
+class DailyState:
+    """
+    Running momentum/value state, one slot per ticker id.
+
+    ``lookback`` is 'calendar' (year-to-date return, as in the starter) or a
+    number of months, served from a ring of the last month-end closes.
+    Prices are adjusted for dividends: a dividend is held in ``pending``
+    until the ticker's next close and reinvested at that close.
+    """
+
+    def __init__(self, config=None, lookback='calendar', symbols=None):
+        self.config = config or AnalysisConfig()
+        self.lookback = lookback
+        self.symbols = symbols or SymbolTable()
+        self.date = None
+        n_months = 0 if lookback == 'calendar' else int(lookback)
+        self.last_close = np.empty(0)
+        self.factor = np.empty(0)
+        self.pending = np.empty(0)
+        self.start = np.empty(0)
+        self.months = np.empty((n_months, 0))
+        self.pe = np.empty(0)
+        self.momentum_q = np.empty(0, dtype=np.int64)
+        self.value_q = np.empty(0, dtype=np.int64)
+        self._grow()
+
+    def __len__(self):
+        return len(self.last_close)
+
+    def _grow(self):
+        """Extend every per-ticker array to the size of the symbol table."""
+        extra = len(self.symbols) - len(self)
+        if extra <= 0:
+            return
+        fill = {'factor': 1.0, 'pending': 0.0, 'momentum_q': -1, 'value_q': -1}
+        for name in ARRAYS:
+            arr = getattr(self, name)
+            pad = np.full(arr.shape[:-1] + (extra,), fill.get(name, np.nan), dtype=arr.dtype)
+            setattr(self, name, np.concatenate([arr, pad], axis=-1))
+
+    # ------------------------------------------------------------------
+    # Factors
+    # ------------------------------------------------------------------
+    def adjusted(self):
+        """Dividend-adjusted last close per ticker."""
+        return self.last_close * self.factor
+
+    def momentum(self):
+        """Return from the window-start price to the last adjusted close."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self.adjusted() / self.start - 1
+
+    def universe(self):
+        """Tickers with momentum and a P/E inside the configured range."""
+        keep = np.isfinite(self.momentum()) & np.isfinite(self.pe) & (self.pe > self.config.pe_min)
+        if self.config.pe_max is not None:
+            keep &= self.pe < self.config.pe_max
+        return keep
+
+    def rank(self):
+        """Reassign momentum and value quantiles within the universe."""
+        n = self.config.n_quantiles
+        keep = self.universe()
+        self.momentum_q = np.full(len(self), -1, dtype=np.int64)
+        self.value_q = np.full(len(self), -1, dtype=np.int64)
+        self.momentum_q[keep], self.value_q[keep] = quantile_codes(np.stack([self.momentum()[keep], self.pe[keep]]), n)
+        return int(keep.sum())
+
+    def set_pe(self, tickers, pe):
+        """Update the P/E snapshot for some tickers (e.g. from a FundamentalsStore)."""
+        ids = self.symbols.encode(pd.Series(list(tickers), dtype=object))
+        self._grow()
+        ok = ids >= 0
+        self.pe[ids[ok]] = np.asarray(pe, dtype=np.float64)[ok]
+
+    # ------------------------------------------------------------------
+    # Daily step
+    # ------------------------------------------------------------------
+    def _roll(self, date):
+        """Close out the previous month (and year) before a new day is applied."""
+        prev = self.date
+        if prev is None or (date.year, date.month) == (prev.year, prev.month):
+            return
+        if self.lookback == 'calendar':
+            if date.year != prev.year:
+                self.start[:] = np.nan
+        elif len(self.months):
+            self.months = np.roll(self.months, -1, axis=0)
+            self.months[-1] = self.adjusted()
+            self.start = self.months[0].copy()
+
+    def step(self, date, ids, closes, div_ids=(), div_amounts=()):
+        """
+        Apply one trading day: ``ids``/``closes`` are that day's closes and
+        ``div_ids``/``div_amounts`` the dividends dated since the last step.
+        Returns the results-log row for the day.
+        """
+        date = pd.Timestamp(date)
+        if self.date is not None and date <= self.date:
+            raise ValueError(f"{date.date()} is not after the last processed day {self.date.date()}")
+        self._grow()
+        self._roll(date)
+
+        ids = np.asarray(ids, dtype=np.int64)
+        closes = np.asarray(closes, dtype=np.float64)
+        ok = (ids >= 0) & np.isfinite(closes) & (closes > 0)
+        ids, closes = ids[ok], closes[ok]
+        div_ids = np.asarray(div_ids, dtype=np.int64)
+        div_amounts = np.asarray(div_amounts, dtype=np.float64)
+        # -1 ids (missing or unknown tickers) would otherwise credit the last slot
+        paid = (div_ids >= 0) & np.isfinite(div_amounts)
+        np.add.at(self.pending, div_ids[paid], div_amounts[paid])
+
+        # Daily return of every ticker, held in yesterday's quantiles
+        before = self.adjusted()[ids]
+        self.factor[ids] *= 1 + self.pending[ids] / closes
+        self.pending[ids] = 0.0
+        self.last_close[ids] = closes
+        with np.errstate(divide='ignore', invalid='ignore'):
+            daily = closes * self.factor[ids] / before - 1
+        if self.lookback == 'calendar':
+            first = np.isnan(self.start[ids])
+            self.start[ids[first]] = closes[first] * self.factor[ids[first]]
+
+        n = self.config.n_quantiles
+        old_momentum, old_value = self.momentum_q.copy(), self.value_q.copy()
+        row = {
+            'date': date.date().isoformat(),
+            'n_rows': len(ids),
+            'momentum_spread': _spread(daily, old_momentum[ids], n - 1, 0),
+            'value_spread': _spread(daily, old_value[ids], 0, n - 1),
+        }
+        row['n_ranked'] = self.rank()
+        row['momentum_turnover'] = int(((self.momentum_q != old_momentum) & (old_momentum >= 0)).sum())
+        row['value_turnover'] = int(((self.value_q != old_value) & (old_value >= 0)).sum())
+        self.date = date
+        return row
+
+    def update(self, rows, dividends=None):
+        """``step`` from a day's (Date, Stock, Close) rows and optional dividends frame."""
+        dates = pd.DatetimeIndex(rows['Date']).normalize().unique()
+        if len(dates) != 1:
+            raise ValueError(f"Expected rows for one day, got {len(dates)} dates")
+        ids = self.symbols.encode(rows['Stock'])
+        div_ids, div_amounts = (), ()
+        if dividends is not None and len(dividends):
+            div_ids = self.symbols.encode(dividends['Stock'])
+            div_amounts = dividends['Dividends'].to_numpy(dtype=np.float64)
+        return self.step(dates[0], ids, rows['Close'].to_numpy(dtype=np.float64), div_ids, div_amounts)
+
+    @classmethod
+    def from_history(cls, panel, pe=None, dividends=None, config=None, lookback='calendar'):
+        """
+        Replay a PricePanel one row at a time to seed the state (a one-off
+        full pass). ``pe`` is aligned to the panel's tickers.
+        """
+        state = cls(config, lookback, SymbolTable(panel.tickers, clean=True))
+        if pe is not None:
+            state.set_pe(panel.tickers, pe)
+        cols = np.arange(panel.shape[1])
+        if dividends is not None and len(dividends):
+            dividends = dividends.sort_values('Date', kind='stable')
+            # Dividends of tickers outside the panel are dropped, not interned
+            div_ids = state.symbols.encode(dividends['Stock'], add=False)
+            dividends = dividends[div_ids >= 0]
+            div_ids = div_ids[div_ids >= 0]
+            div_amounts = dividends['Dividends'].to_numpy(dtype=np.float64)
+            # Dividends dated in (previous row, this row] are paid at this row
+            cuts = np.searchsorted(pd.DatetimeIndex(dividends['Date']).values, panel.dates.values, side='right')
+        else:
+            div_ids, div_amounts, cuts = np.empty(0, np.int64), np.empty(0), np.zeros(len(panel), np.int64)
+        state._grow()
+        lo = 0
+        for r, date in enumerate(panel.dates):
+            closes = panel.values[r]
+            has = np.isfinite(closes)
+            state.step(date, cols[has], closes[has], div_ids[lo:cuts[r]], div_amounts[lo:cuts[r]])
+            lo = cuts[r]
+        return state
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def save(self, cache_dir=None):
+        directory = state_dir(cache_dir)
+        os.makedirs(directory, exist_ok=True)
+        for name in ARRAYS:
+            np.save(os.path.join(directory, f'{name}.npy'), getattr(self, name))
+        write_manifest(directory, {
+            'version': STATE_VERSION,
+            'date': self.date.isoformat() if self.date is not None else None,
+            'lookback': self.lookback,
+            'n_quantiles': self.config.n_quantiles,
+            'pe_min': self.config.pe_min,
+            'pe_max': self.config.pe_max,
+            'tickers': list(self.symbols.tickers),
+        })
+
+    @classmethod
+    def load(cls, cache_dir=None):
+        directory = state_dir(cache_dir)
+        manifest = read_manifest(directory)
+        if manifest is None or manifest.get('version') != STATE_VERSION:
+            raise FileNotFoundError(f"No incremental state in {directory}; seed it with DailyState.from_history")
+        config = AnalysisConfig(n_quantiles=manifest['n_quantiles'], pe_min=manifest['pe_min'],
+                                pe_max=manifest['pe_max'])
+        state = cls(config, manifest['lookback'], SymbolTable(manifest['tickers'], clean=True))
+        for name in ARRAYS:
+            setattr(state, name, np.load(os.path.join(directory, f'{name}.npy')))
+        state.date = pd.Timestamp(manifest['date']) if manifest['date'] else None
+        return state
+
+
+def _spread(daily, codes, long_q, short_q):
+    """Equal-weight daily return of quantile ``long_q`` minus ``short_q``."""
+    long_leg, short_leg = daily[codes == long_q], daily[codes == short_q]
+    if not len(long_leg) or not len(short_leg):
+        return np.nan
+    return long_leg.mean() - short_leg.mean()
+
+
+def append_log(row, cache_dir=None):
+    """Append one day to ``.cache/incremental/log.csv``."""
+    path = os.path.join(state_dir(cache_dir), 'log.csv')
+    new = not os.path.exists(path)
+    with open(path, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=LOG_COLUMNS)
+        if new:
+            writer.writeheader()
+        writer.writerow(row)
+
+
+def run_daily(rows, dividends=None, cache_dir=None):
+    """Load the saved state, apply one day, save it and log the day."""
+    state = DailyState.load(cache_dir)
+    row = state.update(rows, dividends)
+    state.save(cache_dir)
+    append_log(row, cache_dir)
+    return row
@@ -0,0 +1,194 @@
+"""
+Batched two-sample inference for quantile spreads.
+
+Every comparison is reduced to group moments (count, mean, variance), either
+from NaN-padded stacks of samples or from one bincount over integer bucket
+codes, and Welch t, degrees of freedom, p-values, Cohen's d and confidence
+intervals are then array expressions over all comparisons at once. p-values
+can be adjusted for multiple comparisons (Benjamini-Hochberg, Holm), and
+time-series spreads get Newey-West (HAC) standard errors.
+
+Examples:
+- welch_table({'momentum': (high, low), 'value': (cheap, dear)})
+- welch_codes(returns, codes, n=5, long_q=4, short_q=0)   # one test per row
+- adjust_pvalues(p, 'bh')
+- newey_west(result.spreads)                            # mean, HAC se, t, p per column
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import special
+
+
+def _t_sf(t, df):
+    """Upper tail of Student's t, vectorized."""
+    return special.stdtr(df, -t)
+
+
+def _p_value(t, df, alternative):
+    if alternative == 'two-sided':
+        return 2 * _t_sf(np.abs(t), df)
+    if alternative == 'greater':
+        return _t_sf(t, df)
+    if alternative == 'less':
+        return _t_sf(-t, df)
+    raise ValueError(f"Unknown alternative: {alternative!r}")
+
+
+def moments(samples, axis=-1):
+    """Count, mean and sample variance of NaN-padded samples along ``axis``."""
+    samples = np.asarray(samples, dtype=np.float64)
+    valid = np.isfinite(samples)
+    n = valid.sum(axis=axis)
+    x = np.where(valid, samples, 0.0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = x.sum(axis=axis) / n
+        dev = np.where(valid, samples - np.expand_dims(mean, axis), 0.0)
+        var = (dev * dev).sum(axis=axis) / (n - 1)
+    return n, mean, var
+
+
+def welch_from_moments(n_a, mean_a, var_a, n_b, mean_b, var_b, confidence=0.95, alternative='two-sided'):
+    """
+    Welch's unequal-variance t-test of mean_a - mean_b for every element of
+    the (broadcast) moment arrays. Returns a dict of arrays.
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+        se_a, se_b = var_a / n_a, var_b / n_b
+        se = np.sqrt(se_a + se_b)
+        diff = mean_a - mean_b
+        t = diff / se
+        # Welch-Satterthwaite degrees of freedom
+        df = (se_a + se_b) ** 2 / (se_a ** 2 / (n_a - 1) + se_b ** 2 / (n_b - 1))
+        half = special.stdtrit(df, 0.5 + confidence / 2) * se
+        cohen_d = diff / np.sqrt((var_a + var_b) / 2)
+    return {
+        'mean_diff': diff,
+        'se': se,
+        't_stat': t,
+        'df': df,
+        'p_value': _p_value(t, df, alternative),
+        'cohen_d': cohen_d,
+        'ci_low': diff - half,
+        'ci_high': diff + half,
+        'n_long': n_a,
+        'n_short': n_b,
+    }
+
+
+def welch_tests(a, b, axis=-1, confidence=0.95, alternative='two-sided'):
+    """Welch tests of stacked, NaN-padded samples ``a`` vs ``b`` (one per leading index)."""
+    return welch_from_moments(*moments(a, axis), *moments(b, axis), confidence, alternative)
+
+
+def welch_codes(values, codes, n, long_q, short_q, confidence=0.95, alternative='two-sided'):
+    """
+    One Welch test per row of (rows x stocks) ``values``: bucket ``long_q``
+    vs bucket ``short_q`` of the integer ``codes`` (-1 = unassigned); the
+    buckets may also be given per row. All rows' group moments come from
+    bincounts over (row, bucket) ids.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    codes = np.asarray(codes)
+    if values.ndim == 1:
+        values, codes = values[None, :], codes[None, :]
+    rows = np.arange(values.shape[0])[:, None]
+    ok = (codes >= 0) & np.isfinite(values)
+    cells = (rows * n + codes)[ok]
+    x = values[ok]
+    size = values.shape[0] * n
+
+    count = np.bincount(cells, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.bincount(cells, weights=x, minlength=size) / count
+        dev = x - mean[cells]
+        var = np.bincount(cells, weights=dev * dev, minlength=size) / (count - 1)
+    count, mean, var = (m.reshape(-1, n) for m in (count, mean, var))
+    rows = rows[:, 0]
+    return welch_from_moments(count[rows, long_q], mean[rows, long_q], var[rows, long_q],
+                              count[rows, short_q], mean[rows, short_q], var[rows, short_q],
+                              confidence, alternative)
+
+
+def welch_table(pairs, confidence=0.95, alternative='two-sided', adjust='holm'):
+    """
+    DataFrame of Welch tests for a {name: (a, b)} mapping, one row each,
+    with ``p_adj`` corrected across the rows (``adjust`` None to skip).
+    """
+    names = list(pairs)
+    width = max((max(len(a), len(b)) for a, b in pairs.values()), default=0)
+    stack = np.full((2, len(names), width), np.nan)
+    for i, (a, b) in enumerate(pairs.values()):
+        stack[0, i, :len(a)] = np.asarray(a, dtype=np.float64)
+        stack[1, i, :len(b)] = np.asarray(b, dtype=np.float64)
+    table = pd.DataFrame(welch_tests(stack[0], stack[1], confidence=confidence, alternative=alternative),
+                         index=names)
+    if adjust:
+        table['p_adj'] = adjust_pvalues(table['p_value'].to_numpy(), adjust)
+    return table
+
+
+def adjust_pvalues(p, method='bh', axis=-1):
+    """
+    Multiple-comparison adjusted p-values along ``axis``: 'bh'
+    (Benjamini-Hochberg, false discovery rate) or 'holm' (family-wise
+    error). NaN p-values are left out of the family and stay NaN.
+    """
+    p = np.moveaxis(np.asarray(p, dtype=np.float64), axis, -1)
+    valid = np.isfinite(p)
+    m = valid.sum(axis=-1, keepdims=True)
+    # Missing p-values sort last and so never affect the ranks of real ones
+    order = np.argsort(np.where(valid, p, np.inf), axis=-1, kind='stable')
+    ranked = np.take_along_axis(np.where(valid, p, 1.0), order, axis=-1)
+    k = np.arange(1, p.shape[-1] + 1)
+
+    if method == 'bh':
+        scaled = ranked * m / k
+        # Step-up: running minimum from the largest p-value down
+        scaled = np.where(k <= m, scaled, np.inf)
+        adjusted = np.minimum.accumulate(scaled[..., ::-1], axis=-1)[..., ::-1]
+    elif method == 'holm':
+        scaled = ranked * (m - k + 1)
+        # Step-down: running maximum from the smallest p-value up
+        adjusted = np.maximum.accumulate(scaled, axis=-1)
+    else:
+        raise ValueError(f"Unknown adjustment method: {method!r}")
+
+    out = np.empty_like(ranked)
+    np.put_along_axis(out, order, np.minimum(adjusted, 1.0), axis=-1)
+    return np.moveaxis(np.where(valid, out, np.nan), -1, axis)
+
+
+def newey_west(series, lags=None, alternative='two-sided'):
+    """
+    Mean, Newey-West standard error, t-stat and p-value of each column of a
+    (periods x series) array or DataFrame, with Bartlett weights up to
+    ``lags`` (default: floor(4 (T/100)^(2/9))). Missing periods are skipped.
+    """
+    columns = series.columns if isinstance(series, pd.DataFrame) else None
+    x = np.asarray(series, dtype=np.float64)
+    if x.ndim == 1:
+        x = x[:, None]
+    valid = np.isfinite(x)
+    n = valid.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(valid, x, 0.0).sum(axis=0) / n
+    e = np.where(valid, x - mean, 0.0)
+    if lags is None:
+        lags = int(np.floor(4 * (max(n.max(initial=0), 1) / 100) ** (2 / 9)))
+
+    long_run = (e * e).sum(axis=0)
+    for lag in range(1, min(lags, len(x) - 1) + 1):
+        weight = 1 - lag / (lags + 1)
+        long_run = long_run + 2 * weight * (e[lag:] * e[:-lag]).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        se = np.sqrt(np.maximum(long_run, 0.0) / n) / np.sqrt(n)
+        t = mean / se
+    return pd.DataFrame({
+        'mean': mean,
+        'nw_se': se,
+        't_stat': t,
+        'p_value': _p_value(t, n - 1, alternative),
+        'periods': n,
+        'lags': lags,
+    }, index=columns)
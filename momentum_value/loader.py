@@ -0,0 +1,206 @@
+"""
+Concurrent loading of many source files: per-ticker or per-year CSVs, and
+zip archives read member by member without extracting to disk.
+
+Sources are discovered once (glob patterns, directories and zip archives
+expand to their CSV/Parquet files) and parsed through a schema in a bounded
+thread pool, or a process pool when parsing rather than the disk is the
+bottleneck. Each file comes back as typed column arrays, and the result is
+allocated once: one array per column of the long frame, or one dense
+(dates x tickers) matrix for a PricePanel, filled file by file in place.
+Files without a ticker column (e.g. prices/RELIANCE.NS.csv) take the
+ticker from their file name.
+
+Examples:
+- read_prices('feed/prices/*.csv', years=[2023, 2024])      # load_prices' layout
+- load_panel('feed/prices_by_year.zip', workers=8)          # PricePanel
+- load_frame('Datasets/funda_dataset.zip', FUNDAMENTALS)
+"""
+
+import functools
+import glob
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.panel import PricePanel
+from momentum_value.price_cache import PRICE_COLUMNS, _naive_datetimes, source_fingerprint
+from momentum_value.schema import PRICES, read_table
+from momentum_value.tickers import SYMBOLS
+
+
+SUFFIXES = ('.csv', '.parquet', '.pq')
+
+
+@dataclass(frozen=True)
+class Source:
+    """One file on disk, or one member of a zip archive."""
+
+    path: str
+    member: str = None
+
+    @property
+    def name(self):
+        """File name without directory or extension (the ticker of a per-ticker file)."""
+        return os.path.splitext(os.path.basename(self.member or self.path))[0]
+
+    def __str__(self):
+        return f'{self.path}:{self.member}' if self.member else self.path
+
+
+def is_multi(path):
+    """True for glob patterns, directories and zip archives, i.e. anything but one plain file."""
+    path = str(path)
+    return any(c in path for c in '*?[') or path.endswith('.zip') or os.path.isdir(path)
+
+
+def _members(path):
+    with zipfile.ZipFile(path) as archive:
+        return [Source(path, info.filename) for info in archive.infolist()
+                if not info.is_dir() and info.filename.endswith(SUFFIXES)
+                and not info.filename.startswith('__MACOSX/')]
+
+
+def discover(patterns):
+    """
+    Sources for a path, glob pattern or directory (or a list of them), each
+    pattern's matches sorted; zip archives expand to their members.
+    """
+    if isinstance(patterns, (str, os.PathLike)):
+        patterns = [patterns]
+    sources = []
+    for pattern in map(str, patterns):
+        if os.path.isdir(pattern):
+            paths = sorted(os.path.join(pattern, name) for name in os.listdir(pattern)
+                           if name.endswith(SUFFIXES + ('.zip',)))
+        else:
+            paths = sorted(glob.glob(pattern, recursive=True))
+        if not paths:
+            raise FileNotFoundError(f"No source files match {pattern!r}")
+        for path in paths:
+            sources.extend(_members(path) if path.endswith('.zip') else [Source(path)])
+    return sources
+
+
+def fingerprint(patterns):
+    """source_fingerprint of every matched file (an archive counts once)."""
+    paths = dict.fromkeys(source.path for source in discover(patterns))
+    return {path: source_fingerprint(path) for path in paths}
+
+
+def read_source(source, schema, columns=None, label=None):
+    """
+    One file or zip member through ``schema`` (see schema.read_table);
+    ``label`` names a column filled from the file name when the file lacks
+    it, e.g. 'Stock' for per-ticker price files.
+    """
+    fill = {label: source.name} if label else None
+    if source.member is None:
+        return read_table(source.path, schema, columns, fill)
+    # Every call opens its own archive handle, so members can be read in parallel
+    with zipfile.ZipFile(source.path) as archive, archive.open(source.member) as handle:
+        return read_table(handle, schema, columns, fill)
+
+
+def _map(func, sources, workers=None, processes=False):
+    """``func`` over ``sources`` in a bounded pool; results in source order."""
+    if workers is None:
+        # Threads overlap disk reads and decompression (the C parser and zlib
+        # release the GIL); processes are for parse-bound loads
+        workers = (os.cpu_count() or 1) if processes else min(32, (os.cpu_count() or 1) + 4)
+    workers = min(workers, len(sources))
+    if workers <= 1:
+        return [func(source) for source in sources]
+    executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor(workers) as pool:
+        return list(pool.map(func, sources))
+
+
+def load_frame(patterns, schema, columns=None, label=None, workers=None, processes=False):
+    """Every source read concurrently through ``schema`` and stacked in source order."""
+    read = functools.partial(read_source, schema=schema, columns=columns, label=label)
+    parts = _map(read, discover(patterns), workers, processes)
+    return parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+
+
+# ----------------------------------------------------------------------
+# Prices
+# ----------------------------------------------------------------------
+def _price_part(source, years=None, columns=None, dtype=np.float32):
+    """
+    One price source as arrays: naive dates, ticker codes into its own
+    ``tickers`` and ``dtype`` value columns, rows outside ``years`` dropped.
+    """
+    df = read_source(source, PRICES, columns, label='Stock')
+    dates = _naive_datetimes(df['Date'])
+    keep = np.ones(len(df), dtype=bool) if years is None else np.isin(
+        dates.astype('datetime64[Y]').astype(np.int64) + 1970, list(years))
+    codes, tickers = pd.factorize(df['Stock'].astype('string')[keep])
+    part = {'Date': dates[keep], 'codes': codes, 'tickers': np.asarray(tickers, dtype=object)}
+    for col in PRICE_COLUMNS:
+        if col in df.columns:
+            part[col] = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=dtype)[keep]
+    return part
+
+
+def _ticker_axis(parts, sort=False):
+    """Union of the parts' tickers, and per part a lookup from its codes (-1 stays -1)."""
+    names = pd.unique(np.concatenate([p['tickers'] for p in parts])) if parts else np.array([], dtype=object)
+    axis = pd.Index(np.sort(names) if sort else names, dtype=object)
+    return axis, [np.append(axis.get_indexer(p['tickers']), -1) for p in parts]
+
+
+def _read_prices(patterns, workers, processes, **part_args):
+    return _map(functools.partial(_price_part, **part_args), discover(patterns), workers, processes)
+
+
+def read_prices(patterns, years=None, workers=None, processes=False):
+    """
+    Prices from many files in price_cache.load_prices' layout: Date,
+    categorical Stock and float32 OHLCV, each column allocated once.
+    """
+    parts = _read_prices(patterns, workers, processes, years=years)
+    columns = [c for c in PRICE_COLUMNS if any(c in p for p in parts)]
+    tickers, lookups = _ticker_axis(parts)
+
+    total = sum(len(p['Date']) for p in parts)
+    data = {'Date': np.empty(total, dtype='datetime64[ns]'), 'Stock': np.empty(total, dtype=np.int32)}
+    data.update({col: np.full(total, np.nan, dtype=np.float32) for col in columns})
+    start = 0
+    for part, lookup in zip(parts, lookups):
+        end = start + len(part['Date'])
+        data['Date'][start:end] = part['Date']
+        data['Stock'][start:end] = lookup[part['codes']]
+        for col in columns:
+            if col in part:
+                data[col][start:end] = part[col]
+        start = end
+
+    data['Stock'] = pd.Categorical.from_codes(data['Stock'], categories=tickers)
+    return pd.DataFrame(data, columns=['Date', 'Stock'] + columns, copy=False)
+
+
+def load_panel(patterns, years=None, value_col='Close', dtype=np.float64, workers=None,
+               processes=False, symbols=SYMBOLS):
+    """
+    PricePanel straight from many files. The date and ticker axes are the
+    sorted unions of every file's, and the (dates x tickers) matrix is
+    allocated once and filled file by file (a later file wins a repeated
+    date/ticker, as in PricePanel.from_arrays).
+    """
+    parts = _read_prices(patterns, workers, processes, years=years,
+                         columns=['Date', 'Stock', value_col], dtype=dtype)
+    tickers, lookups = _ticker_axis(parts, sort=True)
+    dates = np.unique(np.concatenate([p['Date'][~np.isnat(p['Date'])] for p in parts])) if parts else \
+        np.array([], dtype='datetime64[ns]')
+
+    values = np.full((len(dates), len(tickers)), np.nan, dtype=dtype)
+    for part, lookup in zip(parts, lookups):
+        cols = lookup[part['codes']]
+        ok = (cols >= 0) & ~np.isnat(part['Date'])
+        values[np.searchsorted(dates, part['Date'][ok]), cols[ok]] = part[value_col][ok]
+    return PricePanel(values, dates, tickers, symbols)
@@ -0,0 +1,115 @@
+"""
+Memory-lean mode: compact dtypes, early release of intermediates and a
+per-stage footprint of what is still alive.
+
+Lean mode stores prices and ratios as float32 and tickers as categoricals
+(int codes into one table of names), and lets callers drop frames as soon as
+they are consumed. The tracker measures the deep size of every DataFrame,
+Series and array in a namespace (e.g. the starter's globals()) at each lap,
+so the report shows which tables are alive after each stage.
+
+Turn it on with MOMENTUM_VALUE_LEAN=1 (the starter) or
+AnalysisConfig(lean=True) (the pipeline). Like the profiler, every call is a
+no-op when it is off.
+
+Usage:
+    fundamentals = downcast(fundamentals, tickers=('symbol',))
+    MEMORY.lap('Story 1.2', globals())
+    MEMORY.report()
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+
+ENV_VAR = 'MOMENTUM_VALUE_LEAN'
+MB = 2**20
+
+
+def nbytes(obj):
+    """Deep size in bytes of frames, series, arrays, PricePanels and containers of them."""
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(index=True, deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sum(nbytes(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(nbytes(v) for v in obj)
+    values = getattr(obj, 'values', None)
+    if isinstance(values, np.ndarray):
+        return values.nbytes
+    return 0
+
+
+def downcast(df, tickers=('Stock', 'symbol'), float_dtype=np.float32):
+    """
+    Floats to ``float_dtype`` and ticker columns to categoricals; other
+    columns (dates, ints) are left alone. Returns a new frame.
+    """
+    out = {}
+    for name in df.columns:
+        col = df[name]
+        if name in tickers and not isinstance(col.dtype, pd.CategoricalDtype):
+            col = col.astype('category')
+        elif pd.api.types.is_float_dtype(col.dtype) and col.dtype != float_dtype:
+            col = col.astype(float_dtype)
+        out[name] = col
+    return pd.DataFrame(out, index=df.index)
+
+
+def footprint(namespace, min_bytes=1):
+    """Sizes (MB) of the frames and arrays in a namespace, largest first."""
+    sizes = {}
+    for name, obj in namespace.items():
+        if name.startswith('_') or not isinstance(obj, (pd.DataFrame, pd.Series, np.ndarray)):
+            continue
+        size = nbytes(obj)
+        if size >= min_bytes:
+            sizes[name] = size / MB
+    return pd.Series(sizes, dtype=np.float64).sort_values(ascending=False)
+
+
+class MemoryTracker:
+    """Live-object footprint per lap, plus the largest total seen."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.laps = []
+
+    @classmethod
+    def from_env(cls):
+        return cls(enabled=os.environ.get(ENV_VAR, '').strip().lower() not in ('', '0', 'false'))
+
+    def lap(self, label, namespace):
+        """Record what is alive in ``namespace`` after stage ``label``."""
+        if not self.enabled:
+            return None
+        sizes = footprint(namespace)
+        self.laps.append((label, sizes))
+        return sizes
+
+    def summary(self, top=3):
+        lines = [f"{'stage':<36} {'live MB':>9}  largest"]
+        for label, sizes in self.laps:
+            largest = ', '.join(f'{name} {mb:.1f}' for name, mb in sizes.head(top).items())
+            lines.append(f"{label:<36.36} {sizes.sum():>9.1f}  {largest}")
+        peak = max((sizes.sum() for _, sizes in self.laps), default=0.0)
+        lines.append(f"{'peak live':<36} {peak:>9.1f}")
+        return '\n'.join(lines)
+
+    def report(self):
+        """Print the per-stage footprint table. No-op when off."""
+        if not self.enabled:
+            return
+        print("\n=== Memory Footprint (live frames and arrays) ===")
+        print(self.summary())
+
+
+# Process-wide tracker, configured from the environment
+MEMORY = MemoryTracker.from_env()
+LEAN = MEMORY.enabled
@@ -0,0 +1,232 @@
+"""
+Dense dates x tickers price panel.
+
+Closes live in one C-contiguous NumPy array: rows follow a sorted date axis,
+columns follow the ticker axis (with interned SymbolTable ids alongside),
+and missing days are NaN. Windows and cross-sections are slices, so factor,
+portfolio and statistics code can work on array views instead of copying
+filtered DataFrames.
+"""
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.tickers import SYMBOLS
+
+
+class PricePanel:
+    """
+    Closes as a (dates x tickers) array. ``tickers`` are interned as given,
+    so they should already be normalized (see tickers.normalize_tickers).
+
+    Examples:
+    - panel = PricePanel.from_long(price_data)
+    - panel.window('2023-01-01', '2023-12-31').values   # row slice, no copy
+    - panel.cross_section('2023-12-29')                 # one row as a Series
+    """
+
+    def __init__(self, values, dates, tickers, symbols=SYMBOLS):
+        self.values = np.ascontiguousarray(values)
+        self.dates = pd.DatetimeIndex(dates)
+        self.tickers = pd.Index(tickers)
+        self.symbols = symbols
+        self.ids = symbols.encode(pd.Series(self.tickers, dtype=object), clean=True)
+
+    # ------------------------------------------------------------------
+    # Constructors
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_arrays(cls, dates, tickers, closes, dtype=np.float64, symbols=SYMBOLS):
+        """Build from long-format arrays (one entry per price row)."""
+        dates = pd.DatetimeIndex(dates)
+        if dates.tz is not None:
+            dates = dates.tz_localize(None)
+        date_codes, date_axis = pd.factorize(dates, sort=True)
+        ticker_codes, ticker_axis = pd.factorize(pd.Series(tickers), sort=True)
+        ticker_axis = pd.Index(np.asarray(ticker_axis, dtype=object))
+
+        ok = (date_codes >= 0) & (ticker_codes >= 0)
+        values = np.full((len(date_axis), len(ticker_axis)), np.nan, dtype=dtype)
+        values[date_codes[ok], ticker_codes[ok]] = np.asarray(closes)[ok]
+        return cls(values, date_axis, ticker_axis, symbols)
+
+    @classmethod
+    def from_long(cls, df, value_col='Close', dtype=np.float64, symbols=SYMBOLS):
+        """Build from a long (Date, Stock, Close) frame."""
+        return cls.from_arrays(df['Date'], df['Stock'], df[value_col].to_numpy(), dtype, symbols)
+
+    @classmethod
+    def from_csv(cls, path, years=None, dtype=np.float64, symbols=SYMBOLS):
+        """Build from the price CSV through the columnar year cache."""
+        from momentum_value.price_cache import load_prices
+        return cls.from_long(load_prices(path, years), dtype=dtype, symbols=symbols)
+
+    @classmethod
+    def from_files(cls, patterns, years=None, dtype=np.float64, workers=None, symbols=SYMBOLS):
+        """Build from many price files or archives, read concurrently into one allocation."""
+        from momentum_value.loader import load_panel
+        return load_panel(patterns, years, dtype=dtype, workers=workers, symbols=symbols)
+
+    # ------------------------------------------------------------------
+    # Shape and lookups
+    # ------------------------------------------------------------------
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __repr__(self):
+        if len(self.dates):
+            span = f"{self.dates[0].date()}..{self.dates[-1].date()}"
+        else:
+            span = 'empty'
+        return f"PricePanel({len(self.dates)} dates x {len(self.tickers)} tickers, {span}, {self.values.dtype})"
+
+    def row_of(self, date):
+        """Row of the last date on or before ``date`` (-1 if none)."""
+        return int(np.searchsorted(self.dates.values, np.datetime64(pd.Timestamp(date)), side='right')) - 1
+
+    def column_of(self, ticker):
+        """Column of a ticker (-1 if it is not in the panel)."""
+        tid = self.symbols.id_of(ticker)
+        hits = np.flatnonzero(self.ids == tid) if tid >= 0 else []
+        return int(hits[0]) if len(hits) else -1
+
+    def columns_of(self, tickers):
+        """Columns of many tickers at once (-1 where a ticker is absent)."""
+        position = np.full(max(len(self.symbols), 1), -1, dtype=np.int64)
+        position[self.ids[self.ids >= 0]] = np.flatnonzero(self.ids >= 0)
+        ids = self.symbols.encode(pd.Series(list(tickers), dtype=object), add=False)
+        return np.where((ids >= 0) & (ids < len(position)), position[np.maximum(ids, 0)], -1)
+
+    def _derive(self, values, dates=None, tickers=None):
+        panel = object.__new__(PricePanel)
+        panel.values = values
+        panel.dates = self.dates if dates is None else dates
+        panel.tickers = self.tickers if tickers is None else tickers
+        panel.symbols = self.symbols
+        panel.ids = self.ids if tickers is None else self.symbols.encode(pd.Series(tickers, dtype=object), clean=True)
+        return panel
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+    def window(self, start=None, end=None):
+        """Rows with start <= date <= end, as a panel sharing this array."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates.values, np.datetime64(pd.Timestamp(start)), 'left'))
+        hi = len(self.dates) if end is None else self.row_of(end) + 1
+        return self._derive(self.values[lo:hi], self.dates[lo:hi])
+
+    def year(self, year):
+        """Calendar-year window."""
+        return self.window(f'{year}-01-01', f'{year}-12-31 23:59:59')
+
+    def select(self, tickers):
+        """Panel restricted to ``tickers`` (columns are copied; unknown tickers are skipped)."""
+        cols = self.columns_of(tickers)
+        cols = cols[cols >= 0]
+        return self._derive(np.ascontiguousarray(self.values[:, cols]), tickers=self.tickers[cols])
+
+    def aligned(self, tickers):
+        """
+        (dates x len(tickers)) closes in the order of ``tickers``, a NaN
+        column for each ticker not in the panel (always a copy).
+        """
+        cols = self.columns_of(tickers)
+        return np.where(cols >= 0, self.values[:, np.maximum(cols, 0)], np.nan)
+
+    def cross_section(self, date):
+        """Closes of every ticker on the last date on or before ``date``."""
+        row = self.row_of(date)
+        values = self.values[row] if row >= 0 else np.full(len(self.tickers), np.nan)
+        return pd.Series(values, index=self.tickers, name=self.dates[row] if row >= 0 else None)
+
+    def column(self, ticker):
+        """Close history of one ticker (KeyError if it is not in the panel)."""
+        col = self.column_of(ticker)
+        if col < 0:
+            raise KeyError(f"Ticker not in panel: {ticker!r}")
+        return pd.Series(self.values[:, col], index=self.dates, name=ticker)
+
+    def to_frame(self):
+        """Wide DataFrame over the same values."""
+        return pd.DataFrame(self.values, index=self.dates, columns=self.tickers, copy=False)
+
+    # ------------------------------------------------------------------
+    # Derived series
+    # ------------------------------------------------------------------
+    def returns(self, periods=1, log=False):
+        """
+        (dates - periods) x tickers simple (or log) returns between rows;
+        NaN wherever either close is missing.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = self.values[periods:] / self.values[:-periods]
+        return np.log(ratio) if log else ratio - 1
+
+    def last_valid(self, end_row):
+        """Last non-NaN close per ticker at or before ``end_row``."""
+        if end_row < 0:
+            return np.full(len(self.tickers), np.nan)
+        block = self.values[:end_row + 1]
+        seen = np.isfinite(block)
+        last = np.where(seen.any(axis=0), end_row - np.argmax(seen[::-1], axis=0), -1)
+        out = np.full(block.shape[1], np.nan)
+        has = last >= 0
+        out[has] = block[last[has], np.flatnonzero(has)]
+        return out
+
+    def valid_bounds(self, start=None, end=None, min_days=1):
+        """
+        Rows of the first and last non-NaN close per ticker inside
+        [start, end] (-1 for tickers with fewer than ``min_days`` closes).
+        """
+        lo = 0 if start is None else int(np.searchsorted(self.dates.values, np.datetime64(pd.Timestamp(start)), 'left'))
+        hi = len(self.dates) if end is None else self.row_of(end) + 1
+        if hi <= lo:
+            # No panel rows in the window (e.g. dates past the end)
+            none = np.full(len(self.tickers), -1)
+            return none, none.copy()
+        seen = np.isfinite(self.values[lo:hi])
+        ok = seen.sum(axis=0) >= max(min_days, 1)
+        first = np.where(ok, lo + np.argmax(seen, axis=0), -1)
+        last = np.where(ok, hi - 1 - np.argmax(seen[::-1], axis=0), -1)
+        return first, last
+
+    def period_return(self, start, end, min_days=1):
+        """Last over first valid close inside [start, end], per ticker."""
+        first, last = self.valid_bounds(start, end, min_days)
+        ok = first >= 0
+        cols = np.arange(len(self.tickers))
+        first, last = np.where(ok, first, 0), np.where(ok, last, 0)
+        ret = np.full(len(self.tickers), np.nan)
+        if ok.any():
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ret = np.where(ok, self.values[last, cols] / self.values[first, cols] - 1, np.nan)
+        return pd.Series(ret, index=self.tickers)
+
+    def lookback_return(self, as_of, months, skip=0):
+        """
+        Trailing return per ticker: last close on/before ``as_of - skip``
+        months over last close on/before ``as_of - months`` months.
+        """
+        as_of = pd.Timestamp(as_of)
+        end_row = self.row_of(as_of - pd.DateOffset(months=skip))
+        start_row = self.row_of(as_of - pd.DateOffset(months=months))
+        if start_row < 0 or end_row < 0:
+            return pd.Series(np.nan, index=self.tickers)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ret = self.last_valid(end_row) / self.last_valid(start_row) - 1
+        return pd.Series(ret, index=self.tickers)
+
+    def month_end(self):
+        """
+        Panel of month-end closes (last available close of each calendar
+        month per ticker), dated at each month's last trading day.
+        """
+        months = self.dates.to_period('M')
+        frame = pd.DataFrame(self.values, copy=False).groupby(np.asarray(months.asi8)).last()
+        last_day = pd.Series(self.dates).groupby(np.asarray(months.asi8)).max()
+        return self._derive(np.ascontiguousarray(frame.to_numpy(dtype=self.values.dtype)), pd.DatetimeIndex(last_day.values))
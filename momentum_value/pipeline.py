@@ -0,0 +1,194 @@
+"""
+Config-driven pipeline runner with stage-level result caching.
+
+Each Story of the analysis is a named stage that declares the stages it
+consumes and the AnalysisConfig fields it reads. A stage's cache key hashes
+its own code, those parameter values (plus a fingerprint of any source file
+they point to) and the keys of its inputs, so changing one parameter
+re-runs only the stages downstream of it; everything else is loaded from
+``.cache/stages``. Keys also cover every module of the package, so editing
+code a stage calls (the return engine, ranking, statistics) invalidates
+the cache too.
+
+Usage:
+    results = Pipeline(AnalysisConfig(n_quantiles=10)).run()
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+
+from momentum_value.config import AnalysisConfig
+from momentum_value.loader import fingerprint, is_multi
+from momentum_value.memory import MB, nbytes
+from momentum_value.price_cache import CACHE_DIR, CACHE_VERSION, source_fingerprint
+from momentum_value.profiling import PROFILER
+
+
+@dataclass(frozen=True)
+class Stage:
+    """
+    A named step: func(config, **inputs) -> result.
+
+    ``cache=False`` is for stages whose source is already cached elsewhere
+    (the loaders); they still get a key so downstream stages stay keyed.
+    """
+
+    name: str
+    func: object
+    inputs: tuple = ()
+    params: tuple = ()
+    story: str = ''
+    cache: bool = True
+
+
+STAGES = {}
+
+
+def stage(name, inputs=(), params=(), story='', cache=True):
+    """Register a function as a pipeline stage."""
+    def register(func):
+        STAGES[name] = Stage(name, func, tuple(inputs), tuple(params), story, cache)
+        return func
+    return register
+
+
+@lru_cache(maxsize=None)
+def package_hash():
+    """SHA-256 of every module in the momentum_value package (computed once per process)."""
+    root = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(root)):
+        if name.endswith('.py'):
+            digest.update(name.encode())
+            with open(os.path.join(root, name), 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _rows(result):
+    try:
+        return len(result)
+    except TypeError:
+        return 0
+
+
+def _param_value(config, name):
+    value = getattr(config, name)
+    # Paths are keyed by the file they point at, not just by their name
+    if name.endswith('_path') and value and is_multi(value):
+        return {'path': value, 'source': fingerprint(value)}
+    if name.endswith('_path') and value and os.path.exists(value):
+        return {'path': value, 'source': source_fingerprint(value)}
+    return list(value) if isinstance(value, tuple) else value
+
+
+class Pipeline:
+    """Run registered stages in dependency order, caching each result."""
+
+    def __init__(self, config=None, cache_dir=None, use_cache=True, verbose=True, stages=None):
+        if stages is None:
+            # Importing the module registers the Story 1.1-1.9 stages
+            from momentum_value import stages as _story_stages  # noqa: F401
+            stages = STAGES
+        self.config = config or AnalysisConfig()
+        self.stages = stages
+        self.cache_dir = os.path.join(cache_dir or CACHE_DIR, 'stages')
+        self.use_cache = use_cache
+        self.verbose = verbose
+        self._keys = {}
+        self.timings = {}
+        self.footprints = {}
+
+    def key(self, name):
+        """Content hash of a stage's code, the package sources, parameters and input keys."""
+        if name not in self._keys:
+            st = self.stages[name]
+            payload = {
+                'stage': name,
+                'code': hashlib.sha256(inspect.getsource(st.func).encode()).hexdigest(),
+                'package': package_hash(),
+                'version': CACHE_VERSION,
+                'params': {p: _param_value(self.config, p) for p in st.params},
+                'inputs': [self.key(i) for i in st.inputs],
+            }
+            blob = json.dumps(payload, sort_keys=True, default=str).encode()
+            self._keys[name] = hashlib.sha256(blob).hexdigest()[:20]
+        return self._keys[name]
+
+    def _cache_file(self, name):
+        return os.path.join(self.cache_dir, f'{name}-{self.key(name)}.pkl')
+
+    def run(self, targets=None):
+        """
+        Results of the requested stages (default: all) by name. Inputs are
+        only computed or loaded when a stage that needs them misses the cache.
+        """
+        targets = list(targets or self.stages)
+        results = {}
+        if self.config.lean:
+            # Lean mode: drop each intermediate once its last consumer has run
+            self._consumers = {}
+            for name in self._closure(targets):
+                for i in self.stages[name].inputs:
+                    self._consumers[i] = self._consumers.get(i, 0) + 1
+            self._keep = set(targets)
+        for name in targets:
+            self._resolve(name, results)
+        return {name: results[name] for name in targets} if self.config.lean else results
+
+    def _closure(self, targets):
+        """Targets and every stage they depend on, each once."""
+        seen, stack = set(), list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in seen:
+                seen.add(name)
+                stack.extend(self.stages[name].inputs)
+        return seen
+
+    def _release(self, name, results):
+        for i in self.stages[name].inputs:
+            self._consumers[i] -= 1
+            if self._consumers[i] == 0 and i not in self._keep:
+                results.pop(i, None)
+
+    def _resolve(self, name, results):
+        if name in results:
+            return results[name]
+        st = self.stages[name]
+        path = self._cache_file(name)
+        cached = self.use_cache and st.cache
+        if cached and os.path.exists(path):
+            start = time.perf_counter()
+            with open(path, 'rb') as f:
+                results[name] = pickle.load(f)
+            status = 'cached'
+        else:
+            inputs = {i: self._resolve(i, results) for i in st.inputs}
+            start = time.perf_counter()
+            with PROFILER.stage(f'stage {name}', rows_in=sum(_rows(v) for v in inputs.values())) as rec:
+                results[name] = st.func(self.config, **inputs)
+                rec.rows_out = _rows(results[name])
+            if cached:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp = f'{path}.tmp'
+                with open(tmp, 'wb') as f:
+                    pickle.dump(results[name], f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, path)
+            status = 'ran'
+        self.timings[name] = (status, time.perf_counter() - start)
+        result = results[name]
+        if self.config.lean:
+            self.footprints[name] = nbytes(result) / MB
+            self._release(name, results)
+        if self.verbose:
+            label = f'Story {st.story} ' if st.story else ''
+            size = f', {self.footprints[name]:.1f} MB' if self.config.lean else ''
+            print(f"[{status:>6}] {label}{name} ({self.timings[name][1]:.2f}s{size})")
+        return result
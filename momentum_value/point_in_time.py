@@ -0,0 +1,158 @@
+"""
+Point-in-time fundamentals: dated snapshots per ticker and as-of queries.
+
+FUNDAMENTALratios.csv is one recent snapshot, so ranking on it at a past
+rebalance date uses numbers nobody had then. A PointInTimeStore keeps every
+dated snapshot of every ticker in compressed sparse row form: snapshots
+sorted by (ticker id, date), an offsets array marking where each ticker's
+run starts, and one float array per field. "P/E of every ticker as of each
+rebalance date" is then one searchsorted over (id, day) keys, returning the
+latest snapshot on or before each date and never a later one.
+
+Snapshots can be made usable only ``lag_days`` after their date (a filing
+lag), and ``max_age`` drops readings too old to trust.
+
+Examples:
+- history = load_snapshots('Datasets/fundamentals_history/*.csv')   # files named by date
+- history.as_of('trailingPE', rebalance_dates, panel.ids)            # dates x tickers
+- run_backtest(panel, history)                                       # P/E as of each formation date
+"""
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.loader import is_multi, load_frame
+from momentum_value.schema import FUNDAMENTAL_SNAPSHOTS, read_table
+from momentum_value.tickers import SYMBOLS
+
+
+def _days(dates):
+    """Whole days since the epoch (int64) of a sequence of dates."""
+    return pd.DatetimeIndex(dates).to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+
+class PointInTimeStore:
+    """
+    Dated fundamentals snapshots in CSR layout, keyed by SymbolTable id.
+
+    ``ids``, ``dates`` and each array in ``values`` hold one entry per
+    snapshot, in any order; ``dates`` are when a snapshot became known. Of
+    several snapshots of one ticker on one day (e.g. its NSE and BSE
+    listings) the last one given is kept.
+
+    Examples:
+    - store = PointInTimeStore.from_frame(history)        # symbol, date, fields
+    - store.frame('trailingPE', month_ends, tickers)      # dates x tickers DataFrame
+    - store.history('RELIANCE')                           # one ticker's snapshots
+    """
+
+    def __init__(self, ids, dates, values, symbols=SYMBOLS):
+        ids = np.asarray(ids, dtype=np.int64)
+        dates = pd.DatetimeIndex(dates)
+        keep = (ids >= 0) & ~dates.isna()
+        ids, days = ids[keep], _days(dates[keep])
+
+        order = np.lexsort((days, ids))
+        ids, days = ids[order], days[order]
+        self._origin = int(days.min(initial=0))
+        self._span = int(days.max(initial=0)) - self._origin + 2
+        keys = ids * self._span + (days - self._origin)
+        # Duplicate (id, day): the stable sort leaves the last given one last
+        last = np.ones(len(keys), dtype=bool)
+        last[:-1] = keys[1:] != keys[:-1]
+        order = order[last]
+
+        self.symbols = symbols
+        self.ids, self.days, self._keys = ids[last], days[last], keys[last]
+        self.values = {name: np.asarray(v, dtype=np.float64)[keep][order] for name, v in values.items()}
+        # Snapshots of ticker id i are offsets[i]:offsets[i + 1], oldest first
+        self.offsets = np.searchsorted(self.ids, np.arange(self.ids.max(initial=-1) + 2))
+
+    @classmethod
+    def from_frame(cls, frame, date_col='date', symbol_col='symbol', fields=None, lag_days=0, symbols=SYMBOLS):
+        """
+        Build from a long (symbol, date, fields...) frame; ``fields``
+        defaults to every numeric column. Where a ticker has several
+        listings on one date the higher-volume one wins.
+        """
+        if 'volume' in frame.columns:
+            frame = frame.iloc[np.argsort(frame['volume'].fillna(-np.inf).to_numpy(), kind='stable')]
+        if fields is None:
+            fields = [c for c in frame.columns
+                      if c not in (date_col, symbol_col) and pd.api.types.is_numeric_dtype(frame[c])]
+        dates = pd.to_datetime(frame[date_col]) + pd.Timedelta(days=lag_days)
+        values = {f: frame[f].to_numpy(dtype=np.float64, na_value=np.nan) for f in fields}
+        return cls(symbols.encode(frame[symbol_col]), dates, values, symbols)
+
+    @classmethod
+    def from_snapshot(cls, frame, date, symbol_col='symbol', symbols=SYMBOLS):
+        """One undated snapshot (e.g. FundamentalsStore.frame) stamped with the date it was taken."""
+        return cls.from_frame(frame.assign(date=pd.Timestamp(date)), symbol_col=symbol_col, symbols=symbols)
+
+    def __len__(self):
+        """Number of snapshots kept."""
+        return len(self._keys)
+
+    @property
+    def fields(self):
+        return list(self.values)
+
+    def _rows(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        known = (ids >= 0) & (ids < len(self.offsets) - 1)
+        return known, np.where(known, ids, 0)
+
+    def as_of(self, field, dates, ids=None, max_age=None):
+        """
+        (dates x ids) array of ``field`` from each ticker's latest snapshot
+        on or before each date; NaN where there is none, or where it is more
+        than ``max_age`` days old. A snapshot missing the field gives NaN
+        (older readings are not used instead). ``ids`` defaults to every
+        id in the store.
+        """
+        values = self.values[field]
+        ids = np.arange(len(self.offsets) - 1) if ids is None else ids
+        known, safe = self._rows(ids)
+        days = _days(dates)[:, None]
+        if not len(self):
+            return np.full((len(days), len(safe)), np.nan)
+
+        # Out-of-range dates clip to just before / after every snapshot day
+        offset = np.clip(days - self._origin, -1, self._span - 1)
+        idx = np.searchsorted(self._keys, safe * self._span + offset, side='right') - 1
+        ok = known & (idx >= self.offsets[safe])
+        idx = np.maximum(idx, 0)
+        if max_age is not None:
+            ok &= days - self.days[idx] <= max_age
+        return np.where(ok, values[idx], np.nan)
+
+    def frame(self, field, dates, tickers, max_age=None):
+        """as_of for ``tickers`` as a (dates x tickers) DataFrame."""
+        ids = self.symbols.encode(pd.Series(list(tickers), dtype=object), add=False)
+        return pd.DataFrame(self.as_of(field, dates, ids, max_age), index=pd.DatetimeIndex(dates),
+                            columns=tickers)
+
+    def series(self, field, date, tickers, max_age=None):
+        """``field`` as of one date, as a Series indexed by ``tickers``."""
+        return self.frame(field, [date], tickers, max_age).iloc[0].rename(field)
+
+    def history(self, ticker):
+        """All snapshots of one ticker, oldest first (empty if it has none)."""
+        known, tid = self._rows([self.symbols.id_of(ticker)])
+        start, end = (self.offsets[tid[0]], self.offsets[tid[0] + 1]) if known[0] else (0, 0)
+        index = pd.DatetimeIndex(self.days[start:end].astype('datetime64[D]'), name='date')
+        return pd.DataFrame({f: v[start:end] for f, v in self.values.items()}, index=index)
+
+
+def load_snapshots(path, lag_days=0, symbols=SYMBOLS):
+    """
+    PointInTimeStore from dated fundamentals: one file with a date column,
+    or a glob, directory or zip of files that each have one or are named by
+    their date ('2023-12-31.csv'). ``lag_days`` delays when each snapshot
+    counts as known.
+    """
+    if is_multi(path):
+        frame = load_frame(path, FUNDAMENTAL_SNAPSHOTS, label='date')
+    else:
+        frame = read_table(path, FUNDAMENTAL_SNAPSHOTS)
+    return PointInTimeStore.from_frame(frame, lag_days=lag_days, symbols=symbols)
@@ -0,0 +1,192 @@
+"""
+Columnar on-disk cache for the daily price CSV.
+
+The CSV is parsed once and written as one directory per year holding a
+``.npy`` file per column:
+
+    .cache/prices/Stock_Data/
+        manifest.json          source fingerprint, ticker categories, years
+        year=2023/Date.npy     datetime64[ns]
+        year=2023/Stock.npy    int32 codes into manifest['tickers']
+        year=2023/Close.npy    float32 (same for Open/High/Low/Volume)
+
+Later runs memory-map only the year partitions they ask for. The cache is
+rebuilt automatically when the source file's size, mtime or content hash
+changes. Glob patterns, directories and zip archives are not cached; they
+are read concurrently by loader.read_prices.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.schema import PRICES, read_table
+
+
+CACHE_DIR = '.cache'
+CACHE_VERSION = 1
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def source_fingerprint(path, sample_bytes=1 << 20):
+    """
+    Cheap identity of a source file: size, mtime and a SHA-1 of its first
+    and last ``sample_bytes`` (hashing a multi-GB file in full would cost as
+    much as parsing it).
+    """
+    st = os.stat(path)
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        digest.update(f.read(sample_bytes))
+        if st.st_size > sample_bytes:
+            f.seek(max(st.st_size - sample_bytes, sample_bytes))
+            digest.update(f.read(sample_bytes))
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha1': digest.hexdigest()}
+
+
+def cache_path(path, cache_dir=None, kind='prices'):
+    """Directory holding the cache for one source file."""
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir or CACHE_DIR, kind, stem)
+
+
+def read_manifest(directory):
+    """Manifest dict of a cache directory, or None if there is none."""
+    try:
+        with open(os.path.join(directory, 'manifest.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def write_manifest(directory, manifest):
+    """Write a manifest; written last, so a half-built cache is never fresh."""
+    with open(os.path.join(directory, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f)
+
+
+def is_fresh(manifest, path):
+    """True if a manifest was built by this cache version from this exact file."""
+    return (
+        manifest is not None
+        and manifest.get('version') == CACHE_VERSION
+        and manifest.get('source') == source_fingerprint(path)
+    )
+
+
+def _naive_datetimes(values):
+    dates = pd.DatetimeIndex(pd.to_datetime(values))
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return dates.to_numpy(dtype='datetime64[ns]')
+
+
+def build_price_cache(path, cache_dir=None):
+    """Parse the price CSV once and write the year-partitioned cache."""
+    directory = cache_path(path, cache_dir)
+    fingerprint = source_fingerprint(path)
+
+    # Only the schema's columns, under canonical names (skips the unnamed index column)
+    raw = read_table(path, PRICES)
+    columns = [c for c in PRICE_COLUMNS if c in raw.columns]
+
+    dates = _naive_datetimes(raw['Date'])
+    # Rows without a date belong to no year partition (NaT would land in a bogus negative year)
+    dated = ~np.isnat(dates)
+    if not dated.all():
+        raw, dates = raw[dated], dates[dated]
+    codes, tickers = pd.factorize(raw['Stock'].astype('string'))
+    years = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+    values = {
+        col: pd.to_numeric(raw[col], errors='coerce').to_numpy(dtype=np.float32)
+        for col in columns
+    }
+    del raw
+
+    if os.path.isdir(directory):
+        shutil.rmtree(directory)
+    os.makedirs(directory)
+
+    order = np.argsort(years, kind='stable')
+    bounds = np.flatnonzero(np.diff(years[order])) + 1
+    written = []
+    for part in np.split(order, bounds):
+        if len(part) == 0:
+            continue
+        year = int(years[part[0]])
+        part_dir = os.path.join(directory, f'year={year}')
+        os.makedirs(part_dir)
+        np.save(os.path.join(part_dir, 'Date.npy'), dates[part])
+        np.save(os.path.join(part_dir, 'Stock.npy'), codes[part].astype(np.int32))
+        for col in columns:
+            np.save(os.path.join(part_dir, f'{col}.npy'), values[col][part])
+        written.append(year)
+
+    manifest = {
+        'version': CACHE_VERSION,
+        'source': fingerprint,
+        'columns': columns,
+        'tickers': [str(t) for t in tickers],
+        'years': written,
+    }
+    write_manifest(directory, manifest)
+    return manifest
+
+
+def ensure_price_cache(path, cache_dir=None):
+    """Return a fresh manifest, rebuilding the cache if the source changed."""
+    manifest = read_manifest(cache_path(path, cache_dir))
+    if not is_fresh(manifest, path):
+        manifest = build_price_cache(path, cache_dir)
+    return manifest
+
+
+def open_partitions(path, years=None, cache_dir=None):
+    """
+    Memory-map the cached year partitions.
+
+    Returns (manifest, {year: {column: memmap}}); nothing is read from disk
+    until the arrays are touched.
+    """
+    manifest = ensure_price_cache(path, cache_dir)
+    directory = cache_path(path, cache_dir)
+    wanted = manifest['years'] if years is None else [y for y in years if y in manifest['years']]
+
+    partitions = {}
+    for year in wanted:
+        part_dir = os.path.join(directory, f'year={year}')
+        partitions[year] = {
+            col: np.load(os.path.join(part_dir, f'{col}.npy'), mmap_mode='r')
+            for col in ['Date', 'Stock'] + manifest['columns']
+        }
+    return manifest, partitions
+
+
+def load_prices(path, years=None, cache_dir=None):
+    """
+    Typed price frame for the requested years, served from the cache.
+
+    Columns: Date (datetime64), Stock (categorical), float32 OHLCV.
+    """
+    from momentum_value.loader import is_multi, read_prices
+
+    if is_multi(path):
+        return read_prices(path, years)
+    manifest, partitions = open_partitions(path, years, cache_dir)
+    columns = ['Date', 'Stock'] + manifest['columns']
+    if len(partitions) == 1:
+        # Single year: with copy=False pandas >= 3 keeps each column a view of its
+        # memory map (older versions consolidate the float columns into one copy)
+        data = dict(next(iter(partitions.values())))
+    elif partitions:
+        data = {col: np.concatenate([p[col] for p in partitions.values()]) for col in columns}
+    else:
+        data = {'Date': np.array([], dtype='datetime64[ns]'), 'Stock': np.array([], dtype=np.int32)}
+        data.update({col: np.array([], dtype=np.float32) for col in manifest['columns']})
+
+    data['Stock'] = pd.Categorical.from_codes(data['Stock'], categories=manifest['tickers'])
+    return pd.DataFrame(data, columns=columns, copy=False)
@@ -0,0 +1,95 @@
+"""
+Chunked, filtered ingestion of the daily price CSV.
+
+Rows are read ``chunksize`` at a time and the date-range and ticker filters
+are applied to each chunk before anything is kept, so peak memory is bounded
+by the filtered result plus one chunk rather than by the raw file size.
+Columns are resolved through schema.PRICES from the header, so the same
+aliases (Symbol, Ticker, ...) work here as in load_prices.
+"""
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.config import AnalysisConfig
+from momentum_value.schema import PRICES, read_header, resolve
+from momentum_value.tickers import normalize_tickers
+
+
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def _date_mask(dates, start, end):
+    """
+    Rows whose day lies in [start, end].
+
+    ISO dates ('2023-01-02' or '2023-01-02 00:00:00+05:30') sort
+    lexicographically, so when every row starts with an ISO day the first
+    ten characters are compared without parsing. Any other format is
+    parsed with pd.to_datetime (and fails loudly if it cannot be).
+    """
+    text = dates.astype(str)
+    day = text.str[:10]
+    if day.str.fullmatch(r'\d{4}-\d{2}-\d{2}').all():
+        return (day >= start.strftime('%Y-%m-%d')) & (day <= end.strftime('%Y-%m-%d'))
+    parsed = pd.DatetimeIndex(pd.to_datetime(text))
+    if parsed.tz is not None:
+        parsed = parsed.tz_localize(None)
+    parsed = parsed.normalize()
+    return pd.Series((parsed >= start.normalize()) & (parsed <= end.normalize()), index=dates.index)
+
+
+def stream_prices(path=None, config=None, chunksize=500_000, verbose=True):
+    """
+    Read the price CSV in chunks, keeping only rows inside the config's
+    date range (and ticker universe, when ``config.tickers`` is set).
+    Tickers are normalized per chunk, so the universe can be given in the
+    same clean form the fundamentals use.
+
+    Returns (prices, report) where report counts rows scanned vs kept.
+    """
+    config = config or AnalysisConfig()
+    path = path or config.price_path
+    tickers = set(normalize_tickers(list(config.tickers))) if config.tickers is not None else None
+
+    # Header only: canonical name -> (position, source name)
+    found = resolve(read_header(path), PRICES)
+    rename = {source: name for name, (_, source) in found.items()}
+    positions = sorted(pos for pos, _ in found.values())
+    kept = []
+    report = {'chunks': 0, 'rows_scanned': 0, 'rows_kept': 0}
+    for chunk in pd.read_csv(path, chunksize=chunksize, usecols=positions,
+                             dtype={found['Date'][1]: str, found['Stock'][1]: str}):
+        chunk = chunk.rename(columns=rename)
+        report['chunks'] += 1
+        report['rows_scanned'] += len(chunk)
+
+        chunk['Stock'] = normalize_tickers(chunk['Stock'])
+        mask = _date_mask(chunk['Date'], config.start_date, config.end_date)
+        if tickers is not None:
+            mask &= chunk['Stock'].isin(tickers)
+        chunk = chunk.loc[mask.to_numpy()]
+        if chunk.empty:
+            continue
+
+        for col in PRICE_COLUMNS:
+            if col in chunk:
+                chunk[col] = pd.to_numeric(chunk[col], errors='coerce').astype(np.float32)
+        kept.append(chunk)
+        report['rows_kept'] += len(chunk)
+
+    if kept:
+        prices = pd.concat(kept, ignore_index=True)
+    else:
+        prices = pd.DataFrame(columns=['Date', 'Stock'] + PRICE_COLUMNS)
+    dates = pd.DatetimeIndex(pd.to_datetime(prices['Date']))
+    prices['Date'] = dates.tz_localize(None) if dates.tz is not None else dates
+    prices['Stock'] = prices['Stock'].astype('category')
+
+    if verbose:
+        share = report['rows_kept'] / report['rows_scanned'] if report['rows_scanned'] else 0.0
+        print(
+            f"Streamed {report['rows_scanned']:,} rows in {report['chunks']} chunks, "
+            f"kept {report['rows_kept']:,} ({share:.1%})"
+        )
+    return prices, report
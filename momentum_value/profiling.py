@@ -0,0 +1,269 @@
+"""
+Opt-in per-stage instrumentation: wall time, CPU time, rows and memory.
+
+Stages are marked with a context manager, a decorator or begin/lap/end
+calls (for the starter's notebook-style cells). When profiling is off every
+marker returns immediately, so the markers can stay in the code.
+
+Turn it on with the MOMENTUM_VALUE_PROFILE environment variable:
+- MOMENTUM_VALUE_PROFILE=1                       # wall/CPU time, rows, peak RSS delta
+- MOMENTUM_VALUE_PROFILE=tracemalloc             # peak traced memory per stage instead
+- MOMENTUM_VALUE_PROFILE=cprofile,tracemalloc    # plus a .prof dump per stage
+and MOMENTUM_VALUE_PROFILE_OUT=trace.json to write the trace. The trace
+also holds Chrome trace events, so it opens in Perfetto / chrome://tracing.
+
+Usage:
+    with PROFILER.stage('merge', rows_in=len(prices)) as rec:
+        merged = ...
+        rec.rows_out = len(merged)
+
+    PROFILER.lap('Story 1.2: clean and merge', rows_in=len(price_data))
+    ...
+    PROFILER.end(rows_out=len(price_filtered))   # optional: close the cell with its rows
+"""
+
+import cProfile
+import functools
+import json
+import os
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+ENV_VAR = 'MOMENTUM_VALUE_PROFILE'
+OUT_VAR = 'MOMENTUM_VALUE_PROFILE_OUT'
+
+
+@dataclass
+class StageRecord:
+    """Measurements of one stage run."""
+
+    name: str
+    start: float = 0.0
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    rows_in: int = None
+    rows_out: int = None
+    mem_mb: float = None
+    depth: int = 0
+    profile: str = None
+
+
+class _Disabled:
+    """Shared no-op stand-in for a stage when profiling is off."""
+
+    rows_in = rows_out = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __setattr__(self, name, value):
+        pass
+
+
+_DISABLED = _Disabled()
+
+
+def _rows(obj):
+    try:
+        return len(obj)
+    except TypeError:
+        return None
+
+
+def _max_rss_mb():
+    if resource is None:
+        return None
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Profiler:
+    """
+    Collects StageRecords for nested stages.
+
+    Memory is the peak traced allocation above the stage's starting point
+    with ``trace_memory``, otherwise the growth of the process's peak RSS
+    (0 when the stage stays under an earlier peak). ``cprofile`` dumps a
+    .prof file for each outermost stage into ``profile_dir``.
+    """
+
+    def __init__(self, enabled=False, cprofile=False, trace_memory=False, profile_dir='.cache/profile'):
+        self.enabled = enabled
+        self.cprofile = cprofile
+        self.trace_memory = trace_memory
+        self.profile_dir = profile_dir
+        self.records = []
+        self._open = []
+        self._lap = None
+        self._origin = time.perf_counter()
+
+    @classmethod
+    def from_env(cls):
+        """Profiler configured from MOMENTUM_VALUE_PROFILE."""
+        flags = {f.strip().lower() for f in os.environ.get(ENV_VAR, '').split(',') if f.strip()}
+        flags.discard('0')
+        return cls(enabled=bool(flags), cprofile='cprofile' in flags, trace_memory='tracemalloc' in flags)
+
+    # ------------------------------------------------------------------
+    # Markers
+    # ------------------------------------------------------------------
+    def begin(self, name, rows_in=None):
+        """Open a stage; returns its record (None when disabled)."""
+        if not self.enabled:
+            return None
+        rec = StageRecord(name, start=time.perf_counter() - self._origin, rows_in=rows_in, depth=len(self._open))
+        state = {'rec': rec, 'profile': None}
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            state['mem0'] = tracemalloc.get_traced_memory()[0]
+            if not self._open:
+                tracemalloc.reset_peak()
+        else:
+            state['mem0'] = _max_rss_mb()
+        if self.cprofile and not self._open:
+            state['profile'] = cProfile.Profile()
+            state['profile'].enable()
+        state['wall0'], state['cpu0'] = time.perf_counter(), time.process_time()
+        self._open.append(state)
+        return rec
+
+    def end(self, rows_out=None):
+        """Close the innermost open stage."""
+        if not self.enabled or not self._open:
+            return None
+        wall, cpu = time.perf_counter(), time.process_time()
+        state = self._open.pop()
+        rec = state['rec']
+        rec.wall_s = wall - state['wall0']
+        rec.cpu_s = cpu - state['cpu0']
+        if rows_out is not None:
+            rec.rows_out = rows_out
+        if state['profile'] is not None:
+            state['profile'].disable()
+            os.makedirs(self.profile_dir, exist_ok=True)
+            rec.profile = os.path.join(self.profile_dir, f'{len(self.records):02d}-{_slug(rec.name)}.prof')
+            state['profile'].dump_stats(rec.profile)
+        if self.trace_memory:
+            rec.mem_mb = (tracemalloc.get_traced_memory()[1] - state['mem0']) / 2**20
+        elif state['mem0'] is not None:
+            rec.mem_mb = _max_rss_mb() - state['mem0']
+        self.records.append(rec)
+        return rec
+
+    def lap(self, name, rows_in=None):
+        """
+        End the previous lap (if any) and begin ``name`` - one call per cell.
+        A lap already closed with end(rows_out=...) is not ended twice.
+        """
+        if not self.enabled:
+            return None
+        if self._lap is not None and self._lap in [s['rec'] for s in self._open]:
+            while self._open and self._open[-1]['rec'] is not self._lap:
+                self.end()
+            self.end()
+        self._lap = self.begin(name, rows_in)
+        return self._lap
+
+    def stage(self, name, rows_in=None):
+        """Context manager around one stage; set ``rows_out`` on the record."""
+        if not self.enabled:
+            return _DISABLED
+        return _StageContext(self, name, rows_in)
+
+    def profiled(self, name=None):
+        """Decorator form: rows in/out from len() of the first argument and the result."""
+        def wrap(func):
+            label = name or func.__name__
+
+            @functools.wraps(func)
+            def run(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                self.begin(label, _rows(args[0]) if args else None)
+                try:
+                    result = func(*args, **kwargs)
+                finally:
+                    self.end()
+                self.records[-1].rows_out = _rows(result)
+                return result
+            return run
+        return wrap
+
+    # ------------------------------------------------------------------
+    # Output
+    # ------------------------------------------------------------------
+    def finish(self):
+        """Close any stages still open (e.g. the last lap)."""
+        while self._open:
+            self.end()
+        self._lap = None
+
+    def summary(self):
+        """Fixed-width table of the recorded stages, in start order."""
+        lines = [f"{'stage':<40} {'wall s':>9} {'cpu s':>9} {'rows in':>10} {'rows out':>10} {'mem MB':>9}"]
+        for rec in sorted(self.records, key=lambda r: r.start):
+            fmt = lambda v, spec: format(v, spec) if v is not None else '-'
+            lines.append(
+                f"{'  ' * rec.depth + rec.name:<40.40} {rec.wall_s:>9.3f} {rec.cpu_s:>9.3f} "
+                f"{fmt(rec.rows_in, ','):>10} {fmt(rec.rows_out, ','):>10} {fmt(rec.mem_mb, '.1f'):>9}"
+            )
+        return '\n'.join(lines)
+
+    def to_dict(self):
+        stages = [asdict(rec) for rec in sorted(self.records, key=lambda r: r.start)]
+        events = [{
+            'name': rec['name'], 'ph': 'X', 'pid': os.getpid(), 'tid': 0,
+            'ts': rec['start'] * 1e6, 'dur': rec['wall_s'] * 1e6,
+            'args': {k: rec[k] for k in ('cpu_s', 'rows_in', 'rows_out', 'mem_mb')},
+        } for rec in stages]
+        return {'stages': stages, 'traceEvents': events}
+
+    def write_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    def report(self, path=None):
+        """
+        Close open stages, print the summary and write the JSON trace to
+        ``path`` (default: MOMENTUM_VALUE_PROFILE_OUT, if set). No-op when off.
+        """
+        if not self.enabled:
+            return
+        self.finish()
+        print("\n=== Stage Profile ===")
+        print(self.summary())
+        path = path or os.environ.get(OUT_VAR)
+        if path:
+            self.write_trace(path)
+            print(f"Trace written to {path}")
+
+
+class _StageContext:
+    def __init__(self, profiler, name, rows_in):
+        self.profiler, self.name, self.rows_in = profiler, name, rows_in
+
+    def __enter__(self):
+        return self.profiler.begin(self.name, self.rows_in)
+
+    def __exit__(self, *exc):
+        self.profiler.end()
+        return False
+
+
+def _slug(name):
+    return ''.join(c if c.isalnum() else '_' for c in name).strip('_').lower()
+
+
+# Process-wide profiler, configured from the environment
+PROFILER = Profiler.from_env()
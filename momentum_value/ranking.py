@@ -0,0 +1,60 @@
+"""
+N-tile bucketing kernel shared by the analysis, sweep, backtest and daily
+update.
+
+Values are ranked along the last axis with one stable argsort, so a 1-D
+cross-section, a (dates x stocks) matrix or a (factors x dates x stocks)
+stack is bucketed in a single call. Rank positions are cut at the same
+interpolated quantiles pd.qcut uses, so for distinct values the codes equal
+``pd.qcut(..., labels=False)``. Unlike qcut, ties never merge buckets: tied
+values are ordered by ``tiebreak`` (default: position), and every row with
+at least ``n`` finite values fills all ``n`` buckets.
+
+Examples:
+- quantile_codes(momentum, 5)                           # 0..4, -1 where NaN
+- quantile_codes(np.stack([momentum, pe]), 5)           # both factors, every date
+- quantile_series(df['pe_ratio'], 5, labels=['Q1_Value', 'Q2', 'Q3', 'Q4', 'Q5_Growth'])
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def quantile_codes(values, n, tiebreak=None):
+    """
+    N-tile codes 0..n-1 along the last axis (-1 where the value is missing).
+
+    ``tiebreak`` is a secondary sort key broadcastable to ``values`` (e.g.
+    ticker ids); without it ties are broken by position on the last axis.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    valid = np.isfinite(values)
+    keyed = np.where(valid, values, np.inf)
+    if tiebreak is None:
+        order = np.argsort(keyed, axis=-1, kind='stable')
+    else:
+        order = np.lexsort((np.broadcast_to(tiebreak, values.shape), keyed), axis=-1)
+    ranks = np.empty(values.shape, dtype=np.int64)
+    np.put_along_axis(ranks, order, np.broadcast_to(np.arange(values.shape[-1]), values.shape), axis=-1)
+
+    counts = valid.sum(axis=-1, keepdims=True)
+    return np.where(valid, codes_from_ranks(ranks, counts, n), -1)
+
+
+def codes_from_ranks(ranks, counts, n):
+    """
+    Bucket of 0-based rank ``r`` among ``m`` (= counts) values: i where
+    i(m-1)/n < r <= (i+1)(m-1)/n, pd.qcut's edges in rank space.
+    """
+    return np.maximum((ranks * n - 1) // np.maximum(counts - 1, 1), 0)
+
+
+def quantile_series(values, n, labels=None, tiebreak=None):
+    """
+    quantile_codes for a Series: integer codes on the same index, or a
+    Categorical of ``labels`` (NaN where the value is missing).
+    """
+    codes = quantile_codes(values.to_numpy(dtype=np.float64, na_value=np.nan), n, tiebreak)
+    if labels is None:
+        return pd.Series(codes, index=values.index, name=values.name)
+    return pd.Series(pd.Categorical.from_codes(codes, categories=labels), index=values.index, name=values.name)
@@ -0,0 +1,365 @@
+"""
+Headless report: results model, lazy figure rendering and Markdown/HTML output.
+
+The pipeline computes every Story's results without plotting. build_report
+turns them into a Report (sections of text lines, tables and figure specs).
+Figures are only drawn when the report is written: each spec names a
+drawing function in this module, and the specs are rendered on the Agg
+backend in a process pool (or in-process for one worker), or skipped
+entirely. matplotlib is imported inside the renderer only, so a
+compute-only run never loads it.
+
+Usage:
+    report = run_report(AnalysisConfig(), 'reports/final_results.md')           # Markdown + PNGs
+    report = run_report(AnalysisConfig(), 'reports/final_results.html', figures=False)
+"""
+
+import html
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from momentum_value.config import AnalysisConfig
+from momentum_value.pipeline import Pipeline
+
+
+@dataclass
+class FigureSpec:
+    """A figure to draw later: ``draw`` names a function in DRAWERS."""
+
+    name: str
+    title: str
+    draw: str
+    data: dict
+    size: tuple = (12, 5)
+
+
+@dataclass
+class Section:
+    title: str
+    lines: list = field(default_factory=list)
+    tables: dict = field(default_factory=dict)
+    figures: list = field(default_factory=list)
+
+
+@dataclass
+class Report:
+    """Everything a rendered report shows; no matplotlib objects inside."""
+
+    title: str
+    subtitle: str
+    sections: list
+    figure_paths: dict = field(default_factory=dict)
+
+    @property
+    def figures(self):
+        return [fig for section in self.sections for fig in section.figures]
+
+
+# ----------------------------------------------------------------------
+# Results -> report model
+# ----------------------------------------------------------------------
+def _pct(x):
+    return f'{x:.2%}' if np.isfinite(x) else 'n/a'
+
+
+def _portfolio_table(stats, labels):
+    table = stats.copy()
+    table.index = [labels.get(i, f'Q{int(i) + 1}') for i in table.index]
+    table['return/risk'] = table['mean'] / table['std']
+    return table.rename(columns={'mean': 'Mean Return', 'std': 'Std Dev', 'count': 'Count'})
+
+
+def _risk_lines(table, name):
+    best = table['sharpe'].idxmax() if table['sharpe'].notna().any() else None
+    if best is None:
+        return [f"{name.title()} portfolios: not enough prices for risk measures"]
+    return [f"{name.title()} portfolio with the best Sharpe ratio: {best} "
+            f"(Sharpe {table.loc[best, 'sharpe']:.2f}, volatility {_pct(table.loc[best, 'ann_vol'])}, "
+            f"beta {table.loc[best, 'beta']:.2f})"]
+
+
+def build_report(results, config):
+    """Report model from Pipeline results (Stories 1.3-1.9)."""
+    factors = results['factors']
+    dist = results['distribution']
+    tests = results['tests']
+    spreads = results['spreads']
+    conclusions = results['conclusions']
+    portfolios = results['portfolios']
+    n = config.n_quantiles
+    mom, ret = f'momentum {config.momentum_year}', f'return {config.return_year}'
+
+    overview = Section('Quick Results Summary', lines=[
+        f"Total stocks analyzed: {conclusions['n_stocks']}",
+        f"Analysis type: Momentum ({config.momentum_year}) vs Value (P/E) predicting {config.return_year} returns",
+        f"Portfolios: {n} quantiles; P/E filter {config.pe_min} < P/E"
+        + (f" < {config.pe_max}" if config.pe_max is not None else ''),
+    ])
+
+    factor_section = Section('Story 1.3: Factor Calculation Results',
+                             tables={'Factor statistics': factors.describe().T})
+
+    eda = Section('Story 1.4: Correlation Results', tables={'Correlation matrix': results['eda']['corr']})
+    corr = results['eda']['corr']
+    eda.lines = [
+        f"Momentum vs {config.return_year} returns: {corr.loc['momentum', 'return']:.3f}",
+        f"P/E vs {config.return_year} returns: {corr.loc['pe_ratio', 'return']:.3f}",
+    ]
+    eda.figures.append(FigureSpec('distributions', 'Factor distributions and relationships', 'distributions',
+                                  {'factors': factors, 'momentum_label': mom, 'return_label': ret}, (15, 8)))
+
+    distribution = Section('Story 1.5: Probability Distribution Results', lines=[
+        f"Expected value (mean): {_pct(dist['mean'])}",
+        f"Variance: {dist['variance']:.4f}",
+        f"Standard deviation: {_pct(dist['std'])}",
+        f"Skewness: {dist['skew']:.4f}",
+        f"Kurtosis: {dist['kurtosis']:.4f}",
+        f"Shapiro-Wilk p-value: {dist['shapiro_p']:.4f}" if np.isfinite(dist['shapiro_p'])
+        else 'Shapiro-Wilk: not enough observations',
+    ])
+    distribution.figures.append(FigureSpec('normality', 'Returns vs normal distribution', 'normality',
+                                           {'returns': factors['return']}))
+
+    mom_labels = {0: 'Q1 (Low)', n - 1: f'Q{n} (High)'}
+    val_labels = {0: 'Q1 (Value)', n - 1: f'Q{n} (Growth)'}
+    portfolio = Section('Story 1.6: Portfolio Performance', tables={
+        'Momentum portfolios': _portfolio_table(portfolios['momentum'], mom_labels),
+        'Value portfolios': _portfolio_table(portfolios['value'], val_labels),
+    })
+
+    grids = results['double_sort']
+    double = Section('Story 1.6: Momentum x Value Double Sort', lines=[
+        "Independent sort: momentum and P/E quantiles assigned separately",
+        "Conditional sort: P/E quantiles within each momentum quantile",
+    ])
+    for method, grid in grids.items():
+        double.tables[f'{method.title()} sort: mean {ret}'] = grid.table('mean')
+        double.tables[f'{method.title()} sort: stocks per cell'] = grid.table('count')
+    double.figures.append(FigureSpec('double_sort', f'Mean {ret} by momentum x value cell', 'double_sort',
+                                     {method: grid.table('mean') for method, grid in grids.items()}, (14, 6)))
+
+    testing = Section('Story 1.7: Hypothesis Testing Results', tables={'Welch t-tests': tests})
+    for name, label in (('momentum', f'Q{n}-Q1'), ('value', f'Q1-Q{n}')):
+        p, p_holm = tests.loc[name, ['p_value', 'p_holm']]
+        testing.lines.append(
+            f"{name.title()} ({label}): t = {tests.loc[name, 't_stat']:.4f}, p = {p:.4f}, "
+            f"Holm-adjusted p = {p_holm:.4f} - {'significant' if p_holm < 0.05 else 'not significant'} at 5%"
+        )
+
+    visual = Section('Story 1.8: Factor Spreads', lines=[
+        f"Momentum factor spread (Q{n}-Q1): {_pct(spreads['momentum'])}",
+        f"Value factor spread (Q1-Q{n}): {_pct(spreads['value'])}",
+        f"Stronger factor: {conclusions['stronger_factor']}",
+    ])
+    visual.figures.append(FigureSpec('quantiles', 'Mean returns by quantile', 'quantiles', {
+        'momentum': portfolios['momentum'], 'value': portfolios['value'], 'return_label': ret,
+    }, (14, 6)))
+
+    risk = results['risk']
+    risk_section = Section(f'Story 1.8: Risk-Adjusted Returns ({config.return_year})', tables={
+        'Momentum portfolios': risk['momentum'],
+        'Value portfolios': risk['value'],
+        'Per-stock risk measures (universe)': risk['tickers'].describe().T,
+    })
+    risk_section.lines = _risk_lines(risk['momentum'], 'momentum') + _risk_lines(risk['value'], 'value')
+
+    normal = conclusions['normal']
+    final = Section('Story 1.9: Final Conclusions', lines=[
+        f"Analyzed {conclusions['n_stocks']} stocks",
+        f"Expected return {_pct(conclusions['mean_return'])}, risk (std dev) {_pct(conclusions['std_return'])}",
+        'Not enough data to test normality' if normal is None
+        else f"Returns are {'approximately normal' if normal else 'non-normal'}",
+        f"{conclusions['stronger_factor']} factor showed stronger performance in {config.return_year}",
+    ])
+
+    return Report(
+        title='Momentum vs Value Factor Performance Analysis - Results',
+        subtitle=f'Statistical investigation of stock market returns ({config.return_year})',
+        sections=[overview, factor_section, eda, distribution, portfolio, double, testing, visual, risk_section,
+                  final],
+    )
+
+
+# ----------------------------------------------------------------------
+# Figures (run in worker processes; matplotlib imported on demand)
+# ----------------------------------------------------------------------
+def _draw_distributions(fig, data):
+    factors = data['factors']
+    axes = fig.subplots(2, 3)
+    for ax, col, label in zip(axes[0], ('momentum', 'pe_ratio', 'return'),
+                              (data['momentum_label'], 'P/E ratio', data['return_label'])):
+        ax.hist(factors[col], bins=20, edgecolor='black')
+        ax.set_title(f'{label[0].upper()}{label[1:]} distribution')
+    for ax, col, label in zip(axes[1], ('momentum', 'pe_ratio'), (data['momentum_label'], 'P/E ratio')):
+        ax.scatter(factors[col], factors['return'], alpha=0.5)
+        ax.set_xlabel(label)
+        ax.set_ylabel(data['return_label'])
+    corr = factors.corr()
+    image = axes[1, 2].imshow(corr.to_numpy(), vmin=-1, vmax=1, cmap='coolwarm')
+    axes[1, 2].set_xticks(range(len(corr)), corr.columns, rotation=45)
+    axes[1, 2].set_yticks(range(len(corr)), corr.columns)
+    for (i, j), v in np.ndenumerate(corr.to_numpy()):
+        axes[1, 2].text(j, i, f'{v:.2f}', ha='center', va='center')
+    axes[1, 2].set_title('Correlation matrix')
+    fig.colorbar(image, ax=axes[1, 2])
+
+
+def _draw_normality(fig, data):
+    from scipy import stats
+    returns = data['returns']
+    axes = fig.subplots(1, 2)
+    axes[0].hist(returns, bins=20, density=True, alpha=0.7, edgecolor='black')
+    x = np.linspace(*axes[0].get_xlim(), 100)
+    axes[0].plot(x, stats.norm.pdf(x, returns.mean(), returns.std()), 'r-', linewidth=2, label='Normal')
+    axes[0].set_title('Returns distribution vs normal')
+    axes[0].legend()
+    stats.probplot(returns, dist='norm', plot=axes[1])
+    axes[1].set_title('Q-Q plot')
+
+
+def _draw_quantiles(fig, data):
+    axes = fig.subplots(1, 2)
+    for ax, name in zip(axes, ('momentum', 'value')):
+        table = data[name]
+        x = np.arange(len(table))
+        ax.bar(x, table['mean'], yerr=table['std'] / np.sqrt(table['count']), capsize=5, alpha=0.7)
+        ax.set_xticks(x, [f'Q{int(i) + 1}' for i in table.index])
+        ax.set_title(f'Mean returns by {name} quantile')
+        ax.set_ylabel(f"Mean {data['return_label']}")
+        ax.grid(True, alpha=0.3)
+
+
+def _draw_double_sort(fig, data):
+    axes = np.atleast_1d(fig.subplots(1, len(data)))
+    for ax, (method, table) in zip(axes, data.items()):
+        image = ax.imshow(table.to_numpy(dtype=float), cmap='RdYlGn')
+        ax.set_xticks(range(table.shape[1]), table.columns, rotation=45)
+        ax.set_yticks(range(table.shape[0]), table.index)
+        for (i, j), v in np.ndenumerate(table.to_numpy(dtype=float)):
+            ax.text(j, i, f'{v:.1%}' if np.isfinite(v) else 'n/a', ha='center', va='center')
+        ax.set_title(f'{method.title()} sort')
+        fig.colorbar(image, ax=ax)
+
+
+DRAWERS = {
+    'distributions': _draw_distributions,
+    'normality': _draw_normality,
+    'quantiles': _draw_quantiles,
+    'double_sort': _draw_double_sort,
+}
+
+
+def _render_one(args):
+    """Draw one FigureSpec to a PNG on the Agg backend."""
+    spec, path = args
+    import matplotlib
+    matplotlib.use('Agg')
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=spec.size)
+    DRAWERS[spec.draw](fig, spec.data)
+    fig.suptitle(spec.title)
+    fig.tight_layout()
+    fig.savefig(path, dpi=100)
+    return spec.name, path
+
+
+def render_figures(report, directory, workers=None):
+    """Render every figure of the report into ``directory``; returns name -> path."""
+    specs = report.figures
+    if not specs:
+        return {}
+    os.makedirs(directory, exist_ok=True)
+    tasks = [(spec, os.path.join(directory, f'{spec.name}.png')) for spec in specs]
+    workers = min(workers or os.cpu_count() or 1, len(tasks))
+    if workers == 1:
+        done = [_render_one(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            done = list(pool.map(_render_one, tasks))
+    report.figure_paths.update(done)
+    return dict(done)
+
+
+# ----------------------------------------------------------------------
+# Writers
+# ----------------------------------------------------------------------
+def _format(value):
+    if isinstance(value, (float, np.floating)):
+        return f'{value:.4f}' if np.isfinite(value) else 'n/a'
+    return str(value)
+
+
+def _markdown_table(table):
+    header = '| | ' + ' | '.join(str(c) for c in table.columns) + ' |'
+    rule = '|---' * (len(table.columns) + 1) + '|'
+    rows = ['| ' + ' | '.join([str(idx)] + [_format(v) for v in row]) + ' |'
+            for idx, row in zip(table.index, table.itertuples(index=False))]
+    return '\n'.join([header, rule] + rows)
+
+
+def to_markdown(report, base_dir='.'):
+    """Report as Markdown; figure links are relative to ``base_dir``."""
+    out = [f'# {report.title}', f'## {report.subtitle}', '', '---']
+    for section in report.sections:
+        out += ['', f'### {section.title}']
+        if section.lines:
+            out += [''] + [f'- {line}' for line in section.lines]
+        for caption, table in section.tables.items():
+            out += ['', f'**{caption}:**', '', _markdown_table(table)]
+        for spec in section.figures:
+            if spec.name in report.figure_paths:
+                rel = os.path.relpath(report.figure_paths[spec.name], base_dir)
+                out += ['', f'![{spec.title}]({rel.replace(os.sep, "/")})']
+        out += ['', '---']
+    return '\n'.join(out) + '\n'
+
+
+def to_html(report, base_dir='.'):
+    """Report as one standalone HTML page (figures linked, not embedded)."""
+    esc = html.escape
+    out = ['<!DOCTYPE html>', '<html><head><meta charset="utf-8">', f'<title>{esc(report.title)}</title>',
+           '<style>body{font-family:sans-serif;max-width:960px;margin:auto}'
+           'table{border-collapse:collapse}td,th{border:1px solid #ccc;padding:2px 6px}</style>',
+           '</head><body>', f'<h1>{esc(report.title)}</h1>', f'<h2>{esc(report.subtitle)}</h2>']
+    for section in report.sections:
+        out.append(f'<h3>{esc(section.title)}</h3>')
+        if section.lines:
+            out.append('<ul>' + ''.join(f'<li>{esc(line)}</li>' for line in section.lines) + '</ul>')
+        for caption, table in section.tables.items():
+            out.append(f'<p><b>{esc(caption)}</b></p>')
+            out.append(table.to_html(float_format=lambda v: f'{v:.4f}', na_rep='n/a'))
+        for spec in section.figures:
+            if spec.name in report.figure_paths:
+                rel = os.path.relpath(report.figure_paths[spec.name], base_dir).replace(os.sep, '/')
+                out.append(f'<img src="{esc(rel)}" alt="{esc(spec.title)}" width="100%">')
+    out.append('</body></html>')
+    return '\n'.join(out) + '\n'
+
+
+def write_report(report, path):
+    """Write Markdown (.md) or HTML (.html/.htm), chosen by extension."""
+    base_dir = os.path.dirname(os.path.abspath(path))
+    text = to_html(report, base_dir) if path.lower().endswith(('.html', '.htm')) else to_markdown(report, base_dir)
+    os.makedirs(base_dir, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return path
+
+
+def run_report(config=None, output='reports/final_results.md', figures=True, workers=None, use_cache=True):
+    """
+    Run the pipeline, build the report and write it to ``output``.
+    Figures go to ``<output dir>/figures``; ``figures=False`` skips them.
+    """
+    config = config or AnalysisConfig()
+    results = Pipeline(config, use_cache=use_cache).run()
+    report = build_report(results, config)
+    if figures:
+        render_figures(report, os.path.join(os.path.dirname(os.path.abspath(output)), 'figures'), workers)
+    write_report(report, output)
+    print(f"Report written to {output}")
+    return report
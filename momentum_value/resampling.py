@@ -0,0 +1,127 @@
+"""
+Bootstrap confidence intervals and permutation p-values for quantile spreads.
+
+The Story 1.7 t-tests assume normal returns, which Shapiro-Wilk rejects.
+These resampling tests make no such assumption. Resamples are drawn as
+index matrices in batches and reduced with NumPy; batches are spread over a
+process pool. Every batch gets its own child seed spawned from one root
+seed (42, as in ``np.random.seed(42)``), so results are identical whatever
+the number of workers; spread_test spawns the bootstrap and permutation
+streams from that root too, so the two never share random numbers. With
+either sample empty the statistics are NaN.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+DEFAULT_SEED = 42
+
+
+def _bootstrap_batch(args):
+    """Spread of means for ``n`` bootstrap resamples of a and b."""
+    a, b, n, seed = args
+    rng = np.random.default_rng(seed)
+    idx_a = rng.integers(0, len(a), size=(n, len(a)))
+    idx_b = rng.integers(0, len(b), size=(n, len(b)))
+    return a[idx_a].mean(axis=1) - b[idx_b].mean(axis=1)
+
+
+def _permutation_batch(args):
+    """Spread of means for ``n`` random relabelings of the pooled sample."""
+    pooled, n_a, n, seed = args
+    rng = np.random.default_rng(seed)
+    shuffled = rng.permuted(np.broadcast_to(pooled, (n, len(pooled))), axis=1)
+    return shuffled[:, :n_a].mean(axis=1) - shuffled[:, n_a:].mean(axis=1)
+
+
+def _resample(worker, data, n_resamples, seed, workers, batch):
+    """Run ``worker`` over fixed-size batches, in a pool if it pays off."""
+    sizes = [batch] * (n_resamples // batch)
+    if n_resamples % batch:
+        sizes.append(n_resamples % batch)
+    seeds = _seed_sequence(seed).spawn(len(sizes))
+    tasks = [data + (size, child) for size, child in zip(sizes, seeds)]
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) == 1:
+        return np.concatenate([worker(task) for task in tasks])
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+        return np.concatenate(list(pool.map(worker, tasks)))
+
+
+def _seed_sequence(seed):
+    """``seed`` as a SeedSequence (an int, None or a spawned child)."""
+    return seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+
+
+def _clean(x):
+    x = np.asarray(x, dtype=np.float64)
+    return x[np.isfinite(x)]
+
+
+def bootstrap_spread(a, b, n_resamples=10_000, confidence=0.95, seed=DEFAULT_SEED,
+                     workers=None, batch=2_000):
+    """
+    Percentile bootstrap CI for mean(a) - mean(b).
+
+    Returns a dict with the observed spread, the CI bounds and the
+    bootstrap standard error (all NaN if a or b has no finite values).
+    """
+    a, b = _clean(a), _clean(b)
+    if not len(a) or not len(b):
+        return {'spread': np.nan, 'ci_low': np.nan, 'ci_high': np.nan, 'se': np.nan,
+                'n_resamples': n_resamples}
+    spreads = _resample(_bootstrap_batch, (a, b), n_resamples, seed, workers, batch)
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.percentile(spreads, [tail, 100 - tail])
+    return {
+        'spread': a.mean() - b.mean(),
+        'ci_low': low,
+        'ci_high': high,
+        'se': spreads.std(ddof=1),
+        'n_resamples': n_resamples,
+    }
+
+
+def permutation_test(a, b, n_resamples=10_000, alternative='two-sided', seed=DEFAULT_SEED,
+                     workers=None, batch=2_000):
+    """
+    Permutation p-value for H0: a and b come from the same distribution.
+
+    ``alternative`` is 'two-sided', 'greater' (mean(a) > mean(b)) or 'less'.
+    The p-value is NaN if a or b has no finite values.
+    """
+    if alternative not in ('two-sided', 'greater', 'less'):
+        raise ValueError(f"Unknown alternative: {alternative!r}")
+    a, b = _clean(a), _clean(b)
+    if not len(a) or not len(b):
+        return {'spread': np.nan, 'p_value': np.nan, 'n_resamples': n_resamples}
+    observed = a.mean() - b.mean()
+    pooled = np.concatenate([a, b])
+    spreads = _resample(_permutation_batch, (pooled, len(a)), n_resamples, seed, workers, batch)
+
+    if alternative == 'two-sided':
+        extreme = np.abs(spreads) >= abs(observed)
+    elif alternative == 'greater':
+        extreme = spreads >= observed
+    else:
+        extreme = spreads <= observed
+    # +1 keeps the estimate away from an impossible p = 0
+    return {
+        'spread': observed,
+        'p_value': (extreme.sum() + 1) / (n_resamples + 1),
+        'n_resamples': n_resamples,
+    }
+
+
+def spread_test(a, b, n_resamples=10_000, confidence=0.95, alternative='two-sided',
+                seed=DEFAULT_SEED, workers=None):
+    """Bootstrap CI and permutation p-value for one quantile spread."""
+    # Independent streams for the two tests, both derived from ``seed``
+    boot_seed, perm_seed = _seed_sequence(seed).spawn(2)
+    result = bootstrap_spread(a, b, n_resamples, confidence, boot_seed, workers)
+    result['p_value'] = permutation_test(a, b, n_resamples, alternative, perm_seed, workers)['p_value']
+    return result
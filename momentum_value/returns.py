@@ -0,0 +1,124 @@
+"""
+Vectorized return engine.
+
+The price table is sorted once by (Stock, Date). Every window is then a pair
+of binary searches per ticker on a combined (ticker, day) key, so the first
+and last close of any number of windows come out of one NumPy pass instead
+of a boolean-mask scan plus ``sort_values`` per stock.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# Lookback windows as (months back to window start, months back to window end)
+# relative to the as-of date. '12-1' is the classic skip-month momentum.
+LOOKBACK_WINDOWS = {
+    '1M': (1, 0),
+    '3M': (3, 0),
+    '6M': (6, 0),
+    '12M': (12, 0),
+    '12-1': (12, 1),
+}
+
+
+def to_day_numbers(dates):
+    """Convert a date Series/array to int64 days since epoch (tz dropped)."""
+    dates = pd.DatetimeIndex(dates)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return dates.to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+
+class ReturnEngine:
+    """
+    Sort-once return calculator over a long (Stock, Date, Close) frame.
+
+    Examples:
+    - engine.annual_returns(2023, min_days=100)
+    - engine.lookback_returns('2023-12-31', ['3M', '12-1'])
+    """
+
+    def __init__(self, df, price_col='Close'):
+        df = df[df['Stock'].notna()]
+        codes, tickers = pd.factorize(df['Stock'])
+        days = to_day_numbers(df['Date'])
+        order = np.lexsort((days, codes))
+
+        self.tickers = pd.Index(tickers)
+        self.days = days[order]
+        self.closes = df[price_col].to_numpy(dtype=np.float64)[order]
+        self._span = int(self.days.max() - self.days.min()) + 2 if len(days) else 1
+        self._day0 = int(self.days.min()) if len(days) else 0
+        self._keys = codes[order].astype(np.int64) * self._span + (self.days - self._day0)
+
+    def window_bounds(self, starts, ends):
+        """
+        Locate the rows of every ticker inside each [start, end] window.
+
+        starts/ends are arrays of day numbers (one per window). Returns
+        (lo, hi) arrays of shape (n_windows, n_tickers); rows lo..hi-1 of
+        the sorted table belong to that ticker and window.
+        """
+        starts = np.clip(np.asarray(starts, dtype=np.int64) - self._day0, 0, self._span - 1)
+        ends = np.clip(np.asarray(ends, dtype=np.int64) - self._day0, -1, self._span - 1)
+        base = np.arange(len(self.tickers), dtype=np.int64) * self._span
+        lo = np.searchsorted(self._keys, base[None, :] + starts[:, None], side='left')
+        hi = np.searchsorted(self._keys, base[None, :] + ends[:, None], side='right')
+        return lo, hi
+
+    def window_returns(self, starts, ends, min_days=1, require_positive=False):
+        """
+        (last - first) / first close per ticker for each window.
+
+        Tickers with fewer than ``min_days`` rows in a window, or a zero
+        start price (non-positive if ``require_positive``), get NaN.
+        """
+        lo, hi = self.window_bounds(starts, ends)
+        counts = hi - lo
+        has = counts >= max(min_days, 1)
+        first = np.where(has, self.closes[np.minimum(lo, len(self.closes) - 1)], np.nan)
+        last = np.where(has, self.closes[np.maximum(hi - 1, 0)], np.nan)
+        valid = has & ((first > 0) if require_positive else (first != 0))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(valid, (last - first) / first, np.nan), valid
+
+    def period_returns(self, start, end, min_days=1, require_positive=False):
+        """Return over [start, end] for every ticker that qualifies."""
+        start_day, end_day = to_day_numbers([start, end])
+        values, valid = self.window_returns([start_day], [end_day], min_days, require_positive)
+        return pd.Series(values[0][valid[0]], index=self.tickers[valid[0]])
+
+    def annual_returns(self, year, min_days=1, require_positive=False):
+        """First-to-last close return inside one calendar year."""
+        return self.period_returns(f'{year}-01-01', f'{year}-12-31', min_days, require_positive)
+
+    def lookback_returns(self, as_of, windows=None, min_days=1, require_positive=False):
+        """
+        Trailing returns for several lookback windows in one pass.
+
+        ``windows`` is a list of names from LOOKBACK_WINDOWS or a dict of
+        name -> (months_start, months_end). One column per window.
+        """
+        if windows is None:
+            windows = LOOKBACK_WINDOWS
+        if not isinstance(windows, dict):
+            windows = {name: LOOKBACK_WINDOWS[name] for name in windows}
+
+        as_of = pd.Timestamp(as_of)
+        starts = to_day_numbers([as_of - pd.DateOffset(months=m) for m, _ in windows.values()])
+        ends = to_day_numbers([as_of - pd.DateOffset(months=m) for _, m in windows.values()])
+        values, _ = self.window_returns(starts, ends, min_days, require_positive)
+
+        out = pd.DataFrame(values.T, index=self.tickers, columns=list(windows))
+        return out.dropna(how='all')
+
+
+def annual_returns(df, year, min_days=1, require_positive=False):
+    """Convenience wrapper: annual return per stock as a Series."""
+    return ReturnEngine(df).annual_returns(year, min_days, require_positive)
+
+
+def lookback_returns(df, as_of, windows=None, min_days=1):
+    """Convenience wrapper: trailing returns for several windows."""
+    return ReturnEngine(df).lookback_returns(as_of, windows, min_days)
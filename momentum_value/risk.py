@@ -0,0 +1,226 @@
+"""
+Risk measures over daily returns of a PricePanel or of quantile portfolios.
+
+Running sums of r, r**2, min(r, 0)**2, the market m, m**2 and r*m (with
+observation counts) are accumulated once down the date axis. Any trailing
+window is then the difference of two rows of those sums, so each step costs
+O(1), every window length reuses the same sums, and all tickers are handled
+in the same array operation. Volatility, beta to an equal-weight market,
+Sharpe and Sortino come from the sums; drawdowns from a running maximum.
+
+Examples:
+- risk = RiskModel.from_panel(panel.year(2024))
+- risk.volatility(21)                 # rolling 21-day annualized vol, dates x tickers
+- risk.beta(63)                       # rolling beta to the equal-weight market
+- risk.summary()                      # full-period return, vol, Sharpe, Sortino, drawdown, beta
+- quantile_risk(panel, analysis_df['momentum_q'], 5)
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+
+TRADING_DAYS = 252
+
+
+def equal_weight_market(returns):
+    """Equal-weight average of the available returns each day."""
+    valid = np.isfinite(returns)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(valid, returns, 0.0).sum(axis=1) / valid.sum(axis=1)
+
+
+def _running(x):
+    """Cumulative sums down axis 0 with a leading zero row."""
+    out = np.zeros((x.shape[0] + 1,) + x.shape[1:])
+    np.cumsum(x, axis=0, out=out[1:])
+    return out
+
+
+def max_drawdown(returns):
+    """Largest peak-to-trough loss of compounded returns per column (missing days flat)."""
+    log_wealth = np.cumsum(np.log1p(np.where(np.isfinite(returns), returns, 0.0)), axis=0)
+    peak = np.maximum.accumulate(np.maximum(log_wealth, 0.0), axis=0)
+    out = np.expm1((log_wealth - peak).min(axis=0, initial=0.0))
+    return np.where(np.isfinite(returns).any(axis=0), out, np.nan)
+
+
+class RiskModel:
+    """
+    Running moments of (dates x series) returns and an optional market.
+
+    ``periods_per_year`` annualizes volatility, Sharpe and Sortino; rolling
+    windows need ``min_periods`` valid days (default: over half the window).
+    """
+
+    def __init__(self, returns, market=None, dates=None, columns=None, periods_per_year=TRADING_DAYS):
+        self.returns = np.asarray(returns, dtype=np.float64)
+        self.dates = dates
+        self.columns = pd.Index(columns if columns is not None else range(self.returns.shape[1]))
+        self.periods_per_year = periods_per_year
+        self.market = None if market is None else np.asarray(market, dtype=np.float64)
+
+        valid = np.isfinite(self.returns)
+        r = np.where(valid, self.returns, 0.0)
+        self._n = _running(valid.astype(np.float64))
+        self._s1 = _running(r)
+        self._s2 = _running(r * r)
+        self._down = _running(np.minimum(r, 0.0) ** 2)
+        if self.market is not None:
+            # Market sums over the days each series has a return, so the
+            # covariance and market variance use the same observations
+            pair = valid & np.isfinite(self.market)[:, None]
+            m = np.where(pair, self.market[:, None], 0.0)
+            self._pn = _running(pair.astype(np.float64))
+            self._m1 = _running(m)
+            self._m2 = _running(m * m)
+            self._rm = _running(np.where(pair, r, 0.0) * m)
+            self._r1 = _running(np.where(pair, r, 0.0))
+
+    @classmethod
+    def from_panel(cls, panel, market=None, periods_per_year=TRADING_DAYS):
+        """Daily returns of every ticker, beta measured against ``market`` (default: equal-weight)."""
+        returns = panel.returns()
+        market = equal_weight_market(returns) if market is None else market
+        return cls(returns, market, panel.dates[1:], panel.tickers, periods_per_year)
+
+    # ------------------------------------------------------------------
+    # Windowed sums
+    # ------------------------------------------------------------------
+    def _sum(self, running, window):
+        """
+        (dates x series) trailing-window sums, over the dates so far for the
+        first ``window - 1`` rows (as pandas' rolling with min_periods);
+        full-period totals for window=None.
+        """
+        if window is None:
+            return running[-1]
+        out = np.empty((running.shape[0] - 1,) + running.shape[1:])
+        head = min(window, running.shape[0]) - 1
+        out[:head] = running[1:head + 1] - running[0]
+        out[head:] = running[head + 1:] - running[:len(running) - head - 1]
+        return out
+
+    def _enough(self, count, window, min_periods):
+        if window is None:
+            return count >= (min_periods or 2)
+        return count >= (min_periods or window // 2 + 1)
+
+    def _frame(self, values, window):
+        if window is None:
+            return pd.Series(values, index=self.columns)
+        return pd.DataFrame(values, index=self.dates, columns=self.columns)
+
+    def _moments(self, window, min_periods):
+        n = self._sum(self._n, window)
+        s1, s2 = self._sum(self._s1, window), self._sum(self._s2, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = s1 / n
+            var = np.maximum(s2 - s1 * mean, 0.0) / (n - 1)
+        ok = self._enough(n, window, min_periods)
+        return n, np.where(ok, mean, np.nan), np.where(ok, var, np.nan)
+
+    # ------------------------------------------------------------------
+    # Measures (window=None: the whole period, one value per series)
+    # ------------------------------------------------------------------
+    def volatility(self, window=None, min_periods=None):
+        """Annualized standard deviation of returns."""
+        _, _, var = self._moments(window, min_periods)
+        return self._frame(np.sqrt(var * self.periods_per_year), window)
+
+    def sharpe(self, window=None, min_periods=None):
+        """Annualized mean over annualized volatility (zero risk-free rate)."""
+        _, mean, var = self._moments(window, min_periods)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self._frame(mean / np.sqrt(var) * np.sqrt(self.periods_per_year), window)
+
+    def sortino(self, window=None, min_periods=None):
+        """Annualized mean over downside deviation (root mean squared negative return)."""
+        n, mean, _ = self._moments(window, min_periods)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            downside = np.sqrt(self._sum(self._down, window) / n)
+            return self._frame(mean / downside * np.sqrt(self.periods_per_year), window)
+
+    def beta(self, window=None, min_periods=None):
+        """Covariance with the market over market variance, on shared days."""
+        if self.market is None:
+            raise ValueError("RiskModel has no market returns; pass market= to compute beta")
+        n = self._sum(self._pn, window)
+        r1, m1 = self._sum(self._r1, window), self._sum(self._m1, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = self._sum(self._rm, window) - r1 * m1 / n
+            var = self._sum(self._m2, window) - m1 * m1 / n
+            beta = cov / var
+        return self._frame(np.where(self._enough(n, window, min_periods), beta, np.nan), window)
+
+    def max_drawdown(self):
+        """Full-period maximum drawdown per series (negative fraction)."""
+        return self._frame(max_drawdown(self.returns), None)
+
+    def rolling(self, windows=(21, 63, 252), measures=('volatility', 'beta')):
+        """{(measure, window): dates x series frame} from the one set of running sums."""
+        return {(m, w): getattr(self, m)(w) for m in measures for w in windows}
+
+    def summary(self):
+        """Full-period annualized return, volatility, Sharpe, Sortino, max drawdown and beta."""
+        n = self._n[-1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            ann_return = self._s1[-1] / n * self.periods_per_year
+        table = pd.DataFrame({
+            'ann_return': np.where(n >= 1, ann_return, np.nan),
+            'ann_vol': self.volatility(),
+            'sharpe': self.sharpe(),
+            'sortino': self.sortino(),
+            'max_drawdown': self.max_drawdown(),
+        }, index=self.columns)
+        if self.market is not None:
+            table['beta'] = self.beta()
+        return table
+
+
+def portfolio_returns(returns, codes, n):
+    """
+    Daily equal-weight returns of ``n`` portfolios (dates x n) from one
+    code per column of ``returns`` (-1 = not held); a stock's missing days
+    drop out of its portfolio's average for that day.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    held = codes >= 0
+    r = returns[:, held]
+    valid = np.isfinite(r)
+    rows = np.arange(r.shape[0])[:, None]
+    cells = (rows * n + codes[held])[valid]
+    size = r.shape[0] * n
+    sums = np.bincount(cells, weights=r[valid], minlength=size)
+    counts = np.bincount(cells, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return (sums / counts).reshape(r.shape[0], n)
+
+
+def quantile_risk(panel, codes, n=None, labels=None, market=None, periods_per_year=TRADING_DAYS):
+    """
+    Risk summary of each quantile portfolio over the panel's window.
+
+    ``codes`` is a Series of integer codes (or a Categorical) indexed by
+    ticker, e.g. the portfolios stage's members; tickers missing from the
+    panel are ignored. Beta is measured against the equal-weight market of
+    the whole panel unless ``market`` is given.
+    """
+    if isinstance(codes.dtype, pd.CategoricalDtype):
+        labels = list(codes.cat.categories) if labels is None else labels
+        codes = codes.cat.codes
+    codes = codes[~codes.index.duplicated()]
+    n = n or (len(labels) if labels is not None else int(codes.max()) + 1)
+    cols = panel.columns_of(codes.index)
+    aligned = np.full(len(panel.tickers), -1, dtype=np.int64)
+    aligned[cols[cols >= 0]] = codes.to_numpy(dtype=np.int64)[cols >= 0]
+
+    returns = panel.returns()
+    market = equal_weight_market(returns) if market is None else market
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        model = RiskModel(portfolio_returns(returns, aligned, n), market, panel.dates[1:],
+                          labels or [f'Q{i + 1}' for i in range(n)], periods_per_year)
+        return model.summary()
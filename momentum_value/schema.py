@@ -0,0 +1,186 @@
+"""
+Declarative schemas for the input files.
+
+Each Schema lists canonical columns with the names they may appear under,
+their dtype and whether they are dates. Resolving a schema only reads the
+file's header (the first CSV line, or the Parquet footer), so a missing
+column fails before the body is parsed; the real read then gets
+``usecols``/``dtype``/``parse_dates`` and never parses unused columns.
+
+Examples:
+- prices = read_table('Datasets/stock_price_dataset/Stock_Data.csv', PRICES)
+- fundamentals = read_table('Datasets/FUNDAMENTALratios.csv', FUNDAMENTALS, columns=['symbol', 'trailingPE'])
+- resolve(read_header(path), DIVIDENDS)     # {canonical: (position, source name)}
+"""
+
+import csv
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class Column:
+    """One canonical column and the header names it may appear under."""
+
+    name: str
+    candidates: tuple = ()
+    dtype: object = np.float64
+    required: bool = False
+    date: bool = False
+
+    @property
+    def names(self):
+        return (self.name,) + tuple(c for c in self.candidates if c != self.name)
+
+
+@dataclass(frozen=True)
+class Schema:
+    name: str
+    columns: tuple
+
+    def __getitem__(self, name):
+        for col in self.columns:
+            if col.name == name:
+                return col
+        raise KeyError(f"{self.name} schema has no column {name!r}")
+
+
+SCHEMAS = {}
+
+
+def register(schema):
+    """Add a schema to SCHEMAS (by name) and return it."""
+    SCHEMAS[schema.name] = schema
+    return schema
+
+
+PRICES = register(Schema('prices', (
+    Column('Date', ('date', 'DATE'), dtype=str, required=True, date=True),
+    Column('Stock', ('STOCK', 'Symbol', 'SYMBOL', 'Ticker', 'TICKER'), dtype=str, required=True),
+    Column('Open'),
+    Column('High'),
+    Column('Low'),
+    Column('Close', required=True),
+    Column('Volume'),
+)))
+
+FUNDAMENTALS = register(Schema('fundamentals', (
+    Column('symbol', ('SYMBOL', 'Symbol', 'Ticker', 'TICKER'), dtype=str, required=True),
+    Column('trailingPE', ('P/E', 'PE', 'P_E', 'PE_RATIO'), required=True),
+    Column('revenuePerShare'),
+    Column('earningsQuarterlyGrowth'),
+    Column('previousClose'),
+    Column('open'),
+    Column('dayLow'),
+    Column('dayHigh'),
+    Column('volume'),
+    Column('trailingEps'),
+    Column('pegRatio'),
+    Column('ebitda'),
+    Column('totalDebt'),
+    Column('totalRevenue'),
+    Column('debtToEquity'),
+    Column('earningsGrowth'),
+    Column('revenueGrowth'),
+)))
+
+# Dated fundamentals: one row per (symbol, snapshot date)
+FUNDAMENTAL_SNAPSHOTS = register(Schema('fundamental_snapshots', (
+    FUNDAMENTALS['symbol'],
+    Column('date', ('Date', 'DATE', 'asOfDate', 'as_of', 'snapshot_date', 'reportDate'),
+           dtype=str, required=True, date=True),
+) + FUNDAMENTALS.columns[1:]))
+
+DIVIDENDS = register(Schema('dividends', (
+    Column('Date', ('date', 'DATE'), dtype=str, required=True, date=True),
+    Column('Dividends', ('dividends', 'Dividend'), required=True),
+    Column('Stock', ('STOCK', 'Symbol', 'SYMBOL', 'Ticker', 'TICKER'), dtype=str, required=True),
+)))
+
+
+def _is_parquet(path):
+    # Open handles (e.g. zip members) are recognised by their name
+    return str(getattr(path, 'name', path)).endswith(('.parquet', '.pq'))
+
+
+def read_header(path):
+    """
+    Column names of a CSV (first line) or Parquet file (footer), without
+    reading the body. ``path`` may also be an open binary handle, which is
+    rewound afterwards.
+    """
+    if _is_parquet(path):
+        import pyarrow.parquet as pq
+
+        names = pq.read_schema(path).names
+    elif hasattr(path, 'read'):
+        names = next(csv.reader([path.readline().decode('utf-8-sig')]))
+    else:
+        with open(path, newline='') as f:
+            return next(csv.reader(f))
+    if hasattr(path, 'seek'):
+        path.seek(0)
+    return names
+
+
+def resolve(header, schema, columns=None, optional=()):
+    """
+    Map canonical names to (position, source name) in ``header``.
+
+    The first candidate present wins; a repeated header name resolves to
+    its first occurrence. ``columns`` restricts the result to those
+    canonical names (they become required, except any in ``optional``).
+    Raises ValueError listing every missing required column.
+    """
+    wanted = schema.columns if columns is None else tuple(schema[name] for name in columns)
+    position = {}
+    for pos, name in enumerate(header):
+        position.setdefault(name, pos)
+
+    found, missing = {}, []
+    for col in wanted:
+        source = next((n for n in col.names if n in position), None)
+        if source is not None:
+            found[col.name] = (position[source], source)
+        elif (col.required or columns is not None) and col.name not in optional:
+            missing.append(f"{col.name} (tried {', '.join(col.names)})")
+    if missing:
+        raise ValueError(f"{schema.name} file is missing required columns: {'; '.join(missing)}")
+    return found
+
+
+def read_table(path, schema, columns=None, fill=None):
+    """
+    Read only the schema's columns, typed and renamed to canonical names
+    (kept in file order).
+
+    Date columns are parsed to datetimes; everything else gets the schema
+    dtype while parsing, so no second conversion pass is needed. ``fill``
+    maps canonical names to constants for columns the file may lack (e.g.
+    the ticker of a per-ticker file); they are appended after the file's.
+    """
+    fill = fill or {}
+    found = resolve(read_header(path), schema, columns, optional=tuple(fill))
+    rename = {source: name for name, (_, source) in found.items()}
+    dtypes = {source: schema[name].dtype for name, (_, source) in found.items() if not schema[name].date}
+    dates = [source for name, (_, source) in found.items() if schema[name].date]
+
+    if _is_parquet(path):
+        df = pd.read_parquet(path, columns=list(rename))
+        for source, dtype in dtypes.items():
+            col = df[source]
+            # astype(str) would turn missing values into 'nan'; read_csv keeps them missing
+            df[source] = col.astype(str).mask(col.isna()) if dtype is str else col.astype(dtype)
+        for source in dates:
+            df[source] = pd.to_datetime(df[source])
+    else:
+        positions = sorted(pos for pos, _ in found.values())
+        df = pd.read_csv(path, usecols=positions, dtype=dtypes, parse_dates=dates)
+    # Canonical names, in file order
+    df = df.rename(columns=rename)[sorted(found, key=lambda name: found[name][0])]
+    for name, value in fill.items():
+        if name not in found and (columns is None or name in columns):
+            df[name] = value
+    return df
@@ -0,0 +1,217 @@
+"""
+Stories 1.1-1.9 of the starter as pipeline stages.
+
+Each stage is the computation of one starter cell without the printing and
+plotting, returning plain DataFrames/dicts so results can be cached and
+rendered later.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from momentum_value.dividends import TotalReturns, load_dividends
+from momentum_value.factors import COMPOSITES, compute_factors
+from momentum_value.fundamentals import load_fundamentals
+from momentum_value.grid import METHODS, double_sort
+from momentum_value.inference import adjust_pvalues, welch_codes
+from momentum_value.memory import downcast
+from momentum_value.panel import PricePanel
+from momentum_value.pipeline import stage
+from momentum_value.point_in_time import load_snapshots
+from momentum_value.price_cache import load_prices
+from momentum_value.price_stream import stream_prices
+from momentum_value.ranking import quantile_series
+from momentum_value.returns import ReturnEngine
+from momentum_value.risk import RiskModel, quantile_risk
+from momentum_value.tickers import normalize_tickers
+
+
+@stage('prices', params=('price_path', 'momentum_year', 'return_year', 'price_chunksize', 'tickers'),
+       story='1.1', cache=False)
+def load_price_stage(config):
+    """
+    Typed prices for the formation and holding years, from the columnar
+    cache; with ``price_chunksize`` set, streamed from the CSV that many
+    rows at a time instead, keeping only those years and ``tickers``.
+    """
+    if config.price_chunksize:
+        return stream_prices(config.price_path, config, config.price_chunksize, verbose=False)[0]
+    return load_prices(config.price_path, years=config.years)
+
+
+@stage('fundamentals', params=('fundamentals_path', 'lean'), story='1.1', cache=False)
+def load_fundamentals_stage(config):
+    """Deduplicated fundamentals, one row per ticker (float32 ratios when lean)."""
+    frame = load_fundamentals(config.fundamentals_path).frame
+    return downcast(frame, tickers=('symbol', 'listing')) if config.lean else frame
+
+
+@stage('universe', inputs=('prices', 'fundamentals'), params=('tickers',), story='1.2')
+def universe_stage(config, prices, fundamentals):
+    """Prices restricted to tickers present in both datasets."""
+    prices = prices.assign(Stock=normalize_tickers(prices['Stock']))
+    common = set(prices['Stock'].dropna().unique()) & set(fundamentals.index)
+    if config.tickers is not None:
+        common &= set(normalize_tickers(list(config.tickers)))
+    if not common:
+        raise ValueError(
+            "After normalizing tickers, there are 0 common stocks between "
+            "price data and fundamentals."
+        )
+    return prices[prices['Stock'].isin(common)]
+
+
+@stage('factors', inputs=('universe', 'fundamentals'),
+       params=('momentum_year', 'return_year', 'min_trading_days', 'pe_min', 'pe_max',
+               'total_return', 'dividends_path', 'extra_factors', 'fundamentals_history_path'), story='1.3')
+def factor_stage(config, universe, fundamentals):
+    """
+    Momentum, P/E and forward return per stock (the analysis frame);
+    returns include reinvested dividends when ``config.total_return``.
+    With ``config.fundamentals_history_path`` P/E is taken as of the
+    formation date instead of from the current snapshot.
+    """
+    if config.total_return:
+        source = TotalReturns(PricePanel.from_long(universe), load_dividends(config.dividends_path))
+        momentum, forward = (
+            source.period_return(f'{year}-01-01', f'{year}-12-31', config.min_trading_days)
+            for year in (config.momentum_year, config.return_year)
+        )
+    else:
+        engine = ReturnEngine(universe)
+        momentum = engine.annual_returns(config.momentum_year, config.min_trading_days)
+        forward = engine.annual_returns(config.return_year, config.min_trading_days)
+    analysis = pd.DataFrame({'momentum': momentum, 'return': forward})
+    if config.fundamentals_history_path:
+        history = load_snapshots(config.fundamentals_history_path)
+        analysis['pe_ratio'] = history.series('trailingPE', config.formation_date, analysis.index)
+    else:
+        analysis['pe_ratio'] = fundamentals['trailingPE'].reindex(analysis.index)
+    analysis = analysis.dropna()
+
+    keep = analysis['pe_ratio'] > config.pe_min
+    if config.pe_max is not None:
+        keep &= analysis['pe_ratio'] < config.pe_max
+    analysis = analysis[keep]
+    if analysis.empty:
+        raise ValueError("The analysis frame is empty after merging momentum, P/E, and returns.")
+    analysis = analysis[['momentum', 'pe_ratio', 'return']]
+    if config.extra_factors:
+        # Scored within the final universe: composites as <name>_score, factors as <name>_z
+        table = compute_factors(fundamentals, PricePanel.from_long(universe), year=config.momentum_year,
+                                tickers=analysis.index)
+        columns = [f'{n}_score' if n in COMPOSITES else f'{n}_z' for n in config.extra_factors]
+        analysis = analysis.join(table[columns])
+    return analysis
+
+
+@stage('eda', inputs=('factors',), story='1.4')
+def eda_stage(config, factors):
+    """Summary statistics and correlation matrix."""
+    return {'describe': factors.describe(), 'corr': factors.corr()}
+
+
+@stage('distribution', inputs=('factors',), story='1.5')
+def distribution_stage(config, factors):
+    """Moments and Shapiro-Wilk normality test of forward returns."""
+    returns = factors['return']
+    out = {
+        'mean': returns.mean(),
+        'variance': returns.var(),
+        'std': returns.std(),
+        'skew': stats.skew(returns),
+        'kurtosis': stats.kurtosis(returns),
+        'shapiro_stat': np.nan,
+        'shapiro_p': np.nan,
+    }
+    if len(returns) >= 3:
+        out['shapiro_stat'], out['shapiro_p'] = stats.shapiro(returns)
+    return out
+
+
+@stage('portfolios', inputs=('factors',), params=('n_quantiles',), story='1.6')
+def portfolio_stage(config, factors):
+    """Quantile membership and per-quantile return statistics."""
+    n = config.n_quantiles
+    members = pd.DataFrame({
+        'momentum_q': quantile_series(factors['momentum'], n),
+        'value_q': quantile_series(factors['pe_ratio'], n),
+        'return': factors['return'],
+    })
+    return {
+        'members': members,
+        'momentum': members.groupby('momentum_q')['return'].agg(['mean', 'std', 'count']),
+        'value': members.groupby('value_q')['return'].agg(['mean', 'std', 'count']),
+    }
+
+
+@stage('double_sort', inputs=('factors',), params=('n_quantiles',), story='1.6')
+def double_sort_stage(config, factors):
+    """Joint momentum x value grids, independent and conditional on momentum."""
+    n = config.n_quantiles
+    return {
+        method: double_sort(factors['momentum'], factors['pe_ratio'], factors['return'], n, n, method,
+                            names=('momentum', 'value'))
+        for method in METHODS
+    }
+
+
+@stage('risk', inputs=('universe', 'portfolios'), params=('return_year', 'n_quantiles'), story='1.8')
+def risk_stage(config, universe, portfolios):
+    """
+    Return-year risk of every ticker and of each quantile portfolio:
+    volatility, Sharpe, Sortino, max drawdown and beta to the equal-weight
+    market of the universe (price returns).
+    """
+    panel = PricePanel.from_long(universe).year(config.return_year)
+    members = portfolios['members']
+    return {
+        'tickers': RiskModel.from_panel(panel).summary(),
+        'momentum': quantile_risk(panel, members['momentum_q'], config.n_quantiles),
+        'value': quantile_risk(panel, members['value_q'], config.n_quantiles),
+    }
+
+
+@stage('tests', inputs=('portfolios',), params=('n_quantiles',), story='1.7')
+def test_stage(config, portfolios):
+    """
+    Welch t-tests of the extreme quantiles (momentum Qn-Q1, value Q1-Qn) in
+    one batched call, with Cohen's d, 95% CIs and Holm-adjusted p-values.
+    """
+    members = portfolios['members']
+    top = config.n_quantiles - 1
+    codes = members[['momentum_q', 'value_q']].to_numpy().T
+    returns = np.broadcast_to(members['return'].to_numpy(dtype=np.float64), codes.shape)
+    table = pd.DataFrame(welch_codes(returns, codes, config.n_quantiles, long_q=[top, 0], short_q=[0, top]),
+                         index=['momentum', 'value'])
+    table['p_holm'] = adjust_pvalues(table['p_value'].to_numpy(), 'holm')
+    return table
+
+
+@stage('spreads', inputs=('portfolios',), story='1.8')
+def spread_stage(config, portfolios):
+    """Factor spreads from the quantile means."""
+    momentum_means = portfolios['momentum']['mean']
+    value_means = portfolios['value']['mean']
+    return {
+        'momentum': momentum_means.iloc[-1] - momentum_means.iloc[0],
+        'value': value_means.iloc[0] - value_means.iloc[-1],
+    }
+
+
+@stage('conclusions', inputs=('factors', 'distribution', 'tests', 'spreads'), story='1.9')
+def conclusion_stage(config, factors, distribution, tests, spreads):
+    """Headline numbers of the final report."""
+    stronger = 'Momentum' if abs(spreads['momentum']) > abs(spreads['value']) else 'Value'
+    return {
+        'n_stocks': len(factors),
+        'mean_return': distribution['mean'],
+        'std_return': distribution['std'],
+        'normal': bool(distribution['shapiro_p'] > 0.05) if np.isfinite(distribution['shapiro_p']) else None,
+        'momentum_spread': spreads['momentum'],
+        'value_spread': spreads['value'],
+        'momentum_p': tests.loc['momentum', 'p_value'],
+        'value_p': tests.loc['value', 'p_value'],
+        'stronger_factor': stronger,
+    }
@@ -0,0 +1,139 @@
+"""
+Parameter sweeps over the momentum and value quantile spreads.
+
+One call evaluates a grid of momentum lookbacks ('calendar' for the
+starter's calendar-year return, or a number of trailing months), quantile
+counts and P/E caps. The price panel, P/E vector and forward returns are
+built once in the parent; workers are forked after they are set as module
+globals, so every process reads the same arrays without pickling or
+copying them.
+
+Usage:
+    table = sweep(lookbacks=('calendar', 6, 12), n_quantiles=(5, 10), pe_max=(100, 60))
+"""
+
+import itertools
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.config import AnalysisConfig
+from momentum_value.dividends import TotalReturns, load_dividends
+from momentum_value.fundamentals import load_fundamentals
+from momentum_value.inference import adjust_pvalues, welch_codes
+from momentum_value.panel import PricePanel
+from momentum_value.point_in_time import load_snapshots
+from momentum_value.price_cache import load_prices
+from momentum_value.ranking import quantile_codes
+from momentum_value.tickers import normalize_tickers
+
+
+# Set in the parent before the pool starts; forked workers inherit it
+_STATE = {}
+
+
+def _set_state(state):
+    _STATE.clear()
+    _STATE.update(state)
+
+
+def _calendar_return(source, year, min_days):
+    return source.period_return(f'{year}-01-01', f'{year}-12-31', min_days).to_numpy(dtype=np.float64)
+
+
+def _momentum(lookback):
+    source, config = _STATE['source'], _STATE['config']
+    if lookback == 'calendar':
+        return _calendar_return(source, config.momentum_year, config.min_trading_days)
+    as_of = f'{config.momentum_year}-12-31'
+    return source.lookback_return(as_of, int(lookback)).to_numpy(dtype=np.float64)
+
+
+def _evaluate(params):
+    """Spreads and Welch t-tests for one (lookback, n_quantiles, pe_max)."""
+    lookback, n, pe_max = params
+    config, pe, forward = _STATE['config'], _STATE['pe'], _STATE['forward']
+    momentum = _momentum(lookback)
+
+    keep = np.isfinite(momentum) & np.isfinite(pe) & np.isfinite(forward) & (pe > config.pe_min)
+    if pe_max is not None:
+        keep &= pe < pe_max
+    codes = quantile_codes(np.stack([momentum[keep], pe[keep]]), n)
+    returns = np.broadcast_to(forward[keep], codes.shape)
+    # Momentum: top minus bottom quantile; value: cheapest (low P/E) minus dearest
+    tests = welch_codes(returns, codes, n, long_q=[n - 1, 0], short_q=[0, n - 1])
+
+    row = {'lookback': str(lookback), 'n_quantiles': n, 'pe_max': pe_max, 'n_stocks': int(keep.sum())}
+    for i, name in enumerate(('momentum', 'value')):
+        row[f'{name}_spread'] = tests['mean_diff'][i]
+        row[f'{name}_t'] = tests['t_stat'][i]
+        row[f'{name}_p'] = tests['p_value'][i]
+    return row
+
+
+def _first_year(config, lookbacks):
+    months = [int(lb) for lb in lookbacks if lb != 'calendar']
+    return config.momentum_year - math.ceil(max(months, default=0) / 12)
+
+
+def build_state(config, lookbacks):
+    """
+    Return source (the panel, or its TotalReturns view when
+    ``config.total_return``), aligned P/E and forward returns.
+    """
+    years = list(range(_first_year(config, lookbacks), config.return_year + 1))
+    prices = load_prices(config.price_path, years=years)
+    prices['Stock'] = normalize_tickers(prices['Stock'])
+    panel = PricePanel.from_long(prices)
+    del prices
+
+    if config.fundamentals_history_path:
+        # As known at the formation date, not today's snapshot
+        history = load_snapshots(config.fundamentals_history_path)
+        pe = history.as_of('trailingPE', [config.formation_date], panel.ids)[0]
+    else:
+        pe = load_fundamentals(config.fundamentals_path).column('trailingPE', panel.ids)
+    if config.tickers is not None:
+        wanted = set(normalize_tickers(list(config.tickers)))
+        pe = np.where(panel.tickers.isin(wanted), pe, np.nan)
+    source = TotalReturns(panel, load_dividends(config.dividends_path)) if config.total_return else panel
+    forward = _calendar_return(source, config.return_year, config.min_trading_days)
+    return {'config': config, 'source': source, 'pe': pe, 'forward': forward}
+
+
+def sweep(config=None, lookbacks=('calendar',), n_quantiles=(5,), pe_max=(100,), workers=None):
+    """
+    Tidy table with one row per parameter combination: stock count, then
+    spread, Welch t-stat and p-value for momentum and value, plus
+    Benjamini-Hochberg adjusted p-values across the grid.
+
+    ``config`` supplies paths, years, ``pe_min``, ``min_trading_days`` and
+    ``total_return``;
+    ``pe_max`` entries may be None for no cap.
+    """
+    config = config or AnalysisConfig()
+    grid = list(itertools.product(lookbacks, n_quantiles, pe_max))
+    _set_state(build_state(config, lookbacks))
+
+    workers = min(workers or os.cpu_count() or 1, len(grid))
+    try:
+        if workers <= 1:
+            rows = [_evaluate(params) for params in grid]
+        elif 'fork' in multiprocessing.get_all_start_methods():
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('fork')) as pool:
+                rows = list(pool.map(_evaluate, grid))
+        else:
+            # No fork (Windows): each worker receives one copy of the state
+            with ProcessPoolExecutor(workers, initializer=_set_state, initargs=(dict(_STATE),)) as pool:
+                rows = list(pool.map(_evaluate, grid))
+    finally:
+        _STATE.clear()
+    table = pd.DataFrame(rows)
+    # Every grid point is a separate test: control the false discovery rate
+    for name in ('momentum', 'value'):
+        table[f'{name}_p_bh'] = adjust_pvalues(table[f'{name}_p'].to_numpy(), 'bh')
+    return table
@@ -0,0 +1,146 @@
+"""
+Shared ticker normalization and an interned ticker -> id table.
+
+Price data uses bare symbols ('RELIANCE') while fundamentals carry exchange
+suffixes ('RELIANCE.NS', 'RELIANCE.BO'). Every dataset goes through
+normalize_tickers so they agree on what a ticker is, and through a
+SymbolTable so they can be joined on small integer ids.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+
+EXCHANGE_SUFFIXES = ['.NS', '.NSE', '.BSE', '.BO']
+SERIES_SUFFIXES = ['-EQ', '-BE', '-BL', '-BZ']
+
+
+@lru_cache(maxsize=None)
+def normalize_ticker(s):
+    """
+    Put all tickers into a common, clean format so that
+    price_data and fundamentals can be matched.
+    Suffixes are stripped until none is left, so the result is a fixed
+    point: normalize_ticker(normalize_ticker(s)) == normalize_ticker(s).
+    Examples:
+    - 'ADANIPORTS.NS' -> 'ADANIPORTS'
+    - 'SBIN-EQ'       -> 'SBIN'
+    - 'SBIN.NS-EQ'    -> 'SBIN'
+    """
+    s = str(s).upper().strip()
+
+    while True:
+        before = s
+        # Remove common exchange and series suffixes, in either order
+        for suffix in EXCHANGE_SUFFIXES + SERIES_SUFFIXES:
+            if s.endswith(suffix):
+                s = s[: -len(suffix)]
+        # Extra cleanup of stray spaces
+        s = s.strip()
+        if s == before:
+            return s
+
+
+def _normalized_codes(values, clean=False):
+    """
+    Factorize ``values`` and normalize each distinct ticker once (``clean``
+    skips normalizing, for names that already are).
+
+    Returns (codes, uniques): codes index into the normalized uniques and
+    are -1 for missing tickers.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        raw_codes = values.cat.codes.to_numpy()
+        raw_uniques = values.cat.categories
+    else:
+        raw_codes, raw_uniques = pd.factorize(values)
+    if clean:
+        return raw_codes, pd.Index(np.asarray(raw_uniques, dtype=object), dtype=object)
+
+    cleaned = [normalize_ticker(u) for u in raw_uniques]
+    # Several raw tickers can collapse to one ('X.NS', 'X.BO' -> 'X')
+    merged, uniques = pd.factorize(pd.Index(cleaned, dtype=object))
+    codes = np.where(raw_codes >= 0, merged[raw_codes] if len(merged) else -1, -1)
+    return codes, uniques
+
+
+def normalize_tickers(values):
+    """
+    Vectorized normalize_ticker for a whole column.
+
+    Runs once per distinct ticker and maps the result back, so cost scales
+    with the number of symbols, not rows. Categorical input stays
+    categorical; missing values stay missing.
+    """
+    values = values if isinstance(values, pd.Series) else pd.Series(values)
+    codes, uniques = _normalized_codes(values)
+
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        out = pd.Categorical.from_codes(codes, categories=uniques)
+    else:
+        lookup = np.append(np.asarray(uniques, dtype=object), np.nan)
+        out = lookup[codes]
+    return pd.Series(out, index=values.index, name=values.name)
+
+
+class SymbolTable:
+    """
+    Interned ticker -> int id table.
+
+    Ids are dense (0..n-1) and stable for the life of the table, so arrays
+    can be indexed by id and datasets joined on int columns. ``clean=True``
+    interns ``tickers`` as given: for names that are already normalized
+    (a panel's ticker axis, a saved table), so the ids follow their order.
+    """
+
+    def __init__(self, tickers=(), clean=False):
+        self._ids = {}
+        self.tickers = []
+        for ticker in tickers:
+            self.intern(ticker, clean)
+
+    def __len__(self):
+        return len(self.tickers)
+
+    def __contains__(self, ticker):
+        return normalize_ticker(ticker) in self._ids
+
+    def intern(self, ticker, clean=False):
+        """Id of a (normalized) ticker, adding it if unseen."""
+        ticker = ticker if clean else normalize_ticker(ticker)
+        tid = self._ids.get(ticker)
+        if tid is None:
+            tid = self._ids[ticker] = len(self.tickers)
+            self.tickers.append(ticker)
+        return tid
+
+    def id_of(self, ticker):
+        """Id of a ticker, or -1 if it is not in the table."""
+        return self._ids.get(normalize_ticker(ticker), -1)
+
+    def encode(self, values, add=True, clean=False):
+        """
+        int32 ids for a column of raw tickers (-1 for missing or, when
+        ``add`` is False, unknown tickers). ``clean=True`` takes the values
+        as already normalized.
+        """
+        values = values if isinstance(values, pd.Series) else pd.Series(values)
+        codes, uniques = _normalized_codes(values, clean)
+        if add:
+            ids = [self.intern(u, clean=True) for u in uniques]
+        else:
+            ids = [self._ids.get(u, -1) for u in uniques]
+        ids = np.array(ids + [-1], dtype=np.int32)
+        return ids[codes]
+
+    def decode(self, ids):
+        """Tickers for an array of ids (None for -1)."""
+        names = np.append(np.asarray(self.tickers, dtype=object), None)
+        ids = np.asarray(ids)
+        return names[np.where(ids >= 0, ids, len(self.tickers))]
+
+
+# Process-wide table shared by the price and fundamentals loaders
+SYMBOLS = SymbolTable()
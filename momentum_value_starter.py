@@ -28,6 +28,19 @@ import seaborn as sns
 from scipy import stats
 import warnings
 
+from momentum_value.fundamentals import load_fundamentals
+from momentum_value.grid import double_sort
+from momentum_value.inference import welch_table
+from momentum_value.memory import LEAN, MEMORY, downcast
+from momentum_value.panel import PricePanel
+from momentum_value.price_cache import load_prices
+from momentum_value.profiling import PROFILER
+from momentum_value.ranking import quantile_series
+from momentum_value.resampling import spread_test
+from momentum_value.returns import ReturnEngine
+from momentum_value.risk import quantile_risk
+from momentum_value.tickers import normalize_tickers
+
 warnings.filterwarnings('ignore')
 
 # Set style and random seed for reproducibility
@@ -37,129 +50,70 @@ np.random.seed(42)
 print("Libraries imported successfully!")
 
 
-# Helper: normalize tickers so price & fundamentals match
-def normalize_ticker(s):
-    """
-    Put all tickers into a common, clean format so that
-    price_data and fundamentals can be matched.
-    Examples:
-    - 'ADANIPORTS.NS' -> 'ADANIPORTS'
-    - 'SBIN-EQ'       -> 'SBIN'
-    """
-    s = str(s).upper().strip()
-
-    # Remove common exchange suffixes
-    for suffix in ['.NS', '.NSE', '.BSE', '.BO']:
-        if s.endswith(suffix):
-            s = s[: -len(suffix)]
-
-    # Remove common series suffixes
-    for suffix in ['-EQ', '-BE', '-BL', '-BZ']:
-        if s.endswith(suffix):
-            s = s[: -len(suffix)]
-
-    # Extra cleanup of stray spaces
-    s = s.strip()
-    return s
-
-
 # %% [markdown]
 # ### Load the Kaggle Datasets
 # 1. Indian Stock Market Data 2015–2024 (Neeraj Vantagudi)
 # 2. BSE,NSE STOCK FUNDAMENTALS RATIOS
 
 # %%
+PROFILER.lap('Story 1.1: load prices')
 # Load price data
 # ✅ Replace with your actual file path if different
-price_data = pd.read_csv('Datasets/stock_price_dataset/Stock_Data.csv')
-print(f"Price data shape (raw): {price_data.shape}")
-print(f"Price data columns (raw): {price_data.columns.tolist()}")
+# The CSV is parsed once into a year-partitioned columnar cache (.cache/);
+# later runs memory-map only the 2023 and 2024 partitions. The prices schema
+# maps Date/Stock spellings (date, Symbol, Ticker, ...) to canonical names.
+price_data = load_prices('Datasets/stock_price_dataset/Stock_Data.csv', years=[2023, 2024])
+print(f"Price data shape (2023-2024 partitions): {price_data.shape}")
+print(f"Price data columns: {price_data.columns.tolist()}")
 print(price_data.head())
-
-# Ensure we have a consistent Date column name
-date_candidates = ['Date', 'date', 'DATE']
-date_col = None
-for c in date_candidates:
-    if c in price_data.columns:
-        date_col = c
-        break
-if date_col is None:
-    raise ValueError("Could not find a date column in price_data.")
-if date_col != 'Date':
-    price_data.rename(columns={date_col: 'Date'}, inplace=True)
-
-# Ensure we have a consistent stock identifier column in price data
-price_stock_candidates = ['Stock', 'STOCK', 'Symbol', 'SYMBOL', 'Ticker', 'TICKER']
-price_stock_col = None
-for c in price_stock_candidates:
-    if c in price_data.columns:
-        price_stock_col = c
-        break
-if price_stock_col is None:
-    raise ValueError("Could not find a stock identifier column in price_data.")
-if price_stock_col != 'Stock':
-    price_data.rename(columns={price_stock_col: 'Stock'}, inplace=True)
-
-print(f"Price data columns (after renaming): {price_data.columns.tolist()}")
+PROFILER.end(rows_out=len(price_data))
+MEMORY.lap('Story 1.1: load prices', globals())
 
 
 # %%
+PROFILER.lap('Story 1.1: load fundamentals')
 # Load fundamentals data
 # ✅ Replace with your actual file path if different
-fundamentals = pd.read_csv('Datasets/FUNDAMENTALratios.csv')
-print(f"Fundamentals shape (raw): {fundamentals.shape}")
-print(f"Fundamentals columns (raw): {fundamentals.columns.tolist()}")
+# Parsed through the fundamentals schema (symbol/SYMBOL/Ticker,
+# trailingPE/P/E/PE, ...) and deduplicated: companies listed on both NSE and
+# BSE keep only their primary (higher-volume) listing, indexed by the
+# normalized ticker. The cleaned table is cached next to the price cache.
+fundamentals = load_fundamentals('Datasets/FUNDAMENTALratios.csv').frame
+print(f"Fundamentals shape: {fundamentals.shape}")
+print(f"Fundamentals columns: {fundamentals.columns.tolist()}")
 print(fundamentals.head())
 
-# Ensure we have a consistent stock identifier column in fundamentals
-fund_stock_candidates = ['symbol', 'SYMBOL', 'Symbol', 'Ticker', 'TICKER']
-fund_symbol_col = None
-for c in fund_stock_candidates:
-    if c in fundamentals.columns:
-        fund_symbol_col = c
-        break
-if fund_symbol_col is None:
-    raise ValueError("Could not find a stock identifier column in fundamentals.")
-if fund_symbol_col != 'symbol':
-    fundamentals.rename(columns={fund_symbol_col: 'symbol'}, inplace=True)
-
-# Ensure we have a P/E column (value factor)
-pe_candidates = ['trailingPE', 'P/E', 'PE', 'P_E', 'PE_RATIO']
-pe_col = None
-for c in pe_candidates:
-    if c in fundamentals.columns:
-        pe_col = c
-        break
-if pe_col is None:
-    raise ValueError("Could not find a P/E-related column in fundamentals.")
-if pe_col != 'trailingPE':
-    fundamentals.rename(columns={pe_col: 'trailingPE'}, inplace=True)
-
-print(f"Fundamentals columns (after renaming): {fundamentals.columns.tolist()}")
+if LEAN:
+    # Memory-lean mode (MOMENTUM_VALUE_LEAN=1): float32 ratios, categorical symbols
+    fundamentals = downcast(fundamentals, tickers=('symbol', 'listing'))
+PROFILER.end(rows_out=len(fundamentals))
+MEMORY.lap('Story 1.1: load fundamentals', globals())
 
 # %% [markdown]
 # ## Story 1.2: Data Cleaning and Integration (20 mins)
 # Filter to 2023-2024 period and merge datasets
 
 # %%
+PROFILER.lap('Story 1.2: clean and merge', rows_in=len(price_data))
 # Convert date column to datetime
 price_data['Date'] = pd.to_datetime(price_data['Date'])
 
 # Filter to 2023-2024 period
-price_filtered = price_data[price_data['Date'].dt.year.isin([2023, 2024])].copy()
+price_filtered = price_data[price_data['Date'].dt.year.isin([2023, 2024])]
 print(f"Filtered price data: {price_filtered.shape}")
 if not price_filtered.empty:
     print(f"Date range: {price_filtered['Date'].min()} to {price_filtered['Date'].max()}")
 else:
     print("WARNING: No rows found for years 2023 or 2024 in price data.")
 
-# Normalize tickers in BOTH datasets so they live in the same space
-price_filtered['Stock'] = price_filtered['Stock'].apply(normalize_ticker)
-fundamentals['symbol'] = fundamentals['symbol'].apply(normalize_ticker)
+# Normalize price tickers into the same space as the fundamentals index
+# (normalize_ticker runs once per distinct symbol, not once per row); assign
+# builds a new frame, so nothing is written into a slice of price_data
+price_filtered = price_filtered.assign(Stock=normalize_tickers(price_filtered['Stock']))
 
 # Check for matching stocks between datasets
 price_stocks = price_filtered['Stock'].dropna().unique()
-fundamental_stocks = fundamentals['symbol'].dropna().unique()
+fundamental_stocks = fundamentals.index.unique()
 
 common_stocks = set(price_stocks) & set(fundamental_stocks)
 
@@ -181,47 +135,47 @@ if len(common_stocks) == 0:
 
 # Filter to common stocks
 price_filtered = price_filtered[price_filtered['Stock'].isin(common_stocks)]
-fundamentals_filtered = fundamentals[fundamentals['symbol'].isin(common_stocks)].copy()
+fundamentals_filtered = fundamentals[fundamentals.index.isin(common_stocks)]
+PROFILER.end(rows_out=len(price_filtered))
+
+if LEAN:
+    # Only the filtered tables are used from here on
+    del price_data, fundamentals
+MEMORY.lap('Story 1.2: clean and merge', globals())
 
 # %% [markdown]
 # ## Story 1.3: Factor Calculation (20 mins)
 # Calculate momentum (2023) and extract value metrics
 
 # %%
+PROFILER.lap('Story 1.3: momentum', rows_in=len(price_filtered))
 # Calculate 2023 momentum for each stock
 def calculate_momentum(df, year=2023):
     """Calculate momentum as (end_price - start_price) / start_price"""
-    year_data = df[df['Date'].dt.year == year].copy()
-
-    momentum_dict = {}
-    for stock in year_data['Stock'].unique():
-        stock_data = year_data[year_data['Stock'] == stock].sort_values('Date')
-        if len(stock_data) > 0:
-            # Use first and last available prices
-            start_price = stock_data['Close'].iloc[0]
-            end_price = stock_data['Close'].iloc[-1]
-            if start_price != 0:
-                momentum = (end_price - start_price) / start_price
-                momentum_dict[stock] = momentum
-
-    return pd.DataFrame.from_dict(momentum_dict, orient='index', columns=['momentum_2023'])
+    # Sort-once engine: first/last close per stock without a per-stock loop
+    momentum = ReturnEngine(df).annual_returns(year)
+    return momentum.to_frame('momentum_2023')
 
 
 momentum_df = calculate_momentum(price_filtered, 2023)
 print(f"Calculated momentum for {len(momentum_df)} stocks")
 print(momentum_df.describe())
+PROFILER.end(rows_out=len(momentum_df))
 
 # %%
+PROFILER.lap('Story 1.3: returns and P/E join', rows_in=len(price_filtered))
 # Calculate 2024 returns
 returns_2024 = calculate_momentum(price_filtered, 2024)
 returns_2024.columns = ['return_2024']
 
 print(f"Calculated 2024 returns for {len(returns_2024)} stocks")
 
-# Extract P/E ratios from fundamentals (value factor)
-pe_data = fundamentals_filtered[['symbol', 'trailingPE']].copy()
-pe_data.columns = ['Stock', 'pe_ratio_2023']
-pe_data = pe_data.set_index('Stock')
+# Extract P/E ratios from fundamentals (value factor). Note: trailingPE is the
+# file's single current snapshot, not a reading from end-2023; with dated
+# snapshots, point_in_time.load_snapshots gives P/E as of the formation date.
+# One row per company, so the join below cannot duplicate stocks
+pe_data = fundamentals_filtered[['trailingPE']].rename(columns={'trailingPE': 'pe_ratio_2023'})
+pe_data.index.name = 'Stock'
 
 # Combine all factors
 analysis_df = momentum_df.join(pe_data).join(returns_2024)
@@ -241,16 +195,20 @@ if analysis_df.empty:
         "- P/E missing or non-positive for all common stocks\n"
         "- Path / file mismatch. Re-check your CSVs."
     )
+PROFILER.end(rows_out=len(analysis_df))
+MEMORY.lap('Story 1.3: factors', globals())
 
 # %% [markdown]
 # ## Story 1.4: Exploratory Data Analysis (15 mins)
 
 # %%
+PROFILER.lap('Story 1.4: summary statistics', rows_in=len(analysis_df))
 # Summary statistics
 print("=== Summary Statistics (Descriptive Analysis) ===")
 print(analysis_df.describe())
 
 # %%
+PROFILER.lap('Story 1.4: plots')
 # Create visualizations
 fig, axes = plt.subplots(2, 3, figsize=(15, 8))
 
@@ -290,6 +248,7 @@ plt.show()
 # ## Story 1.5: Probability Modeling (15 mins)
 
 # %%
+PROFILER.lap('Story 1.5: moments')
 # Model returns as random variables
 returns = analysis_df['return_2024']
 
@@ -301,6 +260,7 @@ print(f"Skewness: {stats.skew(returns):.4f}")
 print(f"Kurtosis: {stats.kurtosis(returns):.4f}")
 
 # %%
+PROFILER.lap('Story 1.5: normality plots and test')
 # Test for normality and visualize
 fig, axes = plt.subplots(1, 2, figsize=(12, 5))
 
@@ -339,19 +299,20 @@ else:
 # ## Story 1.6: Portfolio Construction (20 mins)
 
 # %%
+PROFILER.lap('Story 1.6: quintile portfolios', rows_in=len(analysis_df))
 # Create quintile portfolios
-analysis_df['momentum_quintile'] = pd.qcut(
+# Same edges as pd.qcut, but tied values (common for P/E) are split in a
+# fixed order instead of collapsing quintiles, so all five labels exist
+analysis_df['momentum_quintile'] = quantile_series(
     analysis_df['momentum_2023'],
-    q=5,
+    5,
     labels=['Q1_Low', 'Q2', 'Q3', 'Q4', 'Q5_High'],
-    duplicates='drop'   # avoid bin edge duplication error
 )
 
-analysis_df['value_quintile'] = pd.qcut(
+analysis_df['value_quintile'] = quantile_series(
     analysis_df['pe_ratio_2023'],
-    q=5,
+    5,
     labels=['Q1_Value', 'Q2', 'Q3', 'Q4', 'Q5_Growth'],
-    duplicates='drop'
 )
 
 # Calculate portfolio statistics
@@ -367,45 +328,68 @@ value_portfolios = analysis_df.groupby('value_quintile')['return_2024'].agg([
 print("\n=== Value Portfolio Returns ===")
 print(value_portfolios)
 
+# Joint momentum x value grid: independent sorts, and value sorted within
+# each momentum quintile (conditional), to see interaction effects
+for method in ('independent', 'conditional'):
+    grid = double_sort(analysis_df['momentum_2023'], analysis_df['pe_ratio_2023'], analysis_df['return_2024'],
+                       method=method, names=('Mom', 'PE'))
+    print(f"\n=== Momentum x Value Grid ({method}): mean 2024 return ===")
+    print(grid.table('mean').round(4))
+PROFILER.end(rows_out=len(analysis_df))
+MEMORY.lap('Story 1.6: quintile portfolios', globals())
+
 # %% [markdown]
 # ## Story 1.7: Hypothesis Testing (20 mins)
 
 # %%
+PROFILER.lap('Story 1.7: t-tests')
 print("=== Hypothesis Testing Framework (Statistical Inference) ===\n")
 
-# Momentum hypothesis test
-print("MOMENTUM FACTOR TEST:")
-print("H0: μ(High Momentum) = μ(Low Momentum)")
-print("H1: μ(High Momentum) > μ(Low Momentum)\n")
-
 high_momentum = analysis_df[analysis_df['momentum_quintile'] == 'Q5_High']['return_2024']
 low_momentum = analysis_df[analysis_df['momentum_quintile'] == 'Q1_Low']['return_2024']
-
-# Perform t-test
-t_stat_mom, p_value_mom = stats.ttest_ind(high_momentum, low_momentum, equal_var=False, nan_policy='omit')
-print(f"T-statistic: {t_stat_mom:.4f}")
-print(f"P-value: {p_value_mom:.4f}")
-print(f"Mean difference: {high_momentum.mean() - low_momentum.mean():.4f}")
-print(f"Conclusion: {'Reject H0' if p_value_mom < 0.05 else 'Fail to reject H0'}\n")
-
-# Value hypothesis test
-print("VALUE FACTOR TEST:")
-print("H0: μ(Value stocks) = μ(Expensive stocks)")
-print("H1: μ(Value stocks) > μ(Expensive stocks)\n")
-
 value_stocks = analysis_df[analysis_df['value_quintile'] == 'Q1_Value']['return_2024']
 expensive_stocks = analysis_df[analysis_df['value_quintile'] == 'Q5_Growth']['return_2024']
 
-t_stat_val, p_value_val = stats.ttest_ind(value_stocks, expensive_stocks, equal_var=False, nan_policy='omit')
-print(f"T-statistic: {t_stat_val:.4f}")
-print(f"P-value: {p_value_val:.4f}")
-print(f"Mean difference: {value_stocks.mean() - expensive_stocks.mean():.4f}")
-print(f"Conclusion: {'Reject H0' if p_value_val < 0.05 else 'Fail to reject H0'}")
+# Both Welch t-tests in one batched call, with Cohen's d, 95% CIs and
+# Holm-adjusted p-values (two factors tested at once)
+tests = welch_table({'momentum': (high_momentum.dropna(), low_momentum.dropna()),
+                     'value': (value_stocks.dropna(), expensive_stocks.dropna())})
+t_stat_mom, p_value_mom, p_adj_mom = tests.loc['momentum', ['t_stat', 'p_value', 'p_adj']]
+t_stat_val, p_value_val, p_adj_val = tests.loc['value', ['t_stat', 'p_value', 'p_adj']]
+
+for name, title, h0, h1 in [
+    ('momentum', 'MOMENTUM FACTOR TEST', 'μ(High Momentum) = μ(Low Momentum)', 'μ(High Momentum) > μ(Low Momentum)'),
+    ('value', 'VALUE FACTOR TEST', 'μ(Value stocks) = μ(Expensive stocks)', 'μ(Value stocks) > μ(Expensive stocks)'),
+]:
+    row = tests.loc[name]
+    print(f"{title}:")
+    print(f"H0: {h0}")
+    print(f"H1: {h1}\n")
+    print(f"T-statistic: {row['t_stat']:.4f}")
+    print(f"P-value: {row['p_value']:.4f} (Holm-adjusted: {row['p_adj']:.4f})")
+    print(f"Mean difference: {row['mean_diff']:.4f}, 95% CI=[{row['ci_low']:.4f}, {row['ci_high']:.4f}]")
+    print(f"Effect size (Cohen's d): {row['cohen_d']:.4f}")
+    # Two factors are tested at once, so significance is judged on the Holm-adjusted p-value
+    print(f"Conclusion: {'Reject H0' if row['p_adj'] < 0.05 else 'Fail to reject H0'} (Holm-adjusted)\n")
+
+# %%
+PROFILER.lap('Story 1.7: resampling tests')
+# Robustness: returns are non-normal (see Shapiro-Wilk above), so repeat both
+# tests with resampling, which makes no normality assumption.
+# (workers=1 keeps this cell safe to run as a plain script on any platform)
+print("\n=== Resampling Tests (bootstrap CI, permutation p-value) ===")
+for name, a, b in [('Momentum Q5-Q1', high_momentum, low_momentum),
+                   ('Value Q1-Q5', value_stocks, expensive_stocks)]:
+    res = spread_test(a, b, n_resamples=10_000, alternative='greater', workers=1)
+    print(f"{name}: spread={res['spread']:.4f}, "
+          f"95% CI=[{res['ci_low']:.4f}, {res['ci_high']:.4f}], "
+          f"permutation p={res['p_value']:.4f}")
 
 # %% [markdown]
 # ## Story 1.8: Results Visualization (15 mins)
 
 # %%
+PROFILER.lap('Story 1.8: plots')
 # Create comparison visualizations
 fig, axes = plt.subplots(1, 2, figsize=(14, 6))
 
@@ -443,10 +427,21 @@ print(f"Momentum Factor Spread (Q5-Q1): {momentum_spread:.4f}")
 print(f"Value Factor Spread (Q1-Q5): {value_spread:.4f}")
 print(f"Stronger Factor: {'Momentum' if abs(momentum_spread) > abs(value_spread) else 'Value'}")
 
+# %%
+PROFILER.lap('Story 1.8: risk-adjusted returns')
+# Risk-adjusted view of the quintile portfolios over 2024: daily
+# equal-weight returns, beta to the equal-weight market of common stocks
+panel_2024 = PricePanel.from_long(price_filtered[price_filtered['Stock'].isin(common_stocks)]).year(2024)
+for name, col in [('Momentum', 'momentum_quintile'), ('Value', 'value_quintile')]:
+    print(f"\n=== {name} Quintile Risk (2024 daily returns) ===")
+    print(quantile_risk(panel_2024, analysis_df[col]).round(4))
+MEMORY.lap('Story 1.8: risk-adjusted returns', globals())
+
 # %% [markdown]
 # ## Story 1.9: Final Conclusions (10 mins)
 
 # %%
+PROFILER.lap('Story 1.9: report')
 print("=== FINAL REPORT: Momentum vs Value Factor Performance ===\n")
 
 print("1. DATA ANALYSIS:")
@@ -467,8 +462,10 @@ print("3. STATISTICAL INFERENCE:")
 print(f"   - Momentum factor spread: {momentum_spread:.4f}")
 print(f"   - Value factor spread: {value_spread:.4f}")
 print(f"   - Statistical significance:")
-print(f"     * Momentum: {'Significant' if p_value_mom < 0.05 else 'Not significant'} (p={p_value_mom:.4f})")
-print(f"     * Value: {'Significant' if p_value_val < 0.05 else 'Not significant'} (p={p_value_val:.4f})\n")
+print(f"     * Momentum: {'Significant' if p_adj_mom < 0.05 else 'Not significant'} "
+      f"(p={p_value_mom:.4f}, Holm-adjusted p={p_adj_mom:.4f})")
+print(f"     * Value: {'Significant' if p_adj_val < 0.05 else 'Not significant'} "
+      f"(p={p_value_val:.4f}, Holm-adjusted p={p_adj_val:.4f})\n")
 
 print("4. CONCLUSION:")
 if abs(momentum_spread) > abs(value_spread):
@@ -486,4 +483,9 @@ print("\n6. FUTURE RESEARCH:")
 print("   - Multi-year analysis")
 print("   - Cross-market comparison")
 print("   - Additional factors (Quality, Low Volatility)")
-print("   - Risk-adjusted returns analysis")
\ No newline at end of file
+
+# Live-table footprint (only when MOMENTUM_VALUE_LEAN is set)
+MEMORY.report()
+
+# Stage timings (only when MOMENTUM_VALUE_PROFILE is set)
+PROFILER.report()
\ No newline at end of file
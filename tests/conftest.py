@@ -0,0 +1,30 @@
+"""Shared fixtures: small synthetic price and fundamentals data."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.panel import PricePanel
+
+
+TICKERS = ['AAA', 'BBB', 'CCC', 'DDD', 'EEE', 'FFF']
+
+
+@pytest.fixture
+def long_prices():
+    """Long (Date, Stock, Close) frame over 2022-2024 business days, with gaps."""
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range('2022-01-03', '2024-12-31')
+    frames = []
+    for i, ticker in enumerate(TICKERS):
+        closes = 100 * np.exp(np.cumsum(rng.normal(0.0003 * i, 0.02, len(dates))))
+        keep = rng.random(len(dates)) > 0.05
+        frames.append(pd.DataFrame({'Date': dates[keep], 'Stock': ticker, 'Close': closes[keep]}))
+    # One ticker only starts trading in mid-2023
+    frames[-1] = frames[-1][frames[-1]['Date'] >= '2023-07-01']
+    return pd.concat(frames, ignore_index=True)
+
+
+@pytest.fixture
+def panel(long_prices):
+    return PricePanel.from_long(long_prices)
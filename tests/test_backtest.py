@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.backtest import month_end_prices, run_backtest
+
+
+@pytest.fixture
+def pe():
+    return pd.Series([12.0, 30.0, -4.0, 18.0, 25.0, 9.0], index=['AAA', 'BBB', 'CCC', 'DDD', 'EEE', 'FFF'])
+
+
+def _loop_backtest(long_prices, pe, start, end, lookback, skip, n):
+    """Reference: one pd.qcut and groupby per formation month."""
+    wide = long_prices.pivot_table(index=long_prices['Date'].dt.to_period('M'), columns='Stock',
+                                   values='Close', aggfunc='last')
+    rows = []
+    for r in range(max(lookback, skip), len(wide) - 1):
+        month = wide.index[r]
+        if not pd.Period(start, 'M') <= month <= pd.Period(end, 'M'):
+            continue
+        momentum = wide.iloc[r - skip] / wide.iloc[r - lookback] - 1
+        forward = wide.iloc[r + 1] / wide.iloc[r] - 1
+        frame = pd.DataFrame({'m': momentum, 'v': pe.where(pe > 0), 'f': forward})
+        valid = frame['m'].dropna()
+        codes = pd.qcut(valid, n, labels=False)
+        means = frame.loc[valid.index, 'f'].groupby(codes).mean().reindex(range(n))
+        rows.append(pd.Series(means.to_numpy(), index=[f'Q{i + 1}' for i in range(n)], name=month))
+    return pd.DataFrame(rows)
+
+
+def test_momentum_portfolios_match_loop(long_prices, pe):
+    result = run_backtest(long_prices, pe, start='2023-01', end='2024-10', lookback=6, skip=1, n_quantiles=3)
+    ref = _loop_backtest(long_prices, pe, '2023-01', '2024-10', 6, 1, 3)
+    np.testing.assert_allclose(result.momentum.to_numpy(), ref.to_numpy())
+    assert list(result.momentum.index) == list(ref.index)
+
+
+def test_panel_input_and_value_sort(long_prices, panel, pe):
+    from_long = run_backtest(long_prices, pe, start='2023-01', end='2024-10', lookback=6, n_quantiles=3)
+    from_panel = run_backtest(panel, pe, start='2023-01', end='2024-10', lookback=6, n_quantiles=3)
+    pd.testing.assert_frame_equal(from_long.value, from_panel.value, check_names=False)
+    # Negative P/E is never ranked; the five positive ones fill 3 buckets
+    assert (from_long.value_counts.sum(axis=1) <= 5).all()
+
+
+def test_month_end_prices_and_empty_range(long_prices):
+    wide = month_end_prices(long_prices)
+    ref = long_prices.pivot_table(index=long_prices['Date'].dt.to_period('M'), columns='Stock',
+                                  values='Close', aggfunc='last')
+    pd.testing.assert_frame_equal(wide, ref, check_names=False, check_like=True)
+    empty = run_backtest(long_prices, start='2030-01', end='2030-12')
+    assert empty.momentum.empty
+
+
+def test_unsorted_input_and_missing_months(long_prices, pe):
+    shuffled = long_prices.sample(frac=1, random_state=3)
+    pd.testing.assert_frame_equal(month_end_prices(shuffled), month_end_prices(long_prices))
+
+    # With no prices at all in 2023-05, a 6-month lookback still spans six calendar months
+    gap = long_prices[long_prices['Date'].dt.to_period('M') != pd.Period('2023-05', 'M')]
+    result = run_backtest(gap, pe, start='2023-01', end='2024-10', lookback=6, n_quantiles=3)
+    ref = _loop_backtest(long_prices, pe, '2023-01', '2024-10', 6, 1, 3)
+    touches = [m for m in ref.index if m - 6 <= pd.Period('2023-05', 'M') <= m + 1]
+    kept = ref.drop(index=touches)
+    np.testing.assert_allclose(result.momentum.loc[kept.index].to_numpy(), kept.to_numpy())
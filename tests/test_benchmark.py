@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+from momentum_value.benchmark import iter_synthetic_prices, synthetic_prices, write_dataset
+
+
+def test_chunks_are_years_in_float32():
+    chunks = list(iter_synthetic_prices(20, n_years=3, end_year=2024))
+    years = [pd.to_datetime(c['Date']).dt.year.unique().tolist() for c in chunks]
+    assert years == [[2022], [2023], [2024]]
+    assert all(c['Close'].dtype == np.float32 for c in chunks)
+    full = synthetic_prices(20, n_years=3, end_year=2024)
+    assert len(full) == sum(map(len, chunks))
+    # Consistent bars: Low <= Open, Close <= High
+    for col in ('Open', 'Close'):
+        assert (full[col] >= full['Low']).all() and (full[col] <= full['High']).all()
+
+
+def test_written_prices_read_back(tmp_path):
+    price_path, fundamentals_path = write_dataset(str(tmp_path), n_tickers=15, n_years=2)
+    raw = pd.read_csv(price_path)
+    assert raw.columns[0] == 'Unnamed: 0'
+    assert (raw['Unnamed: 0'].to_numpy() == np.arange(len(raw))).all()
+    # The walk carries over the year boundary: no jump back to a new start level
+    wide = raw.pivot(index='Date', columns='Stock', values='Close')
+    assert np.log(wide).diff().abs().max().max() < 0.2
+    assert len(pd.read_csv(fundamentals_path)) >= 15
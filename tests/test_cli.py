@@ -0,0 +1,69 @@
+import os
+
+import pandas as pd
+import pytest
+
+from momentum_value import sweep as sweep_module
+from momentum_value.benchmark import write_dataset
+from momentum_value.cli import build_parser, explore, main
+
+
+@pytest.fixture
+def fundamentals_csv(tmp_path):
+    path = tmp_path / 'fundamentals.csv'
+    path.write_text(
+        'symbol,trailingPE,volume,revenuePerShare,revenuePerShare\n'
+        'SBIN.NS,12.5,100,1,9\n'
+        'SBIN.BO,-3,,2,9\n'
+        ' sbin-eq ,abc,5,3,9\n'
+        'M&M.NS,20,50,,9\n'
+    )
+    return str(path)
+
+
+def test_explore_counts_columns_and_normalized_companies(fundamentals_csv, capsys):
+    summary = explore(fundamentals_csv, columns=['trailingPE', 'volume', 'revenuePerShare', 'debtToEquity'])
+    assert summary['rows'] == 4
+    assert summary['companies'] == 2
+    assert summary['positive_pe'] == 2
+    assert summary['non_null'] == {'trailingPE': 4, 'volume': 3, 'revenuePerShare': 3}
+    assert summary['numeric']['trailingPE'] == 3
+    out = capsys.readouterr().out
+    assert "Repeated columns (first occurrence used): ['revenuePerShare']" in out
+    assert 'Companies listed more than once: 1' in out
+
+
+def test_sweep_quantiles_default_to_n_quantiles(monkeypatch):
+    calls = []
+    monkeypatch.setattr(sweep_module, 'sweep', lambda config, **kwargs: calls.append(kwargs) or pd.DataFrame())
+    main(['sweep', '--n-quantiles', '4', '--lookbacks', 'calendar', '6', '--pe-max', '50', 'none'])
+    main(['sweep', '--n-quantiles', '4', '--quantiles', '3', '10'])
+    assert calls[0]['n_quantiles'] == [4]
+    assert calls[0]['lookbacks'] == ['calendar', 6]
+    assert calls[0]['pe_max'] == [50.0, None]
+    assert calls[1]['n_quantiles'] == [3, 10]
+
+
+def test_run_options_reach_the_config():
+    from momentum_value.cli import _config
+
+    args = build_parser().parse_args(['run', '--momentum-year', '2022', '--return-year', '2023',
+                                      '--n-quantiles', '10', '--pe-cap', 'none', '--total-return'])
+    config = _config(args)
+    assert (config.momentum_year, config.return_year, config.n_quantiles) == (2022, 2023, 10)
+    assert config.pe_max is None and config.total_return
+
+
+def test_sweep_and_run_end_to_end(tmp_path, monkeypatch):
+    price_path, fundamentals_path = write_dataset(str(tmp_path), n_tickers=40, n_years=2)
+    monkeypatch.chdir(tmp_path)
+    paths = ['--prices', price_path, '--fundamentals', fundamentals_path]
+
+    assert main(['sweep', *paths, '--quantiles', '3', '5', '--workers', '1', '--output', 'sweep.csv']) == 0
+    table = pd.read_csv('sweep.csv')
+    assert table['n_quantiles'].tolist() == [3, 5]
+    assert {'momentum_t', 'value_p', 'value_p_bh'} <= set(table.columns)
+
+    assert main(['run', *paths, '--no-figures', '--no-cache', '--output', 'report.md']) == 0
+    assert os.path.exists('report.md')
+    assert 'Momentum' in open('report.md').read()
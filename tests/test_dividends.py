@@ -0,0 +1,43 @@
+import numpy as np
+import pandas as pd
+
+from momentum_value.dividends import TotalReturns
+from momentum_value.panel import PricePanel
+
+
+def _dividends(rows):
+    return pd.DataFrame(rows, columns=['Date', 'Dividends', 'Stock']).astype({'Date': 'datetime64[ns]'})
+
+
+def test_reinvested_dividend_on_hand_example():
+    panel = PricePanel.from_arrays(pd.to_datetime(['2024-01-01', '2024-01-02', '2024-01-03']),
+                                   ['AAA'] * 3, [100.0, 110.0, 121.0])
+    tr = TotalReturns(panel, _dividends([('2024-01-02', 10.0, 'AAA')]))
+    assert len(tr) == 1
+    expected = 121.0 * (1 + 10.0 / 110.0) / 100.0 - 1
+    assert np.isclose(tr.period_return('2024-01-01', '2024-01-03')['AAA'], expected)
+    np.testing.assert_allclose(tr.factor([0, 1, 2], 0), [1.0, 1 + 10.0 / 110.0, 1 + 10.0 / 110.0])
+
+
+def test_no_matching_events_equals_price_returns(panel):
+    # Unknown ticker and a date after the panel: nothing matches
+    tr = TotalReturns(panel, _dividends([('2024-06-03', 1.0, 'ZZZ'), ('2031-01-01', 1.0, 'AAA')]))
+    assert len(tr) == 0
+    np.testing.assert_array_equal(tr.factor(np.arange(len(panel))[:, None]), 1.0)
+    pd.testing.assert_series_equal(tr.period_return('2023-01-01', '2023-12-31'),
+                                   panel.period_return('2023-01-01', '2023-12-31'))
+
+
+def test_matches_naive_reinvestment(panel, long_prices):
+    events = _dividends([('2023-03-15', 2.0, 'AAA'), ('2023-09-01', 1.5, 'AAA'), ('2023-05-06', 3.0, 'CCC')])
+    tr = TotalReturns(panel, events)
+    got = tr.period_return('2023-01-01', '2023-12-31')
+
+    for ticker in ['AAA', 'CCC']:
+        px = long_prices[long_prices['Stock'] == ticker].set_index('Date')['Close']
+        px = px['2023-01-01':'2023-12-31']
+        growth = 1.0
+        for _, ev in events[events['Stock'] == ticker].iterrows():
+            # Reinvested at the first close on or after the event date
+            growth *= 1 + ev['Dividends'] / px[px.index >= ev['Date']].iloc[0]
+        assert np.isclose(got[ticker], px.iloc[-1] * growth / px.iloc[0] - 1)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.factors import compute_factors, winsorize, zscore
+
+
+@pytest.fixture
+def fundamentals():
+    rng = np.random.default_rng(11)
+    index = pd.Index(['AAA', 'BBB', 'CCC', 'DDD', 'EEE', 'ZZZ'])
+    return pd.DataFrame({'trailingPE': rng.uniform(-5, 40, len(index)),
+                         'pegRatio': rng.uniform(0.1, 3, len(index))}, index=index)
+
+
+def test_aligned_matches_reindex(panel):
+    tickers = ['CCC', 'ZZZ', 'AAA']
+    expected = panel.to_frame().reindex(columns=tickers).to_numpy()
+    np.testing.assert_array_equal(panel.aligned(tickers), expected)
+
+
+def test_price_factors_match_pandas(panel, fundamentals):
+    table = compute_factors(fundamentals, panel, year=2023, names=['momentum', 'volatility'])
+    wide = panel.to_frame().loc['2023'].reindex(columns=fundamentals.index)
+
+    first = wide.apply(lambda s: s.dropna().iloc[0] if s.notna().any() else np.nan)
+    last = wide.apply(lambda s: s.dropna().iloc[-1] if s.notna().any() else np.nan)
+    np.testing.assert_allclose(table['momentum'], last / first - 1)
+
+    vol = wide.pct_change(fill_method=None).std() * np.sqrt(252)
+    np.testing.assert_allclose(table['volatility'], vol)
+    # Unknown ticker: no prices, so NaN rather than an error
+    assert np.isnan(table.loc['ZZZ', ['momentum', 'volatility']]).all()
+
+
+def test_price_factor_without_panel(fundamentals):
+    with pytest.raises(ValueError, match='require a PricePanel'):
+        compute_factors(fundamentals, names=['momentum'])
+    # By default, price factors are skipped when there is no panel
+    assert 'momentum' not in compute_factors(fundamentals).columns
+
+
+def test_pe_z_score_matches_pandas(fundamentals):
+    table = compute_factors(fundamentals, names=['pe'], limits=(0.0, 1.0))
+    pe = fundamentals['trailingPE'].where(fundamentals['trailingPE'] > 0)
+    expected = -(pe - pe.mean()) / pe.std()
+    np.testing.assert_allclose(table['pe_z'], expected)
+    np.testing.assert_allclose(table['pe_rank'], expected.rank(pct=True))
+
+
+def test_winsorize_and_zscore_columns():
+    x = np.array([[1.0, np.nan], [2.0, 5.0], [100.0, np.nan], [3.0, np.nan]])
+    clipped = winsorize(x, (0.0, 0.5))
+    assert clipped[2, 0] == pytest.approx(np.nanquantile(x[:, 0], 0.5))
+    z = zscore(x)
+    # A column with one value has no spread: NaN, not an error
+    assert np.isnan(z[:, 1]).all()
+    col = pd.Series(x[:, 0])
+    np.testing.assert_allclose(z[:, 0], (col - col.mean()) / col.std())
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+from momentum_value.fundamentals import load_fundamentals, primary_listings
+
+
+def _write(tmp_path):
+    raw = pd.DataFrame({
+        'symbol': ['AAA.NS', 'AAA.BO', 'BBB.BO', 'CCC.NS', 'CCC.BO'],
+        'trailingPE': [10.0, 11.0, 20.0, 30.0, 31.0],
+        'volume': [500.0, 100.0, 50.0, np.nan, 70.0],
+    })
+    path = tmp_path / 'FUNDAMENTALratios.csv'
+    raw.to_csv(path, index=False)
+    return path, raw
+
+
+def test_one_row_per_company_primary_listing(tmp_path):
+    path, raw = _write(tmp_path)
+    store = load_fundamentals(str(path), cache_dir=str(tmp_path / 'cache'))
+
+    # Baseline: highest-volume listing per normalized ticker (missing volume last)
+    raw['ticker'] = raw['symbol'].str.split('.').str[0]
+    expected = raw.sort_values('volume', ascending=False, na_position='last') \
+        .groupby('ticker')['trailingPE'].first()
+    assert store.frame.index.is_unique
+    pd.testing.assert_series_equal(store.frame['trailingPE'].sort_index(), expected, check_names=False)
+    assert store.frame.loc['CCC', 'listing'] == 'BO'
+
+
+def test_lookups_and_unknown_tickers(tmp_path):
+    path, _ = _write(tmp_path)
+    store = load_fundamentals(str(path), cache_dir=str(tmp_path / 'cache'))
+    assert store.get('NOPE') is None
+    assert store.get('aaa.ns')['trailingPE'] == 10.0
+    got = store.series('trailingPE', ['BBB', 'NOPE', 'AAA'])
+    np.testing.assert_array_equal(got.to_numpy(), [20.0, np.nan, 10.0])
+    # Served from the cache on the second load
+    again = load_fundamentals(str(path), cache_dir=str(tmp_path / 'cache'))
+    pd.testing.assert_frame_equal(again.frame, store.frame)
+
+
+def test_rows_without_symbol_are_dropped():
+    for dtype in (object, 'str'):
+        raw = pd.DataFrame({'symbol': pd.Series(['AAA.NS', None, 'AAA.BO', 'NAN.NS'], dtype=dtype),
+                            'volume': [1.0, 9.0, 2.0, 3.0]})
+        frame = primary_listings(raw)
+        assert frame.index.tolist() == ['AAA', 'NAN']
+        assert frame.index.dtype == raw['symbol'].dtype
+        assert frame.loc['AAA', 'listing'] == 'BO'
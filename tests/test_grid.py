@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.grid import double_sort, grid_codes
+
+
+@pytest.fixture
+def cross_section():
+    rng = np.random.default_rng(4)
+    n = 250
+    df = pd.DataFrame({'momentum': rng.normal(size=n), 'pe': rng.lognormal(3, 0.5, n),
+                       'ret': rng.normal(0.05, 0.3, n)})
+    df.loc[rng.choice(n, 20, replace=False), 'pe'] = np.nan
+    df.loc[rng.choice(n, 10, replace=False), 'ret'] = np.nan
+    return df
+
+
+def _groupby_grid(df, first_q, second_q):
+    frame = df.assign(i=first_q, j=second_q).dropna(subset=['ret'])
+    return frame.groupby(['i', 'j'])['ret'].agg(['count', 'mean', 'std']).unstack()
+
+
+def test_independent_sort_matches_pandas(cross_section):
+    df = cross_section
+    grid = double_sort(df['momentum'], df['pe'], df['ret'], 5, 5, 'independent')
+    both = df.dropna(subset=['momentum', 'pe'])
+    ref = _groupby_grid(both, pd.qcut(both['momentum'], 5, labels=False), pd.qcut(both['pe'], 5, labels=False))
+    np.testing.assert_array_equal(grid.count[0], ref['count'].to_numpy())
+    np.testing.assert_allclose(grid.mean[0], ref['mean'].to_numpy())
+    np.testing.assert_allclose(grid.std[0], ref['std'].to_numpy())
+    assert grid.table('mean').index[0] == 'momentum Q1'
+
+
+def test_conditional_sort_matches_pandas(cross_section):
+    df = cross_section
+    grid = double_sort(df['momentum'], df['pe'], df['ret'], 4, 3, 'conditional')
+    both = df.dropna(subset=['momentum', 'pe'])
+    first = pd.qcut(both['momentum'], 4, labels=False)
+    second = both.groupby(first)['pe'].transform(lambda s: pd.qcut(s, 3, labels=False))
+    ref = _groupby_grid(both, first, second)
+    np.testing.assert_array_equal(grid.count[0], ref['count'].to_numpy())
+    np.testing.assert_allclose(grid.mean[0], ref['mean'].to_numpy())
+
+
+def test_dates_are_sorted_separately(cross_section):
+    df = cross_section
+    stacked = np.stack([df['momentum'], df['momentum'][::-1].to_numpy()])
+    pe = np.stack([df['pe'], df['pe']])
+    ret = np.stack([df['ret'], df['ret']])
+    grid = double_sort(stacked, pe, ret, method='conditional', names=('m', 'v'))
+    second = double_sort(stacked[1], pe[1], ret[1], method='conditional')
+    np.testing.assert_array_equal(grid.count[1], second.count[0])
+    assert len(grid.frame()) == 2 * 5 * 5
+
+
+def test_empty_and_unknown_method():
+    grid = double_sort(np.array([]), np.array([]), np.array([]))
+    assert grid.count.shape == (1, 5, 5) and grid.count.sum() == 0
+    assert np.isnan(grid.mean).all()
+    with pytest.raises(ValueError):
+        grid_codes(np.ones(3), np.ones(3), method='sideways')
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.incremental import ARRAYS, DailyState, run_daily
+from momentum_value.panel import PricePanel
+
+
+@pytest.fixture
+def pe(panel):
+    return np.linspace(5, 30, panel.shape[1])
+
+
+def test_calendar_momentum_matches_pandas(panel, long_prices, pe):
+    state = DailyState.from_history(panel, pe)
+    ytd = long_prices[long_prices['Date'].dt.year == 2024].sort_values('Date').groupby('Stock')['Close']
+    expected = (ytd.last() / ytd.first() - 1).reindex(panel.tickers)
+    np.testing.assert_allclose(state.momentum(), expected.to_numpy())
+
+
+@pytest.mark.parametrize('lookback', ['calendar', 6])
+def test_daily_steps_equal_full_replay(tmp_path, long_prices, pe, lookback):
+    cutoff = pd.Timestamp('2024-11-29')
+    history = PricePanel.from_long(long_prices[long_prices['Date'] <= cutoff])
+    DailyState.from_history(history, pe, lookback=lookback).save(str(tmp_path))
+    for date, rows in long_prices[long_prices['Date'] > cutoff].groupby('Date'):
+        run_daily(rows, cache_dir=str(tmp_path))
+
+    replayed = DailyState.from_history(PricePanel.from_long(long_prices), pe, lookback=lookback)
+    loaded = DailyState.load(str(tmp_path))
+    assert loaded.symbols.tickers == replayed.symbols.tickers
+    for name in ARRAYS:
+        np.testing.assert_allclose(getattr(loaded, name), getattr(replayed, name), err_msg=name)
+    log = pd.read_csv(tmp_path / 'incremental' / 'log.csv')
+    assert len(log) == long_prices.loc[long_prices['Date'] > cutoff, 'Date'].nunique()
+
+
+def test_new_and_stale_days(panel, pe):
+    state = DailyState.from_history(panel, pe)
+    with pytest.raises(ValueError, match='not after'):
+        state.update(pd.DataFrame({'Date': [panel.dates[-1]], 'Stock': ['AAA'], 'Close': [1.0]}))
+    # A ticker never seen before gets a slot and no quantile yet
+    row = state.update(pd.DataFrame({'Date': [pd.Timestamp('2025-01-02')] * 2, 'Stock': ['AAA', 'NEW'],
+                                     'Close': [100.0, 5.0]}))
+    assert row['n_rows'] == 2 and len(state) == panel.shape[1] + 1
+    assert state.value_q[state.symbols.id_of('NEW')] == -1
+
+
+def test_dividends_for_missing_or_unknown_tickers(panel, pe):
+    dividends = pd.DataFrame({'Date': pd.to_datetime(['2024-03-01', '2024-03-01', '2024-03-01']),
+                              'Stock': ['AAA', 'ZZZ', None], 'Dividends': [1.0, 2.0, 3.0]})
+    state = DailyState.from_history(panel, pe, dividends)
+    plain = DailyState.from_history(panel, pe)
+    # ZZZ is not interned, and only AAA's adjusted price changes
+    assert state.symbols.tickers == plain.symbols.tickers
+    changed = ~np.isclose(state.factor, plain.factor)
+    assert changed.tolist() == [t == 'AAA' for t in panel.tickers]
+
+    before = state.pending.copy()
+    state.step('2025-01-02', [], [], div_ids=[-1, 0], div_amounts=[5.0, 0.5])
+    assert state.pending[-1] == before[-1] and state.pending[0] == before[0] + 0.5
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from momentum_value.inference import adjust_pvalues, newey_west, welch_codes, welch_table, welch_tests
+
+
+@pytest.fixture
+def pairs():
+    rng = np.random.default_rng(9)
+    return {f'spread{i}': (rng.normal(0.02 * i, 0.3, 40 + i), rng.normal(0, 0.2, 55 - i)) for i in range(6)}
+
+
+@pytest.mark.parametrize('alternative', ['two-sided', 'greater', 'less'])
+def test_welch_matches_scipy(pairs, alternative):
+    table = welch_table(pairs, alternative=alternative, adjust=None)
+    for name, (a, b) in pairs.items():
+        ref = stats.ttest_ind(a, b, equal_var=False, alternative=alternative)
+        assert table.loc[name, 't_stat'] == pytest.approx(ref.statistic)
+        assert table.loc[name, 'p_value'] == pytest.approx(ref.pvalue)
+        if alternative == 'two-sided':
+            ci = ref.confidence_interval(0.95)
+            assert table.loc[name, 'ci_low'] == pytest.approx(ci.low)
+            assert table.loc[name, 'ci_high'] == pytest.approx(ci.high)
+
+
+def test_welch_codes_matches_scipy():
+    rng = np.random.default_rng(2)
+    values = rng.normal(size=(4, 120))
+    values[1, :15] = np.nan
+    codes = rng.integers(-1, 5, size=(4, 120))
+    res = welch_codes(values, codes, 5, long_q=4, short_q=0)
+    for r in range(4):
+        a = values[r][(codes[r] == 4) & np.isfinite(values[r])]
+        b = values[r][(codes[r] == 0) & np.isfinite(values[r])]
+        ref = stats.ttest_ind(a, b, equal_var=False)
+        assert res['t_stat'][r] == pytest.approx(ref.statistic)
+        assert res['p_value'][r] == pytest.approx(ref.pvalue)
+
+
+def test_empty_group_is_nan():
+    res = welch_tests(np.array([[np.nan, np.nan], [1.0, 2.0]]), np.array([[1.0, 2.0], [np.nan, 3.0]]))
+    assert np.isnan(res['p_value']).all()
+    with pytest.raises(ValueError):
+        welch_tests(np.ones(3), np.zeros(3), alternative='sideways')
+
+
+def test_bh_matches_scipy():
+    p = np.random.default_rng(5).uniform(0, 0.2, 25)
+    np.testing.assert_allclose(adjust_pvalues(p, 'bh'), stats.false_discovery_control(p))
+
+
+def test_holm_matches_reference():
+    p = np.array([0.01, 0.04, 0.03, 0.005, 0.2])
+    order = np.argsort(p)
+    ref = np.empty_like(p)
+    ref[order] = np.minimum(np.maximum.accumulate(p[order] * (len(p) - np.arange(len(p)))), 1.0)
+    np.testing.assert_allclose(adjust_pvalues(p, 'holm'), ref)
+
+
+def test_adjust_skips_nan_and_works_per_row():
+    p = np.array([[0.01, np.nan, 0.04, 0.03], [0.5, 0.2, np.nan, np.nan]])
+    out = adjust_pvalues(p, 'bh')
+    assert np.isnan(out[0, 1]) and np.isnan(out[1, 2:]).all()
+    np.testing.assert_allclose(out[0, [0, 2, 3]], stats.false_discovery_control([0.01, 0.04, 0.03]))
+    np.testing.assert_allclose(out[1, :2], stats.false_discovery_control([0.5, 0.2]))
+    assert adjust_pvalues(np.array([]), 'holm').shape == (0,)
+
+
+def test_newey_west_matches_direct_formula():
+    x = np.random.default_rng(8).normal(0.01, 0.05, 120)
+    x[[5, 60]] = np.nan
+    res = newey_west(pd.DataFrame({'spread': x}), lags=3).loc['spread']
+    e = np.where(np.isfinite(x), x - np.nanmean(x), 0.0)
+    n = np.isfinite(x).sum()
+    long_run = (e * e).sum() + 2 * sum((1 - L / 4) * (e[L:] * e[:-L]).sum() for L in range(1, 4))
+    assert res['mean'] == pytest.approx(np.nanmean(x))
+    assert res['nw_se'] == pytest.approx(np.sqrt(long_run / n / n))
+    assert res['p_value'] == pytest.approx(2 * stats.t.sf(abs(res['t_stat']), n - 1))
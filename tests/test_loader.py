@@ -0,0 +1,58 @@
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.loader import discover, load_frame, load_panel, read_prices
+from momentum_value.panel import PricePanel
+from momentum_value.schema import PRICES
+
+
+@pytest.fixture
+def per_ticker(tmp_path, long_prices):
+    """One CSV per ticker without a Stock column, plus the same files zipped."""
+    directory = tmp_path / 'prices'
+    directory.mkdir()
+    for ticker, rows in long_prices.groupby('Stock'):
+        rows[['Date', 'Close']].to_csv(directory / f'{ticker}.csv', index=False)
+    archive = tmp_path / 'prices.zip'
+    with zipfile.ZipFile(archive, 'w') as z:
+        for path in sorted(directory.iterdir()):
+            z.write(path, f'prices/{path.name}')
+    return str(directory), str(archive)
+
+
+def _sorted(frame):
+    frame = frame.assign(Stock=frame['Stock'].astype(str))
+    return frame.sort_values(['Stock', 'Date'], ignore_index=True)
+
+
+@pytest.mark.parametrize('source', ['directory', 'glob', 'zip'])
+@pytest.mark.parametrize('workers', [1, 4])
+def test_read_prices_matches_concat(per_ticker, long_prices, source, workers):
+    directory, archive = per_ticker
+    path = {'directory': directory, 'glob': f'{directory}/*.csv', 'zip': archive}[source]
+    ours = read_prices(path, years=[2023, 2024], workers=workers)
+    ref = long_prices[long_prices['Date'].dt.year.isin([2023, 2024])]
+    assert isinstance(ours['Stock'].dtype, pd.CategoricalDtype) and ours['Close'].dtype == np.float32
+    pd.testing.assert_frame_equal(_sorted(ours), _sorted(ref)[ours.columns], check_dtype=False)
+
+
+def test_load_panel_matches_from_long(per_ticker, long_prices):
+    directory, archive = per_ticker
+    ours = load_panel(archive, workers=2)
+    ref = PricePanel.from_long(long_prices)
+    assert ours.tickers.tolist() == ref.tickers.tolist()
+    np.testing.assert_array_equal(ours.dates.values, ref.dates.values)
+    np.testing.assert_allclose(ours.values, ref.values)
+
+
+def test_load_frame_and_missing_sources(per_ticker, tmp_path):
+    directory, _ = per_ticker
+    frame = load_frame(f'{directory}/AAA.csv', PRICES, label='Stock')
+    assert set(frame['Stock']) == {'AAA'}
+    with pytest.raises(FileNotFoundError):
+        discover(str(tmp_path / 'nothing' / '*.csv'))
+    empty = read_prices(directory, years=[1999])
+    assert empty.empty and list(empty.columns) == ['Date', 'Stock', 'Close']
@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.memory import MB, MemoryTracker, downcast, footprint
+
+
+def test_downcast_keeps_values_and_categories(long_prices):
+    lean = downcast(long_prices)
+    assert lean['Close'].dtype == np.float32
+    assert isinstance(lean['Stock'].dtype, pd.CategoricalDtype)
+    assert lean['Date'].dtype == long_prices['Date'].dtype
+    np.testing.assert_allclose(lean['Close'], long_prices['Close'], rtol=1e-6)
+    assert lean['Stock'].astype(str).tolist() == long_prices['Stock'].astype(str).tolist()
+
+    # Categories survive a second pass unchanged
+    ordered = lean.assign(Stock=lean['Stock'].cat.reorder_categories(sorted(lean['Stock'].cat.categories, reverse=True)))
+    assert downcast(ordered)['Stock'].cat.categories.tolist() == ordered['Stock'].cat.categories.tolist()
+    assert lean.memory_usage(deep=True).sum() < long_prices.memory_usage(deep=True).sum()
+
+
+def test_footprint_matches_deep_memory_usage(long_prices):
+    closes = long_prices['Close'].to_numpy()
+    namespace = {'prices': long_prices, 'stocks': long_prices['Stock'], 'closes': closes,
+                 '_hidden': long_prices, 'n': 3, 'label': 'x'}
+    sizes = footprint(namespace)
+    assert list(sizes.index) == ['prices', 'stocks', 'closes']
+    assert sizes['prices'] == long_prices.memory_usage(index=True, deep=True).sum() / MB
+    assert sizes['stocks'] == long_prices['Stock'].memory_usage(deep=True) / MB
+    assert sizes['closes'] == closes.nbytes / MB
+
+
+def test_tracker_records_laps_only_when_enabled(long_prices, capsys):
+    off = MemoryTracker()
+    assert off.lap('load', {'prices': long_prices}) is None
+    off.report()
+    assert off.laps == [] and capsys.readouterr().out == ''
+
+    on = MemoryTracker(enabled=True)
+    on.lap('load', {'prices': long_prices})
+    on.lap('drop', {})
+    assert [label for label, _ in on.laps] == ['load', 'drop']
+    on.report()
+    out = capsys.readouterr().out
+    assert 'Memory Footprint' in out and 'prices' in out
+    assert f"{long_prices.memory_usage(deep=True).sum() / MB:>9.1f}" in out.splitlines()[-1]
+
+
+@pytest.mark.parametrize('value, lean', [('1', True), ('true', True), ('0', False), ('', False)])
+def test_lean_mode_from_environment(monkeypatch, value, lean):
+    monkeypatch.setenv('MOMENTUM_VALUE_LEAN', value)
+    assert MemoryTracker.from_env().enabled is lean
+    # The process-wide MEMORY and LEAN are read once, at import
+    code = 'from momentum_value.memory import LEAN, MEMORY; print(LEAN, MEMORY.enabled)'
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert out.split() == [str(lean), str(lean)]
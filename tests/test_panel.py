@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.dividends import TotalReturns
+
+
+def _wide(long_prices):
+    return long_prices.pivot(index='Date', columns='Stock', values='Close').sort_index()
+
+
+def test_matches_pivot(panel, long_prices):
+    wide = _wide(long_prices)
+    assert list(panel.tickers) == list(wide.columns)
+    np.testing.assert_array_equal(panel.values, wide.to_numpy())
+    pd.testing.assert_series_equal(panel.column('BBB'), wide['BBB'], check_names=False, check_freq=False)
+
+
+def test_period_return_matches_pandas(panel, long_prices):
+    wide = _wide(long_prices).loc['2023-01-01':'2023-12-31']
+    expected = wide.apply(lambda s: s.dropna().iloc[-1] / s.dropna().iloc[0] - 1 if s.notna().any() else np.nan)
+    np.testing.assert_allclose(panel.period_return('2023-01-01', '2023-12-31').to_numpy(), expected.to_numpy())
+
+
+def test_lookback_return_matches_asof(panel, long_prices):
+    wide = _wide(long_prices).ffill()
+    as_of = pd.Timestamp('2024-06-30')
+    end, start = (wide.loc[:as_of - pd.DateOffset(months=m)].iloc[-1] for m in (1, 12))
+    expected = end / start - 1
+    np.testing.assert_allclose(panel.lookback_return(as_of, 12, skip=1).to_numpy(), expected.to_numpy())
+
+
+def test_empty_window(panel):
+    first, last = panel.valid_bounds('2030-01-01', '2030-12-31')
+    assert (first == -1).all() and (last == -1).all()
+    assert panel.period_return('2030-01-01', '2030-12-31').isna().all()
+    assert panel.lookback_return('2000-01-01', 12).isna().all()
+    assert np.isnan(panel.last_valid(-1)).all()
+    assert TotalReturns(panel, pd.DataFrame(columns=['Date', 'Dividends', 'Stock'])) \
+        .period_return('2030-01-01', '2030-12-31').isna().all()
+
+
+def test_unknown_ticker(panel):
+    with pytest.raises(KeyError):
+        panel.column('NOPE')
+    assert panel.column_of('NOPE') == -1
+    np.testing.assert_array_equal(panel.columns_of(['CCC', 'NOPE', 'AAA']), [2, -1, 0])
+    sub = panel.select(['CCC', 'NOPE', 'AAA'])
+    assert list(sub.tickers) == ['CCC', 'AAA']
+    np.testing.assert_array_equal(sub.values, panel.values[:, [2, 0]])
@@ -0,0 +1,46 @@
+from momentum_value import pipeline
+from momentum_value.config import AnalysisConfig
+from momentum_value.pipeline import Pipeline, Stage
+
+
+CALLS = []
+
+
+def _base(config):
+    CALLS.append('base')
+    return [config.n_quantiles]
+
+
+def _double(config, base):
+    CALLS.append('double')
+    return base * 2
+
+
+STAGES = {
+    'base': Stage('base', _base, params=('n_quantiles',)),
+    'double': Stage('double', _double, inputs=('base',)),
+}
+
+
+def _run(tmp_path, **config):
+    return Pipeline(AnalysisConfig(**config), cache_dir=str(tmp_path), verbose=False, stages=STAGES).run()
+
+
+def test_results_are_cached(tmp_path):
+    CALLS.clear()
+    assert _run(tmp_path)['double'] == [5, 5]
+    assert _run(tmp_path)['double'] == [5, 5]
+    assert CALLS == ['base', 'double']
+
+
+def test_parameter_change_reruns_downstream(tmp_path):
+    CALLS.clear()
+    _run(tmp_path)
+    assert _run(tmp_path, n_quantiles=3)['double'] == [3, 3]
+    assert CALLS == ['base', 'double', 'base', 'double']
+
+
+def test_package_change_invalidates_keys(tmp_path, monkeypatch):
+    before = Pipeline(cache_dir=str(tmp_path), stages=STAGES).key('double')
+    monkeypatch.setattr(pipeline, 'package_hash', lambda: 'edited')
+    assert Pipeline(cache_dir=str(tmp_path), stages=STAGES).key('double') != before
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.point_in_time import PointInTimeStore, load_snapshots
+from momentum_value.tickers import SymbolTable
+
+
+@pytest.fixture
+def history():
+    rng = np.random.default_rng(12)
+    rows = []
+    for ticker in ['AAA', 'BBB', 'CCC']:
+        for date in pd.to_datetime(sorted(rng.choice(pd.date_range('2022-01-01', '2024-12-31').values, 8,
+                                                     replace=False))):
+            rows.append({'symbol': f'{ticker}.NS', 'date': date, 'trailingPE': rng.uniform(5, 40)})
+    return pd.DataFrame(rows)
+
+
+def _merge_asof(history, dates, tickers, lag_days=0, max_age=None):
+    """Reference: pandas merge_asof per ticker (backward, on or before)."""
+    snaps = history.assign(ticker=history['symbol'].str[:-3],
+                           known=history['date'] + pd.Timedelta(days=lag_days)).sort_values('known')
+    out = pd.DataFrame(index=pd.DatetimeIndex(dates), columns=tickers, dtype=float)
+    for ticker in tickers:
+        left = pd.DataFrame({'when': pd.DatetimeIndex(dates)})
+        right = snaps[snaps['ticker'] == ticker][['known', 'trailingPE']]
+        tol = pd.Timedelta(days=max_age) if max_age is not None else None
+        merged = pd.merge_asof(left, right, left_on='when', right_on='known', tolerance=tol)
+        out[ticker] = merged['trailingPE'].to_numpy()
+    return out
+
+
+@pytest.mark.parametrize('lag_days, max_age', [(0, None), (45, None), (0, 120)])
+def test_as_of_matches_merge_asof(history, lag_days, max_age):
+    store = PointInTimeStore.from_frame(history, lag_days=lag_days, symbols=SymbolTable())
+    dates = pd.date_range('2021-06-30', '2025-03-31', freq='ME')
+    tickers = ['AAA', 'BBB', 'CCC', 'ZZZ']
+    ours = store.frame('trailingPE', dates, tickers, max_age=max_age)
+    pd.testing.assert_frame_equal(ours, _merge_asof(history, dates, tickers, lag_days, max_age), check_freq=False)
+    # Unknown ticker: all NaN, and nothing is interned for it
+    assert ours['ZZZ'].isna().all() and 'ZZZ' not in store.symbols
+
+
+def test_higher_volume_listing_wins_same_day():
+    frame = pd.DataFrame({'symbol': ['X.NS', 'X.BO', 'X.NS'], 'date': pd.to_datetime(['2024-01-31'] * 2 + ['2024-03-31']),
+                          'trailingPE': [10.0, 99.0, 12.0], 'volume': [500.0, 20.0, 1.0]})
+    store = PointInTimeStore.from_frame(frame, symbols=SymbolTable())
+    assert len(store) == 2
+    assert store.history('X')['trailingPE'].tolist() == [10.0, 12.0]
+    assert store.series('trailingPE', '2024-02-15', ['X']).tolist() == [10.0]
+
+
+def test_empty_store_and_missing_history():
+    store = PointInTimeStore([], [], {'trailingPE': []}, symbols=SymbolTable())
+    assert len(store) == 0
+    assert store.frame('trailingPE', ['2024-01-31'], ['AAA']).isna().all().all()
+    assert store.history('AAA').empty
+
+
+def test_load_snapshots_from_dated_files(tmp_path, history):
+    for date, rows in history.groupby(history['date'].dt.to_period('Q').dt.end_time.dt.date):
+        rows.drop(columns='date').to_csv(tmp_path / f'{date}.csv', index=False)
+    store = load_snapshots(str(tmp_path / '*.csv'), symbols=SymbolTable())
+    assert len(store) == history.assign(q=history['date'].dt.to_period('Q')).drop_duplicates(['symbol', 'q']).shape[0]
+    assert store.as_of('trailingPE', ['2021-12-31']).shape == (1, 3)
@@ -0,0 +1,66 @@
+import mmap
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.price_cache import cache_path, load_prices, read_manifest
+
+
+def _write(path, frame):
+    frame.to_csv(path)
+    # Make sure a rewrite within the same clock tick still changes the fingerprint
+    os.utime(path, ns=(time.time_ns(), time.time_ns()))
+
+
+def test_load_prices_matches_read_csv(tmp_path, long_prices):
+    path = str(tmp_path / 'Stock_Data.csv')
+    _write(path, long_prices)
+    cache_dir = str(tmp_path / '.cache')
+    ours = load_prices(path, years=[2023], cache_dir=cache_dir)
+    ref = long_prices[long_prices['Date'].dt.year == 2023].reset_index(drop=True)
+    assert isinstance(ours['Stock'].dtype, pd.CategoricalDtype) and ours['Close'].dtype == np.float32
+    pd.testing.assert_frame_equal(ours.assign(Stock=ours['Stock'].astype(str)), ref, check_dtype=False)
+    assert read_manifest(cache_path(path, cache_dir))['years'] == [2022, 2023, 2024]
+    assert len(load_prices(path, years=[1999], cache_dir=cache_dir)) == 0
+    assert len(load_prices(path, cache_dir=cache_dir)) == len(long_prices)
+
+
+def test_cache_rebuilds_when_source_changes(tmp_path, long_prices):
+    path = str(tmp_path / 'Stock_Data.csv')
+    cache_dir = str(tmp_path / '.cache')
+    _write(path, long_prices)
+    assert len(load_prices(path, [2024], cache_dir)) == (long_prices['Date'].dt.year == 2024).sum()
+    fewer = long_prices[long_prices['Stock'] != 'AAA']
+    _write(path, fewer)
+    reloaded = load_prices(path, [2024], cache_dir)
+    assert 'AAA' not in set(reloaded['Stock'].astype(str))
+    assert len(reloaded) == (fewer['Date'].dt.year == 2024).sum()
+
+
+def test_rows_without_dates_are_dropped(tmp_path, long_prices):
+    path = str(tmp_path / 'Stock_Data.csv')
+    dated = long_prices.astype({'Date': str})
+    dated.loc[dated.index[:3], 'Date'] = ''
+    _write(path, dated)
+    prices = load_prices(path, cache_dir=str(tmp_path / '.cache'))
+    assert read_manifest(cache_path(path, str(tmp_path / '.cache')))['years'] == [2022, 2023, 2024]
+    assert len(prices) == len(long_prices) - 3 and prices['Date'].notna().all()
+
+
+@pytest.mark.skipif(int(pd.__version__.split('.')[0]) < 3, reason='older pandas consolidates columns on construction')
+def test_single_year_columns_stay_memory_mapped(tmp_path, long_prices):
+    path = str(tmp_path / 'Stock_Data.csv')
+    _write(path, long_prices)
+    prices = load_prices(path, years=[2023], cache_dir=str(tmp_path / '.cache'))
+
+    def mapped(array):
+        while array is not None:
+            if isinstance(array, (np.memmap, mmap.mmap)):
+                return True
+            array = getattr(array, 'base', None)
+        return False
+
+    assert all(mapped(prices[col].to_numpy()) for col in prices.columns.drop('Stock'))
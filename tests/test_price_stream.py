@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from momentum_value.benchmark import write_dataset
+from momentum_value.config import AnalysisConfig
+from momentum_value.pipeline import Pipeline
+from momentum_value.price_cache import load_prices
+from momentum_value.price_stream import stream_prices
+
+
+def _dataset(tmp_path):
+    price_path, fundamentals_path = write_dataset(str(tmp_path), n_tickers=40, n_years=3, end_year=2024)
+    return AnalysisConfig(price_path=price_path, fundamentals_path=fundamentals_path,
+                          dividends_path=os.path.join(str(tmp_path), 'missing.csv'))
+
+
+def _sorted(frame):
+    frame = frame.assign(Stock=frame['Stock'].astype(str))
+    return frame.sort_values(['Stock', 'Date'], ignore_index=True)
+
+
+def test_stream_matches_cache(tmp_path):
+    config = _dataset(tmp_path)
+    streamed, report = stream_prices(config=config, chunksize=5_000, verbose=False)
+    cached = load_prices(config.price_path, years=config.years, cache_dir=str(tmp_path / '.cache'))
+    assert report['chunks'] > 1 and report['rows_kept'] == len(cached) < report['rows_scanned']
+    pd.testing.assert_frame_equal(_sorted(streamed), _sorted(cached)[streamed.columns], check_dtype=False)
+    assert streamed['Close'].dtype == np.float32
+
+
+def test_stream_ticker_filter_and_empty(tmp_path):
+    config = _dataset(tmp_path)
+    prices, _ = stream_prices(config=config.with_tickers(['TKR3.NS', 'TKR7']), chunksize=5_000, verbose=False)
+    assert set(prices['Stock'].astype(str)) == {'TKR3', 'TKR7'}
+    empty, report = stream_prices(config=config.with_tickers(['NOPE']), chunksize=5_000, verbose=False)
+    assert empty.empty and report['rows_kept'] == 0
+
+
+def test_pipeline_price_stage_streams(tmp_path):
+    config = _dataset(tmp_path)
+    cache_dir = str(tmp_path / '.cache')
+    cached = Pipeline(config, cache_dir=cache_dir, verbose=False).run(['universe', 'tests'])
+    streamed = Pipeline(config.replace(price_chunksize=5_000), cache_dir=cache_dir, verbose=False).run(
+        ['universe', 'tests'])
+    assert len(streamed['universe']) == len(cached['universe'])
+    pd.testing.assert_frame_equal(streamed['tests'], cached['tests'])
+
+
+def test_header_aliases_and_non_iso_dates(tmp_path, long_prices):
+    path = str(tmp_path / 'prices.csv')
+    rows = long_prices.rename(columns={'Stock': 'Symbol'})
+    rows.assign(Date=rows['Date'].dt.strftime('%d-%b-%Y')).to_csv(path, index=False)
+    config = AnalysisConfig(price_path=path, momentum_year=2023, return_year=2023)
+    prices, report = stream_prices(config=config, chunksize=1_000, verbose=False)
+    expected = long_prices[long_prices['Date'].dt.year == 2023]
+    assert report['rows_kept'] == len(expected)
+    pd.testing.assert_frame_equal(_sorted(prices)[['Date', 'Stock', 'Close']],
+                                  _sorted(expected).astype({'Date': 'datetime64[ns]'}), check_dtype=False)
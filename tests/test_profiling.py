@@ -0,0 +1,75 @@
+import json
+import time
+
+import pytest
+
+from momentum_value import pipeline
+from momentum_value.config import AnalysisConfig
+from momentum_value.pipeline import Pipeline, Stage
+from momentum_value.profiling import Profiler
+
+
+def test_laps_time_each_cell_and_record_rows():
+    profiler = Profiler(enabled=True)
+    profiler.lap('load', rows_in=10)
+    time.sleep(0.05)
+    profiler.end(rows_out=1_000)
+    profiler.lap('merge', rows_in=1_000)
+    with profiler.stage('inner', rows_in=5) as rec:
+        rec.rows_out = 3
+    time.sleep(0.02)
+    profiler.lap('report')
+    profiler.finish()
+
+    load, merge, inner, report = sorted(profiler.records, key=lambda r: r.start)
+    assert [r.name for r in (load, merge, inner, report)] == ['load', 'merge', 'inner', 'report']
+    assert (load.rows_in, load.rows_out) == (10, 1_000)
+    assert (inner.rows_in, inner.rows_out, inner.depth) == (5, 3, 1)
+    assert (merge.rows_in, merge.rows_out, merge.depth) == (1_000, None, 0)
+    assert load.wall_s >= 0.05 and merge.wall_s >= 0.02 + inner.wall_s
+    # Laps follow one another without overlapping
+    assert merge.start >= load.start + load.wall_s
+    assert report.start >= merge.start + merge.wall_s
+
+    lines = profiler.summary().splitlines()
+    assert lines[1].split()[-3:-1] == ['10', '1,000'] and lines[3].startswith('  inner')
+
+
+def test_profiled_rows_and_trace(tmp_path):
+    profiler = Profiler(enabled=True)
+
+    @profiler.profiled()
+    def evens(values):
+        return [v for v in values if v % 2 == 0]
+
+    assert evens(range(10)) == [0, 2, 4, 6, 8]
+    rec = profiler.records[0]
+    assert (rec.name, rec.rows_in, rec.rows_out) == ('evens', 10, 5)
+
+    path = str(tmp_path / 'trace.json')
+    profiler.write_trace(path)
+    with open(path) as f:
+        trace = json.load(f)
+    assert trace['traceEvents'][0]['args']['rows_out'] == 5
+    assert trace['traceEvents'][0]['dur'] == pytest.approx(rec.wall_s * 1e6)
+
+
+def test_pipeline_stage_rows_sum_their_inputs(monkeypatch, tmp_path):
+    profiler = Profiler(enabled=True)
+    monkeypatch.setattr(pipeline, 'PROFILER', profiler)
+    stages = {
+        'a': Stage('a', lambda config: list(range(4))),
+        'b': Stage('b', lambda config: list(range(6))),
+        'both': Stage('both', lambda config, a, b: a + b + [0], inputs=('a', 'b')),
+    }
+    Pipeline(AnalysisConfig(), cache_dir=str(tmp_path), verbose=False, use_cache=False, stages=stages).run()
+    rows = {rec.name: (rec.rows_in, rec.rows_out) for rec in profiler.records}
+    assert rows == {'stage a': (0, 4), 'stage b': (0, 6), 'stage both': (10, 11)}
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = Profiler()
+    assert profiler.lap('load') is None and profiler.end(rows_out=3) is None
+    with profiler.stage('merge') as rec:
+        rec.rows_out = 7
+    assert rec.rows_out is None and profiler.records == []
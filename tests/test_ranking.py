@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.ranking import quantile_codes, quantile_series
+
+
+@pytest.mark.parametrize('m, n', [(5, 5), (17, 5), (100, 10), (269, 5), (8, 3)])
+def test_distinct_values_match_qcut(m, n):
+    x = np.random.default_rng(m).normal(size=m)
+    np.testing.assert_array_equal(quantile_codes(x, n), pd.qcut(x, n, labels=False))
+
+
+def test_missing_values_and_empty():
+    x = np.array([3.0, np.nan, 1.0, np.inf, 2.0, 5.0, 4.0])
+    codes = quantile_codes(x, 5)
+    assert codes[1] == -1 and codes[3] == -1
+    finite = np.isfinite(x)
+    np.testing.assert_array_equal(codes[finite], pd.qcut(x[finite], 5, labels=False))
+    assert quantile_codes(np.array([]), 5).shape == (0,)
+    assert (quantile_codes(np.full(4, np.nan), 5) == -1).all()
+
+
+def test_ties_fill_every_bucket():
+    x = np.array([1.0] * 6 + [2.0] * 4)
+    codes = quantile_codes(x, 5)
+    assert np.bincount(codes).tolist() == [2, 2, 2, 2, 2]
+    # Ties go by position unless a tiebreak key says otherwise
+    assert codes[:2].tolist() == [0, 0]
+    reverse = quantile_codes(x, 5, tiebreak=-np.arange(10))
+    assert reverse[4:6].tolist() == [0, 0]
+
+
+def test_matrix_rows_are_independent():
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(3, 4, 30))
+    x[0, 1, :7] = np.nan
+    stacked = quantile_codes(x, 5)
+    for idx in np.ndindex(3, 4):
+        np.testing.assert_array_equal(stacked[idx], quantile_codes(x[idx], 5))
+
+
+def test_quantile_series_labels():
+    s = pd.Series([5.0, np.nan, 1.0, 3.0], index=list('abcd'), name='pe')
+    out = quantile_series(s, 3, labels=['low', 'mid', 'high'])
+    assert out.name == 'pe' and out.index.tolist() == list('abcd')
+    assert out.astype(object).where(out.notna(), None).tolist() == ['high', None, 'low', 'mid']
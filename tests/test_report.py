@@ -0,0 +1,36 @@
+import os
+
+from momentum_value.benchmark import write_dataset
+from momentum_value.config import AnalysisConfig
+from momentum_value.pipeline import Pipeline
+from momentum_value.report import build_report, to_html, to_markdown
+
+
+def test_report_shows_every_stage(tmp_path):
+    price_path, fundamentals_path = write_dataset(str(tmp_path), n_tickers=60, n_years=2)
+    config = AnalysisConfig(price_path=price_path, fundamentals_path=fundamentals_path,
+                            dividends_path=os.path.join(str(tmp_path), 'missing.csv'))
+    results = Pipeline(config, cache_dir=str(tmp_path / '.cache'), verbose=False).run()
+    report = build_report(results, config)
+
+    titles = [section.title for section in report.sections]
+    assert 'Story 1.6: Momentum x Value Double Sort' in titles
+    assert 'Story 1.8: Risk-Adjusted Returns (2024)' in titles
+    assert 'double_sort' in [spec.name for spec in report.figures]
+
+    text = to_markdown(report)
+    assert '**Independent sort: stocks per cell:**' in text
+    assert '**Conditional sort: mean return 2024:**' in text
+    assert '| Q5 |' in text and 'sortino' in text
+    assert 'Risk-Adjusted Returns' in to_html(report)
+
+
+def test_significance_uses_holm_adjusted_p(tmp_path):
+    price_path, fundamentals_path = write_dataset(str(tmp_path), n_tickers=60, n_years=2)
+    config = AnalysisConfig(price_path=price_path, fundamentals_path=fundamentals_path,
+                            dividends_path=os.path.join(str(tmp_path), 'missing.csv'))
+    results = Pipeline(config, cache_dir=str(tmp_path / '.cache'), verbose=False).run()
+    # Raw p just under 5%, Holm-adjusted just over: not significant
+    results['tests'].loc['momentum', ['p_value', 'p_holm']] = [0.04, 0.08]
+    section = next(s for s in build_report(results, config).sections if s.title.startswith('Story 1.7'))
+    assert 'Holm-adjusted p = 0.0800 - not significant at 5%' in section.lines[0]
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from momentum_value.resampling import bootstrap_spread, permutation_test, spread_test
+
+
+@pytest.fixture
+def samples():
+    rng = np.random.default_rng(3)
+    return rng.normal(0.02, 0.1, 80), rng.normal(0.0, 0.1, 60)
+
+
+def test_bootstrap_matches_naive_loop(samples):
+    a, b = samples
+    res = bootstrap_spread(a, b, n_resamples=400, seed=1, workers=1, batch=400)
+    # Same stream as the batch: one child of the root seed, a then b index draws
+    rng = np.random.default_rng(np.random.SeedSequence(1).spawn(1)[0])
+    ia, ib = rng.integers(0, len(a), (400, len(a))), rng.integers(0, len(b), (400, len(b)))
+    spreads = a[ia].mean(axis=1) - b[ib].mean(axis=1)
+    assert res['spread'] == pytest.approx(a.mean() - b.mean())
+    assert res['ci_low'] == pytest.approx(np.percentile(spreads, 2.5))
+    assert res['ci_high'] == pytest.approx(np.percentile(spreads, 97.5))
+    assert res['se'] == pytest.approx(spreads.std(ddof=1))
+
+
+def test_results_independent_of_workers(samples):
+    a, b = samples
+    one = permutation_test(a, b, n_resamples=900, seed=5, workers=1, batch=200)
+    two = permutation_test(a, b, n_resamples=900, seed=5, workers=2, batch=200)
+    assert one == two
+
+
+def test_permutation_agrees_with_scipy(samples):
+    stats = pytest.importorskip('scipy.stats')
+    a, b = samples
+    ours = permutation_test(a, b, n_resamples=4000, alternative='greater', workers=1)['p_value']
+    ref = stats.permutation_test((a, b), lambda x, y: x.mean() - y.mean(), n_resamples=4000,
+                                 alternative='greater', random_state=0).pvalue
+    assert abs(ours - ref) < 0.03
+
+
+def test_empty_sample_is_nan():
+    a = np.array([0.1, 0.2, np.nan])
+    for b in ([], [np.nan]):
+        boot = bootstrap_spread(a, b, n_resamples=100, workers=1)
+        assert np.isnan([boot['spread'], boot['ci_low'], boot['ci_high'], boot['se']]).all()
+        assert np.isnan(permutation_test(b, a, n_resamples=100, workers=1)['p_value'])
+        assert np.isnan(spread_test(a, b, n_resamples=100, workers=1)['p_value'])
+
+
+def test_unknown_alternative():
+    with pytest.raises(ValueError):
+        permutation_test([1.0], [], alternative='sideways')
+
+
+def test_spread_test_uses_independent_streams(samples, monkeypatch):
+    import momentum_value.resampling as resampling
+    seen = []
+    real = resampling._resample
+
+    def record(worker, data, n, seed, workers, batch):
+        seen.append(tuple(seed.spawn_key))
+        return real(worker, data, n, seed, workers, batch)
+
+    monkeypatch.setattr(resampling, '_resample', record)
+    spread_test(*samples, n_resamples=100, seed=42, workers=1)
+    assert len(seen) == 2 and seen[0] != seen[1]
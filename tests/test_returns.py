@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.returns import ReturnEngine, annual_returns, lookback_returns
+
+
+def _reference(long_prices, start, end, min_days=1):
+    """First-to-last close per stock inside [start, end], the starter's loop."""
+    window = long_prices[(long_prices['Date'] >= start) & (long_prices['Date'] <= end)]
+    out = {}
+    for stock, rows in window.sort_values('Date').groupby('Stock'):
+        if len(rows) >= min_days and rows['Close'].iloc[0] != 0:
+            out[stock] = rows['Close'].iloc[-1] / rows['Close'].iloc[0] - 1
+    return pd.Series(out, dtype=float)
+
+
+@pytest.mark.parametrize('min_days', [1, 200])
+def test_annual_returns_match_groupby(long_prices, min_days):
+    # Row order must not matter
+    shuffled = long_prices.sample(frac=1, random_state=0)
+    ours = annual_returns(shuffled, 2023, min_days=min_days).sort_index()
+    ref = _reference(long_prices, '2023-01-01', '2023-12-31', min_days).sort_index()
+    pd.testing.assert_series_equal(ours, ref, check_names=False)
+    if min_days == 200:
+        assert 'FFF' not in ours.index
+
+
+def test_lookback_returns_match_reference(long_prices):
+    table = lookback_returns(long_prices, '2024-06-30', ['3M', '12-1'])
+    as_of = pd.Timestamp('2024-06-30')
+    for name, (m_start, m_end) in {'3M': (3, 0), '12-1': (12, 1)}.items():
+        ref = _reference(long_prices, as_of - pd.DateOffset(months=m_start), as_of - pd.DateOffset(months=m_end))
+        pd.testing.assert_series_equal(table[name].dropna().sort_index(), ref.sort_index(), check_names=False)
+
+
+def test_zero_and_negative_start_prices(long_prices):
+    prices = long_prices.copy()
+    first = prices[prices['Date'].dt.year == 2023].sort_values('Date').groupby('Stock').head(1).index
+    prices.loc[first[0], 'Close'] = 0.0
+    prices.loc[first[1], 'Close'] = -1.0
+    zero, negative = prices.loc[first[0], 'Stock'], prices.loc[first[1], 'Stock']
+    engine = ReturnEngine(prices)
+    assert zero not in engine.annual_returns(2023).index
+    assert negative in engine.annual_returns(2023).index
+    assert negative not in engine.annual_returns(2023, require_positive=True).index
+
+
+def test_empty_inputs(long_prices):
+    engine = ReturnEngine(long_prices.iloc[:0])
+    assert engine.annual_returns(2023).empty
+    assert lookback_returns(long_prices.iloc[:0], '2024-06-30').empty
+    # A window with no rows at all
+    assert ReturnEngine(long_prices).annual_returns(1999).empty
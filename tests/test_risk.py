@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.risk import RiskModel, max_drawdown, portfolio_returns, quantile_risk
+
+
+@pytest.fixture
+def returns(panel):
+    return panel.to_frame().pct_change(fill_method=None).iloc[1:]
+
+
+def test_rolling_volatility_matches_pandas(panel, returns):
+    ours = RiskModel.from_panel(panel).volatility(21, min_periods=15)
+    ref = returns.rolling(21, min_periods=15).std() * np.sqrt(252)
+    np.testing.assert_allclose(ours.to_numpy(), ref.to_numpy(), rtol=1e-6, atol=1e-12)
+
+
+def test_full_period_measures_match_pandas(panel, returns):
+    risk = RiskModel.from_panel(panel)
+    np.testing.assert_allclose(risk.volatility(), returns.std() * np.sqrt(252))
+    np.testing.assert_allclose(risk.sharpe(), returns.mean() / returns.std() * np.sqrt(252))
+
+    market = returns.mean(axis=1)
+    for ticker in returns.columns:
+        pair = pd.concat([returns[ticker], market], axis=1).dropna()
+        expected = pair.cov().iloc[0, 1] / pair.iloc[:, 1].var()
+        assert risk.beta()[ticker] == pytest.approx(expected)
+
+
+def test_rolling_beta_matches_pandas(panel, returns):
+    market = returns.mean(axis=1)
+    ours = RiskModel.from_panel(panel).beta(63)['AAA']
+    pair = pd.concat([returns['AAA'], market.where(returns['AAA'].notna())], axis=1)
+    ref = pair.iloc[:, 0].rolling(63, min_periods=32).cov(pair.iloc[:, 1]) / pair.iloc[:, 1].rolling(63, min_periods=32).var()
+    np.testing.assert_allclose(ours.to_numpy(), ref.to_numpy(), rtol=1e-6)
+
+
+def test_max_drawdown_matches_cumprod(returns):
+    wealth = (1 + returns.fillna(0)).cumprod()
+    ref = (wealth / wealth.cummax().clip(lower=1.0) - 1).min().clip(upper=0.0)
+    np.testing.assert_allclose(max_drawdown(returns.to_numpy()), ref)
+    assert np.isnan(max_drawdown(np.full((5, 1), np.nan)))[0]
+
+
+def test_quantile_portfolios_match_groupby(panel, returns):
+    codes = pd.Series([0, 0, 1, 1, 2, 2, 1], index=['AAA', 'BBB', 'CCC', 'DDD', 'EEE', 'FFF', 'ZZZ'])
+    daily = portfolio_returns(returns.to_numpy(), codes.iloc[:6].to_numpy(), 3)
+    ref = returns.T.groupby(codes.iloc[:6]).mean().T
+    np.testing.assert_allclose(daily, ref.to_numpy())
+
+    # ZZZ is not in the panel and is ignored
+    table = quantile_risk(panel, codes, 3)
+    assert table.index.tolist() == ['Q1', 'Q2', 'Q3']
+    assert table.loc['Q2', 'ann_vol'] == pytest.approx(ref[1].std() * np.sqrt(252))
+
+
+def test_empty_window(panel):
+    table = RiskModel.from_panel(panel.year(1999)).summary()
+    assert len(table) == panel.shape[1] and table.isna().all().all()
@@ -0,0 +1,62 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.schema import FUNDAMENTALS, PRICES, read_header, read_table, resolve
+
+
+def _write(tmp_path, text, name='table.csv'):
+    path = tmp_path / name
+    path.write_text(text)
+    return str(path)
+
+
+def test_read_table_matches_read_csv(tmp_path, long_prices):
+    path = str(tmp_path / 'prices.csv')
+    long_prices.assign(Open=long_prices['Close'] * 0.99).to_csv(path)
+    ours = read_table(path, PRICES)
+    ref = pd.read_csv(path, parse_dates=['Date'])
+    assert list(ours.columns) == ['Date', 'Stock', 'Close', 'Open']
+    pd.testing.assert_frame_equal(ours, ref[ours.columns], check_dtype=False)
+    assert ours['Close'].dtype == np.float64
+
+
+def test_aliases_repeated_names_and_subset(tmp_path):
+    path = _write(tmp_path, 'SYMBOL,P/E,revenuePerShare,revenuePerShare\nA.NS,12.5,1,2\nB.BO,,3,4\n')
+    assert resolve(read_header(path), FUNDAMENTALS, ['symbol', 'revenuePerShare']) == {
+        'symbol': (0, 'SYMBOL'), 'revenuePerShare': (2, 'revenuePerShare')}
+    df = read_table(path, FUNDAMENTALS)
+    assert list(df.columns) == ['symbol', 'trailingPE', 'revenuePerShare']
+    assert df['revenuePerShare'].tolist() == [1.0, 3.0]
+    assert np.isnan(df['trailingPE'].iloc[1])
+
+
+def test_missing_required_columns(tmp_path):
+    path = _write(tmp_path, 'Date,Open\n2024-01-02,1\n')
+    with pytest.raises(ValueError, match='Stock .*Close'):
+        read_table(path, PRICES)
+    # A fill value stands in for a column the file lacks
+    path = _write(tmp_path, 'Date,Close\n2024-01-02,10\n', 'RELIANCE.csv')
+    df = read_table(path, PRICES, fill={'Stock': 'RELIANCE'})
+    assert df['Stock'].tolist() == ['RELIANCE'] and df['Close'].tolist() == [10.0]
+
+
+def test_header_from_handle_is_rewound():
+    handle = io.BytesIO(b'\xef\xbb\xbfDate,Stock,Close\n2024-01-02,A,1\n')
+    assert read_header(handle) == ['Date', 'Stock', 'Close']
+    assert handle.tell() == 0
+    assert len(read_table(handle, PRICES)) == 1
+
+
+def test_parquet_and_csv_agree_on_missing_symbols(tmp_path):
+    pytest.importorskip('pyarrow')
+    raw = pd.DataFrame({'symbol': ['AAA.NS', None, 'BBB.BO'], 'trailingPE': [10.0, 12.0, np.nan]})
+    csv_path, parquet_path = str(tmp_path / 'f.csv'), str(tmp_path / 'f.parquet')
+    raw.to_csv(csv_path, index=False)
+    raw.to_parquet(parquet_path, index=False)
+    from_csv = read_table(csv_path, FUNDAMENTALS)
+    from_parquet = read_table(parquet_path, FUNDAMENTALS)
+    assert from_parquet['symbol'].isna().tolist() == [False, True, False]
+    pd.testing.assert_frame_equal(from_parquet, from_csv)
@@ -0,0 +1,105 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from momentum_value import sweep as sweep_module
+from momentum_value.benchmark import write_dataset
+from momentum_value.config import AnalysisConfig
+from momentum_value.sweep import build_state, sweep
+
+
+GRID = {'lookbacks': ('calendar', 6), 'n_quantiles': (3, 5), 'pe_max': (40, None)}
+
+
+@pytest.fixture(scope='module')
+def config(tmp_path_factory):
+    directory = str(tmp_path_factory.mktemp('sweep'))
+    price_path, fundamentals_path = write_dataset(directory, n_tickers=80, n_years=2)
+    return AnalysisConfig(price_path=price_path, fundamentals_path=fundamentals_path,
+                          dividends_path=os.path.join(directory, 'missing.csv'))
+
+
+def _inputs(config):
+    """Reference closes (date x ticker) and P/E from the raw files."""
+    prices = pd.read_csv(config.price_path, index_col=0, parse_dates=['Date'])
+    closes = prices.pivot_table(index='Date', columns='Stock', values='Close', aggfunc='last')
+    fundamentals = pd.read_csv(config.fundamentals_path)
+    fundamentals['ticker'] = fundamentals['symbol'].str.split('.').str[0]
+    # Primary listing: the one with the higher volume
+    primary = fundamentals.sort_values('volume', ascending=False).drop_duplicates('ticker')
+    pe = primary.set_index('ticker')['trailingPE'].reindex(closes.columns)
+    return closes, pe
+
+
+def _calendar(closes, year):
+    window = closes.loc[str(year)]
+    return window.bfill().iloc[0].rdiv(window.ffill().iloc[-1]) - 1
+
+
+def _reference(config, lookback, n, pe_max):
+    """One pd.qcut and scipy Welch test per parameter combination."""
+    closes, pe = _inputs(config)
+    if lookback == 'calendar':
+        momentum = _calendar(closes, config.momentum_year)
+    else:
+        as_of = pd.Timestamp(f'{config.momentum_year}-12-31')
+        filled = closes.ffill()
+        momentum = filled.loc[:as_of].iloc[-1] / filled.loc[:as_of - pd.DateOffset(months=lookback)].iloc[-1] - 1
+    frame = pd.DataFrame({'m': momentum, 'pe': pe, 'f': _calendar(closes, config.return_year)}).dropna()
+    frame = frame[frame['pe'] > config.pe_min]
+    if pe_max is not None:
+        frame = frame[frame['pe'] < pe_max]
+
+    row = {'n_stocks': len(frame)}
+    for name, col, long_q, short_q in (('momentum', 'm', n - 1, 0), ('value', 'pe', 0, n - 1)):
+        codes = pd.qcut(frame[col], n, labels=False)
+        long, short = frame.loc[codes == long_q, 'f'], frame.loc[codes == short_q, 'f']
+        test = stats.ttest_ind(long, short, equal_var=False)
+        row[f'{name}_spread'] = long.mean() - short.mean()
+        row[f'{name}_t'] = test.statistic
+        row[f'{name}_p'] = test.pvalue
+    return row
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_sweep_matches_per_combination_reference(config, workers):
+    table = sweep(config, workers=workers, **GRID)
+    assert len(table) == 8
+    for _, row in table.iterrows():
+        lookback = row['lookback'] if row['lookback'] == 'calendar' else int(row['lookback'])
+        pe_max = None if pd.isna(row['pe_max']) else row['pe_max']
+        ref = _reference(config, lookback, row['n_quantiles'], pe_max)
+        assert row['n_stocks'] == ref.pop('n_stocks')
+        for key, value in ref.items():
+            assert row[key] == pytest.approx(value, rel=1e-4), key
+    assert (table['momentum_p_bh'] >= table['momentum_p']).all()
+    # The parent's state does not outlive the call
+    assert sweep_module._STATE == {}
+
+
+def test_workers_share_state_without_fork(config, monkeypatch):
+    forked = sweep(config, workers=2, **GRID)
+    monkeypatch.setattr(multiprocessing, 'get_all_start_methods', lambda: ['spawn'])
+    initialized = sweep(config, workers=2, **GRID)
+    pd.testing.assert_frame_equal(initialized, forked)
+
+
+def test_build_state_filters_pe_and_tickers(config):
+    closes, pe = _inputs(config)
+    state = build_state(config, ('calendar', 12))
+    tickers = state['source'].tickers
+    np.testing.assert_allclose(state['pe'], pe.reindex(tickers).to_numpy())
+    np.testing.assert_allclose(state['forward'], _calendar(closes, config.return_year).reindex(tickers), atol=1e-6)
+
+    # Exchange suffixes are normalized away; other tickers keep no P/E
+    first, second = pe[pe > 0].index[:2]
+    universe = config.with_tickers([f'{first}.NS', second])
+    restricted = build_state(universe, ('calendar',))
+    assert sorted(restricted['source'].tickers[np.isfinite(restricted['pe'])]) == sorted([first, second])
+
+    rows = sweep(universe, n_quantiles=(2,), pe_max=(None,), workers=1)
+    assert rows['n_stocks'].tolist() == [2]
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from momentum_value.tickers import SymbolTable, normalize_ticker, normalize_tickers
+
+
+@pytest.mark.parametrize('raw, clean', [
+    ('ADANIPORTS.NS', 'ADANIPORTS'),
+    ('SBIN-EQ', 'SBIN'),
+    (' sbin.ns-eq ', 'SBIN'),
+    ('X.NS-EQ', 'X'),
+    ('X-EQ.NS', 'X'),
+    ('RELIANCE', 'RELIANCE'),
+])
+def test_normalize_ticker_fixed_point(raw, clean):
+    assert normalize_ticker(raw) == clean
+    assert normalize_ticker(normalize_ticker(raw)) == normalize_ticker(raw)
+
+
+def test_normalize_tickers_matches_scalar():
+    raw = pd.Series(['A.NS', 'A.BO', None, 'b-eq', 'A.NS'])
+    expected = pd.Series([None if pd.isna(v) else normalize_ticker(v) for v in raw], dtype=object)
+    out = normalize_tickers(raw)
+    pd.testing.assert_series_equal(out.fillna('<NA>'), expected.fillna('<NA>'), check_dtype=False)
+
+    cat = normalize_tickers(raw.astype('category'))
+    assert isinstance(cat.dtype, pd.CategoricalDtype)
+    assert list(cat.astype(object).fillna('<NA>')) == list(expected.fillna('<NA>'))
+
+
+def test_symbol_table_encode_unknown_and_missing():
+    table = SymbolTable(['AAA', 'BBB'])
+    ids = table.encode(pd.Series(['BBB.NS', 'ZZZ', None, 'aaa']), add=False)
+    assert ids.tolist() == [1, -1, -1, 0]
+    assert len(table) == 2
+    assert table.id_of('ZZZ') == -1
+    assert table.decode([1, -1]).tolist() == ['BBB', None]
+
+
+def test_clean_names_keep_their_order():
+    # Distinct clean names that would merge under normalization keep one id each
+    table = SymbolTable(['X', 'X.NS', 'Y'], clean=True)
+    assert table.tickers == ['X', 'X.NS', 'Y']
+    assert table.encode(pd.Series(['Y', 'X.NS']), clean=True).tolist() == [2, 1]
+    assert np.array_equal(table.encode(pd.Series(['X.NS'])), [0])